@@ -0,0 +1,43 @@
+from utils.timing import timed_asserts
+
+METRIC_UNITS = {"ttfb": "ms", "dom_content_loaded": "ms", "load": "ms", "fcp": "ms", "lcp": "ms", "cls": "",
+                "document_bytes": "B", "resource_bytes": "B", "resource_count": ""}
+
+
+@timed_asserts
+class PerfAssert:
+
+    @staticmethod
+    def under(step: dict | None, metric: str, limit: float):
+        assert step is not None, "未采集到 web vitals（pytest --web-vitals 或 @pytest.mark.web_vitals 开启）"
+        value = step.get(metric)
+        assert value is not None, f"步骤 {step['step']} 没有 {metric} 指标（同文档内跳转不产生导航类指标）"
+        unit = METRIC_UNITS.get(metric, "")
+        assert value <= limit, f"步骤 {step['step']} {metric}：{value}{unit}，超过预算 {limit}{unit}（{step['url']}）"
+
+    @staticmethod
+    def lcp_under(step: dict | None, ms: float):
+        PerfAssert.under(step, "lcp", ms)
+
+    @staticmethod
+    def fcp_under(step: dict | None, ms: float):
+        PerfAssert.under(step, "fcp", ms)
+
+    @staticmethod
+    def ttfb_under(step: dict | None, ms: float):
+        PerfAssert.under(step, "ttfb", ms)
+
+    @staticmethod
+    def load_under(step: dict | None, ms: float):
+        PerfAssert.under(step, "load", ms)
+
+    @staticmethod
+    def cls_under(step: dict | None, score: float):
+        PerfAssert.under(step, "cls", score)
+
+    @staticmethod
+    def transfer_under(step: dict | None, size: int):
+        """本步骤文档 + 资源的传输字节"""
+        assert step is not None, "未采集到 web vitals（pytest --web-vitals 或 @pytest.mark.web_vitals 开启）"
+        total = (step.get("document_bytes") or 0) + step.get("resource_bytes", 0)
+        assert total <= size, f"步骤 {step['step']} 传输 {total}B，超过预算 {size}B（{step['url']}）"
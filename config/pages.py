@@ -1,16 +1,32 @@
-URLS = {
-    "dev": {
-        "login": "https://www.saucedemo.com/",
-        "inventory": "https://www.saucedemo.com/inventory.html",
-        "cart": "https://www.saucedemo.com/cart.html",
-        "checkout": "https://www.saucedemo.com/checkout-step-one.html"
-    },
-    "online": {
-        "login": "https://www.saucedemo.com/",
-        "inventory": "https://www.saucedemo.com/inventory.html",
-        "cart": "https://www.saucedemo.com/cart.html",
-        "checkout": "https://www.saucedemo.com/checkout-step-one.html"
-    }
-}
-
-ENV = "dev"
+import os
+
+# 本地 storefront（storefront/server.py）：ENV=local 时由 conftest 自动启动，STOREFRONT_ITEMS 控制商品规模
+LOCAL_STOREFRONT = {
+    "host": "127.0.0.1",
+    "port": int(os.getenv("STOREFRONT_PORT", 8800)),
+    "items": int(os.getenv("STOREFRONT_ITEMS", 6))
+}
+LOCAL_BASE_URL = f"http://{LOCAL_STOREFRONT['host']}:{LOCAL_STOREFRONT['port']}"
+
+URLS = {
+    "dev": {
+        "login": "https://www.saucedemo.com/",
+        "inventory": "https://www.saucedemo.com/inventory.html",
+        "cart": "https://www.saucedemo.com/cart.html",
+        "checkout": "https://www.saucedemo.com/checkout-step-one.html"
+    },
+    "online": {
+        "login": "https://www.saucedemo.com/",
+        "inventory": "https://www.saucedemo.com/inventory.html",
+        "cart": "https://www.saucedemo.com/cart.html",
+        "checkout": "https://www.saucedemo.com/checkout-step-one.html"
+    },
+    "local": {
+        "login": f"{LOCAL_BASE_URL}/",
+        "inventory": f"{LOCAL_BASE_URL}/inventory.html",
+        "cart": f"{LOCAL_BASE_URL}/cart.html",
+        "checkout": f"{LOCAL_BASE_URL}/checkout-step-one.html"
+    }
+}
+
+ENV = os.getenv("UI_ENV", "dev")  # UI_ENV=local 离线运行
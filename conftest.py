@@ -1,262 +1,934 @@
-import time
-from playwright.sync_api import sync_playwright
-from pathlib import Path
-import pytest, shutil, json, allure
-from scripts.save_login_state import save_login_state
-
-
-# ================== Session Fixtures ==================
-@pytest.fixture(scope="session")
-def playwright_instance():
-    with sync_playwright() as p:
-        yield p
-
-
-@pytest.fixture(scope="session")
-def browser(playwright_instance):
-    """浏览器只启动一次"""
-    browser = playwright_instance.chromium.launch(headless=True)
-    yield browser
-    # print("🔥 browser started", id(browser))
-    browser.close()
-
-
-@pytest.fixture(scope="session", autouse=True)
-def clean_screenshot():
-    clean_directories()
-
-
-@pytest.fixture(scope="session", autouse=True)
-def ensure_login_state(request):
-    ensure_login_state_exists()
-
-
-# ================== Function Fixtures ==================
-@pytest.fixture(scope="function")
-def context(browser, request):
-    """每个测试方法一个全新 context"""
-    attempt = getattr(request.node, "execution_count", 1)
-    request.node._current_attempt = attempt  # 🔒 锁定本次 context 对应的 attempt（关键）
-
-    attempt_dir = f"attempt_{attempt}"
-    record_video_dir = Path("videos") / attempt_dir
-    record_tracing_dir = Path("tracing") / attempt_dir
-    record_video_dir.mkdir(parents=True, exist_ok=True)
-    record_tracing_dir.mkdir(parents=True, exist_ok=True)
-
-    need_login = request.node.get_closest_marker("need_login") is not None
-
-    context = browser.new_context(
-        storage_state="storage/login.json" if need_login else None,
-        record_video_dir=str(record_video_dir),
-        # Playwright只知道videos/，不会关系artifacts，video文件只有在context.close()后才会真正落盘
-        record_video_size={"width": 1920, "height": 1080},
-        viewport={"width": 1920, "height": 1080})
-
-    #  ======== 手动开启tracing ========
-    #  为啥手动开启：
-    #  因为Playwright不会自动帮你管理tracing文件
-    # 你需要 start→stop→ 指定zip路径
-    context.tracing.start(
-        name=attempt_dir,
-        screenshots=True,
-        snapshots=True,
-        sources=True)
-
-    yield context
-
-    #  ======== teardown阶段：video、trace即将生成，page已close========
-    trace_path = record_tracing_dir / "trace.zip"
-    try:
-        context.tracing.stop(path=trace_path)  # stop tracing，trace.zip 在这里真正生成
-    finally:
-        context.close()  # 一定要先close：释放video文件句柄、video真正写入磁盘
-
-    # 执行成功用例删除video、trace
-    failed = getattr(request.node, "_failed", False)
-    if not failed:
-        shutil.rmtree(record_video_dir, ignore_errors=True)
-        shutil.rmtree(record_tracing_dir, ignore_errors=True)
-        return
-
-    #  执行失败用例移动video、trace到artifacts目录
-    module = request.node.module.__name__.split(".")[-1]
-    cls = request.node.cls.__name__ if request.node.cls else "no_class"
-    name = request.node.name
-
-    target_dir = get_attempt_dir(module, cls, name, attempt)  # 构建artifacts目录
-    move_artifacts(record_video_dir, trace_path, target_dir)  # 移动video、trace到artifacts
-
-    # 更新_attempts信息
-    attempts = getattr(request.node, "_attempts", [])
-    attempt = request.node._current_attempt  # 🔑 用 setup 阶段锁定的 attempt
-    current = next(
-        a for a in attempts
-        if a["attempt"] == attempt
-    )
-    current.update({  # current 不是一个拷贝，它就是 _attempts[-1] 的引用
-        "has_screenshot": (target_dir / "failure.png").exists(),
-        "has_video": any(target_dir.glob("*.webm")),
-        "has_trace": (target_dir / "trace.zip").exists(),
-        "url": (target_dir / "url.txt").read_text(encoding="utf-8")
-        if (target_dir / "url.txt").exists() else None,
-        "base_dir": str(target_dir)
-    })
-
-    # 捕获执行失败的video、trace
-    attach_artifacts_to_allure(target_dir)
-
-    # 只在最后一次 attempt attach Attempt Summary
-    max_attempts = getattr(request.node.config.option, "reruns", 0) + 1
-    # if attempt == max_attempts:
-    #     attach_attempt_summary(attempts)
-
-
-@pytest.fixture(scope="function")
-def page(context):
-    """每个测试方法一个新 page"""
-    page = context.new_page()
-
-    # ------------浏览器控制台报错----------
-    console_error = []
-    page.on(  # page.on() 是Playwright 浏览器事件的 API，它只能监听浏览器事件，比如 console、dialog、response 等。
-        "console",
-        lambda msg: console_error.append({
-            "type": msg.type,
-            "text": msg.text,
-            "location": msg.location
-        }) if msg.type == "error" else None
-    )
-    page._console_errors = console_error  # 挂到page上，方便hook里取
-    yield page
-    page.close()
-
-
-# ================== Pytest Hook：失败处理 ==================
-@pytest.hookimpl(hookwrapper=True)
-def pytest_runtest_makereport(item, call):
-    """测试失败时自动保存：截图、URL、Console errors"""
-    start = time.time()  # 测试用例开始执行时间
-    outcome = yield
-    rep = outcome.get_result()
-    duration = round(time.time() - start, 2)
-
-    # 只处理 call 阶段
-    if rep.when != "call":
-        return
-
-    if not hasattr(item, "_attempts"):
-        item._attempts = []
-
-    attempt = len(item._attempts) + 1
-
-    item._attempts.append({
-        "attempt": attempt,
-        "status": "FAILED" if rep.failed else "PASSED",
-        "duration": duration,
-        "error": str(rep.longrepr) if rep.failed else ""
-    })
-
-    if not rep.failed:
-        return
-
-    # ========= UI 项目的职责 =========
-    page = item.funcargs.get("page")
-    if not page:
-        return
-
-    # 保存 Python 端的断言错误到 page
-    page._test_error = str(rep.longrepr) if rep.failed else ""
-
-    item._failed = True
-
-    # 收集失败数据
-    # attempt = getattr(item, "execution_count", 1)
-    # record_failed_attempt(item, attempt, "FAILED" if rep.failed else "PASSED", duration,
-    #                       str(rep.longrepr) if rep.failed else "")
-
-    # 构建artifacts 目录,报错错误证据
-    module_name = item.module.__name__.split(".")[-1]
-    class_name = item.cls.__name__ if item.cls else "no_class"
-    test_name = item.name
-    attempt_dir = f"attempt_{attempt}"
-    base_dir = Path("artifacts") / module_name / class_name / test_name / attempt_dir
-    base_dir.mkdir(parents=True, exist_ok=True)
-
-    save_failure_artifacts(page, base_dir)
-
-
-# ================== Utility Functions ==================
-def clean_directories(paths=None):
-    """清理 session 启动前的目录"""
-    if paths is None:
-        paths = ["artifacts", "videos", "tracing", "allure-results", "storage"]
-    for path in paths:
-        p = Path(path)
-        if p.exists():
-            shutil.rmtree(p)
-        p.mkdir()
-
-
-def ensure_login_state_exists(path="storage/login.json"):
-    """确保 login.json 存在且有效"""
-    login_file = Path(path)
-    if not login_file.exists() or login_file.stat().st_size == 0:
-        print("🔐 login.json不存在或无效，重新生成")
-        save_login_state()
-    else:
-        print("✅ login.json已存在且有效，跳过生成")
-
-
-def get_attempt_dir(module, cls, test_name, attempt):
-    """构建 attempt artifacts 目录"""
-    attempt_dir = f"attempt_{attempt}"
-    target_dir = Path("artifacts") / module / cls / test_name / attempt_dir
-    target_dir.mkdir(parents=True, exist_ok=True)
-    return target_dir
-
-
-def save_failure_artifacts(page, base_dir):
-    """保存失败截图、URL、console errors"""
-    page.screenshot(path=base_dir / "failure.png", full_page=True)  # 生成失败用例截图
-
-    (base_dir / "url.txt").write_text(page.url, encoding="utf-8")  # 生成失败用例URL文件
-
-    console_errors = getattr(page, "_console_errors", [])
-    (base_dir / "browser_console_errors.json").write_text(  # 生成失败用例Console errors文件
-        json.dumps(console_errors, indent=2, ensure_ascii=False), encoding="utf-8")
-
-    error_file = base_dir / "test_failure_errors.txt"
-    if getattr(page, "_test_error", None):
-        (error_file).write_text(page._test_error, encoding="utf-8")
-
-
-def move_artifacts(src_video_dir, src_trace, dst_dir):
-    """移动视频和trace到目标目录"""
-    for video_file in src_video_dir.glob("*.webm"):
-        shutil.move(str(video_file), dst_dir / video_file.name)
-    if src_trace.exists():
-        shutil.move(str(src_trace), dst_dir / "trace.zip")
-
-
-def attach_artifacts_to_allure(target_dir):
-    """将 video / trace 附件到 Allure"""
-    for video in target_dir.glob("*.webm"):
-        allure.attach.file(video, name="📎 Video",
-                           attachment_type=allure.attachment_type.WEBM)
-    trace = target_dir / "trace.zip"
-    if trace.exists():
-        allure.attach.file(trace, name="Playwright-Trace.zip")
-
-
-def record_failed_attempt(item, attempt, status, duration, error=""):
-    """记录一次失败的 attempt"""
-    if not hasattr(item, "_attempts"):
-        item._attempts = []
-    item._attempts.append({
-        "attempt": attempt,
-        "status": status,
-        "duration": duration,
-        "error": error,
-        "url": None  # 稍后在 teardown 补
-    })
+import itertools
+import os
+import subprocess
+import time
+from playwright.sync_api import sync_playwright
+from _pytest.runner import runtestprotocol
+from pathlib import Path
+import pytest, shutil, json, allure
+from utils.login_state import LoginStateCache
+from utils.session_provider import SESSION_PROVIDERS, build_session_provider
+from config.pages import URLS, ENV, LOCAL_STOREFRONT
+from storefront.server import StorefrontServer, is_running
+from utils.capture_policy import CAPTURE_MODES, DEFAULT_CAPTURE_MODE, ScreenshotRing, plan_capture
+from utils.route_cache import (ROUTE_CACHE_MODES, DEFAULT_ROUTE_CACHE_MODE, DEFAULT_MAX_BYTES, DEFAULT_ROUTE_CACHE_PATH,
+                               build_route_cache)
+from utils.block_profiles import BLOCK_PROFILES, DEFAULT_BLOCK_PROFILE, ResourceBlocker, ResourceSizeBook
+from utils.context_pool import ContextPool, origin_of
+from utils.state_seeding import SETUP_MODES, DEFAULT_SETUP_MODE, CatalogCache, CartSeeder
+from utils.checkpoints import CheckpointStore, JourneyCheckpoints
+from utils.web_vitals import WEB_VITALS_INIT_JS, WebVitalsRecorder
+from utils.timing import TIMING, TIMING_DIR, write_span_report
+from utils.perf_report import (BASELINE_FILE, DEFAULT_GATE_THRESHOLDS, HISTORY_FILE, PERF_DIR, action_totals,
+                               append_history, build_perf_report, check_regressions, collect_worker_perf,
+                               format_report, gate_skip_reason, get_perf_records, load_baseline, record_perf_attempt,
+                               save_baseline)
+from utils.session_stats import record_session_stats, collect_worker_stats, get_session_stats, format_stats
+from utils.async_runner import AsyncScenarioRunner, DEFAULT_CONCURRENCY
+from utils.browser_server import connect_or_launch
+from utils.artifact_writer import build_artifact_writer
+from utils.sharding import DURATIONS_FILE, load_durations, parse_shard, shard_items, shard_label, update_durations
+from utils.impact import (INDEX_FILE, ImpactRecorder, changed_symbols, collect_worker_impact, get_impact_records,
+                          head_commit, load_index, record_impact, select_tests, update_index)
+from utils.rerun_scheduler import (DEFAULT_MAX_RERUNS, DEFAULT_MIN_FLAKE_RATE, FLAKY_HISTORY_FILE, FlakeHistory,
+                                   PendingReruns, RerunScheduler, classify_failure, format_rerun_summary,
+                                   reset_for_rerun, summarize_reruns)
+from utils.artifact_store import (DEFAULT_MAX_AGE_DAYS, DEFAULT_MAX_MB, SCREENSHOT_FORMATS, ArtifactStore,
+                                  parse_size)
+
+CLEAN_DIRS = ("artifacts", "videos", "tracing", "allure-results", "timing")  # storage/ 登录态跨 session 复用，不清理
+
+
+# ================== Command Line Options ==================
+def pytest_addoption(parser):
+    parser.addoption("--async-engine", action="store_true", default=False,
+                     help="运行 async_engine 用例（asyncio 引擎另起一个 browser 并发重跑 checkout 流程），默认取消选择")
+    parser.addoption("--async-concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                     help="asyncio 引擎同时运行的 context（场景协程）上限")
+    parser.addoption("--browser-server", default=None,
+                     help="常驻浏览器 CDP endpoint（python -m scripts.browser_server 启动），连不上时进程内启动；off 关闭")
+    parser.addoption("--session-provider", choices=sorted(SESSION_PROVIDERS), default="cookie",
+                     help="need_login 登录态生成方式：cookie 直接注入（校验失败自动回退 ui）/ ui 页面登录")
+    parser.addoption("--record-mode", choices=CAPTURE_MODES, default=DEFAULT_CAPTURE_MODE,
+                     help="失败证据采集策略，见 utils/capture_policy.py")
+    parser.addoption("--route-cache", choices=ROUTE_CACHE_MODES, default=DEFAULT_ROUTE_CACHE_MODE,
+                     help="静态资源路由缓存：off / memory / disk / har，见 utils/route_cache.py")
+    parser.addoption("--route-cache-path", default=None, help="disk 模式的缓存目录或 har 模式的 HAR 文件")
+    parser.addoption("--route-cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // 1024 // 1024,
+                     help="内存 LRU 上限（MB）")
+    parser.addoption("--context-pool", action="store_true", default=False,
+                     help="复用热 context（按登录态 + 拦截 profile 分池），用例间重置状态代替 new_context")
+    parser.addini("block_profile", default=DEFAULT_BLOCK_PROFILE,
+                  help=f"全局请求拦截 profile：{' / '.join(BLOCK_PROFILES)}，可被 block_profile marker 覆盖")
+    parser.addoption("--checkpoint-cache", action="store_true", default=False,
+                     help="checkpoint 前置条件跨 session 复用 storage/checkpoint_*.json（默认每个 session 重跑一次 UI 前缀）")
+    parser.addini("setup_mode", default=DEFAULT_SETUP_MODE,
+                  help="checkout 前置条件：ui 页面加购 / seeded 直接写入购物车 / checkpoint 从旅程检查点恢复，可被 setup_mode marker 覆盖")
+    parser.addoption("--web-vitals", action="store_true", default=False,
+                     help="open / wait_url 后采集 Navigation Timing、FCP、LCP、CLS、传输字节，附加到用例记录")
+    parser.addoption("--perf-gate", action="store_true", default=False,
+                     help="p50 / p95 / 总 wall time 相对基线回归超过阈值时 session 失败")
+    parser.addoption("--perf-baseline", default=str(BASELINE_FILE), help="性能基线文件")
+    parser.addoption("--perf-update-baseline", action="store_true", default=False,
+                     help="用本次 session 的报告覆盖性能基线")
+    for metric, pct in DEFAULT_GATE_THRESHOLDS.items():
+        parser.addini(f"perf_gate_{metric}", default=str(pct), help=f"{metric} 允许的增幅（%）")
+    parser.addoption("--smart-reruns", type=int, default=DEFAULT_MAX_RERUNS,
+                     help="失败用例最多重跑次数（按失败类型与历史 flake 率决定是否重跑，session 末尾成批执行），0 关闭")
+    parser.addini("smart_rerun_min_flake_rate", default=str(DEFAULT_MIN_FLAKE_RATE),
+                  help="assertion / error 类失败：历史 flake 率达到该值才重跑")
+    parser.addoption("--impact-record", action="store_true", default=False,
+                     help="记录每个用例运行时用到的 pages / assertions / config / data 符号，增量更新影响分析索引")
+    parser.addoption("--impact-base", default=None,
+                     help="只运行受 git diff <REF> 改动影响的用例（依据 --impact-record 生成的索引）")
+    parser.addoption("--impact-index", default=str(INDEX_FILE), help="影响分析索引文件")
+    parser.addoption("--shard", default=None,
+                     help="K/N：按历史耗时均衡切分，只运行第 K 份；artifacts、allure-results 写到 shard-K 子目录")
+    parser.addoption("--durations-file", default=str(DURATIONS_FILE), help="分片使用的各用例历史耗时")
+    parser.addini("artifact_store", type="bool", default=True,
+                  help="失败产物存入内容寻址 store，artifacts / allure-results 用硬链接引用同一份数据")
+    parser.addini("artifact_store_max_mb", default=str(DEFAULT_MAX_MB), help="store 总大小上限（MB），超出按时间淘汰")
+    parser.addini("artifact_store_max_age_days", default=str(DEFAULT_MAX_AGE_DAYS), help="store 中 blob 保留天数")
+    parser.addini("artifact_screenshot", default="png",
+                  help=f"失败整页截图格式：{' / '.join(SCREENSHOT_FORMATS)}（jpeg 体积小很多）")
+    parser.addini("artifact_video_size", default="1920x1080", help="录像分辨率，如 1280x720")
+
+
+# ================== Session Fixtures ==================
+@pytest.fixture(scope="session")
+def playwright_instance():
+    with sync_playwright() as p:
+        yield p
+
+
+@pytest.fixture(scope="session")
+def browser(playwright_instance, request):
+    """浏览器只启动一次；有常驻浏览器时直接连接（见 utils/browser_server.py）"""
+    with TIMING.session_span("browser.launch"):
+        browser, connected = connect_or_launch(playwright_instance, request.config.getoption("--browser-server"))
+    record_session_stats(request.config, "browser", {"connected": int(connected), "launched": int(not connected)})
+    yield browser
+    # print("🔥 browser started", id(browser))
+    browser.close()
+
+
+@pytest.fixture(scope="session")
+def login_states(browser, request):
+    """登录态缓存：storage/ 跨 session 保留，过期才用本 session 的 browser 重新生成"""
+    provider = build_session_provider(request.config.getoption("--session-provider"), browser)
+    return LoginStateCache(provider)
+
+
+@pytest.fixture(scope="session")
+def async_runner(request, login_states):
+    """asyncio 引擎：独立线程里一个 browser，多个已登录 context 并发执行场景协程"""
+    runner = AsyncScenarioRunner(
+        concurrency=request.config.getoption("--async-concurrency"),
+        browser_server=request.config.getoption("--browser-server"),
+        context_options={"storage_state": str(login_states.get()),
+                         "viewport": {"width": 1920, "height": 1080}}).start()
+    yield runner
+    runner.close()
+
+
+@pytest.fixture(scope="session")
+def route_cache(request):
+    """session 共享的静态资源缓存，每个新 context 通过 context.route 接入"""
+    option = request.config.getoption
+    mode = option("--route-cache")
+    cache = build_route_cache(mode, option("--route-cache-path"), option("--route-cache-max-mb") * 1024 * 1024)
+    yield cache
+    if cache is None:
+        return
+    if mode == "har":
+        cache.save_har(Path(option("--route-cache-path") or DEFAULT_ROUTE_CACHE_PATH["har"]))
+    record_session_stats(request.config, "route_cache", cache.stats.as_dict())
+
+
+@pytest.fixture(scope="session")
+def resource_sizes():
+    """资源大小登记簿：估算被拦截请求节省的字节"""
+    book = ResourceSizeBook()
+    yield book
+    book.save()
+
+
+@pytest.fixture(scope="session")
+def catalog_cache():
+    """seeded 前置条件用的商品目录（storage/ 跨 session 保留）；本地 storefront 按商品规模区分"""
+    key = f"{ENV}_{LOCAL_STOREFRONT['items']}" if ENV == "local" else ENV
+    return CatalogCache(key, URLS[ENV]["inventory"])
+
+
+@pytest.fixture(scope="session")
+def journey_checkpoints(browser, request):
+    """checkpoint 前置条件：共享 UI 前缀每个 session 只跑一次（--checkpoint-cache 时 storage/ 跨 session 保留，见 utils/checkpoints.py）"""
+    store = CheckpointStore(browser, persist=request.config.getoption("--checkpoint-cache"))
+    yield store
+    if store.stats["hits"]:
+        record_session_stats(request.config, "journey_checkpoints", store.stats)
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser, route_cache, resource_sizes, request):
+    """--context-pool 开启时的 context 池；池化 context 不录 video / trace"""
+    if not request.config.getoption("--context-pool"):
+        yield None
+        return
+    pool = ContextPool(lambda storage_state, block_profile: new_test_context(
+        browser, storage_state, block_profile, route_cache, resource_sizes))
+    yield pool
+    pool.close()
+    record_session_stats(request.config, "context_pool", pool.stats())
+
+
+# ================== Session Hooks ==================
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionstart(session):
+    """清理目录只在主进程做一次（tryfirst：先于 xdist 启动 worker）
+       并行模式（pytest -n N）下 worker 共享这些目录，worker 里再清理会删掉彼此的产物"""
+    if is_xdist_worker(session.config):
+        return
+    session.config._session_start = time.perf_counter()
+    clean_directories(get_clean_paths(session.config))
+    start_local_storefront(session.config)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """--shard：先于 allure-pytest 的 pytest_configure 改写 alluredir，各 shard 的结果可以直接合并"""
+    shard = config.getoption("--shard")
+    if not shard:
+        return
+    try:
+        config._shard = parse_shard(shard)
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    alluredir = getattr(config.option, "allure_report_dir", None)
+    if alluredir:
+        config.option.allure_report_dir = str(Path(alluredir) / shard_label(config._shard))
+
+
+def pytest_collection_modifyitems(config, items):
+    """xdist 下每个 worker 各自计算，结果相同"""
+    select_async_engine(config, items)
+    select_impacted(config, items)
+    select_shard(config, items)
+
+
+def select_async_engine(config, items):
+    """async_engine 用例与同步用例覆盖相同流程，只在 --async-engine 时运行"""
+    if config.getoption("--async-engine"):
+        return
+    deselected = [item for item in items if item.get_closest_marker("async_engine")]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if not item.get_closest_marker("async_engine")]
+
+
+def select_impacted(config, items):
+    """--impact-base：按改动符号取消选择无关用例"""
+    base = config.getoption("--impact-base")
+    if not base:
+        return
+    try:
+        changed, unscoped = changed_symbols(config.rootpath, base)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise pytest.UsageError(f"--impact-base {base}：git diff 失败：{e}")
+    if unscoped:
+        config._impact_summary = [f"impact: {base} 改动了 {', '.join(unscoped[:5])}，无法缩小范围，全量执行"]
+        return
+    index = load_index(Path(config.getoption("--impact-index")))
+    selected, reasons = select_tests([item.nodeid for item in items], index, changed)
+    keep = set(selected)
+    deselected = [item for item in items if item.nodeid not in keep]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in keep]
+    config._impact_summary = [f"impact: {base} 改动 {len(changed)} 个符号，"
+                              f"选中 {len(selected)}/{len(selected) + len(deselected)} 个用例"]
+    config._impact_summary += [f"  {nodeid}  <- {reason}" for nodeid, reason in reasons.items()]
+
+
+def select_shard(config, items):
+    """--shard K/N：只保留第 K 份，并按组耗时从长到短排序"""
+    shard = getattr(config, "_shard", None)
+    if not shard:
+        return
+    selected, deselected, loads = shard_items(items, shard, load_durations(Path(config.getoption("--durations-file"))))
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+    config._shard_summary = {"shard": f"{shard[0]}/{shard[1]}", "tests": len(selected),
+                             "predicted": round(loads[shard[0] - 1], 2), "loads": [round(v, 2) for v in loads]}
+
+
+def pytest_collection_finish(session):
+    """--impact-record：collection 完成后安装 profile（之后启动的线程也会继承）"""
+    if session.config.getoption("--impact-record"):
+        session.config._impact_recorder = ImpactRecorder(session.config.rootpath)
+        session.config._impact_recorder.install()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    """--impact-record：session / module / class 级 fixture 只在第一个用例里执行，单独记录，
+       用例 teardown 时合并到每个请求该 fixture 的用例"""
+    recorder = getattr(request.config, "_impact_recorder", None)
+    if recorder is None or fixturedef.scope == "function":
+        yield
+        return
+    recorder.start_fixture()
+    yield
+    recorder.stop_fixture(fixturedef.argname)
+
+
+def pytest_sessionfinish(session):
+    recorder = getattr(session.config, "_impact_recorder", None)
+    if recorder:
+        recorder.uninstall()
+        if not is_xdist_worker(session.config):
+            update_index(get_impact_records(session.config), head_commit(session.config.rootpath),
+                         Path(session.config.getoption("--impact-index")))
+
+    # 先等后台产物全部落盘：之后的 perf 报告要统计产物大小，Allure 结果也要完整
+    writer = getattr(session.config, "_artifact_writer", None)
+    if writer:
+        record_session_stats(session.config, "artifact_writer", writer.close())
+
+    # 每个进程写自己的 span 文件，并行时互不覆盖
+    span_trees = getattr(session.config, "_span_trees", None)
+    if span_trees:
+        write_span_report(TIMING_DIR / f"spans_{get_worker_id()}.json", span_trees)
+
+    storefront = getattr(session.config, "_storefront", None)
+    if storefront:
+        storefront.stop()
+
+    if not is_xdist_worker(session.config):
+        evict_artifact_store(session.config)
+        finish_perf_report(session)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """xdist 主进程：汇总 worker 回传的统计"""
+    collect_worker_stats(node.config, getattr(node, "workeroutput", {}))
+    collect_worker_perf(node.config, getattr(node, "workeroutput", {}))
+    collect_worker_impact(node.config, getattr(node, "workeroutput", {}))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    impact = getattr(config, "_impact_summary", None)
+    if impact:
+        terminalreporter.section("impact")
+        for line in impact:
+            terminalreporter.write_line(line)
+    shard = getattr(config, "_shard_summary", None)
+    if shard:
+        terminalreporter.section("shard")
+        terminalreporter.write_line(f"shard {shard['shard']}: {shard['tests']} tests, predicted={shard['predicted']}s, "
+                                    f"wall_time={shard.get('wall_time', '-')}s, all shards={shard['loads']}")
+
+    report = getattr(config, "_perf_report", None)
+    if report:
+        terminalreporter.section("performance")
+        for line in format_report(report):
+            terminalreporter.write_line(line)
+        for line in getattr(config, "_perf_gate_result", []):
+            terminalreporter.write_line(line, red=line.startswith("❌"))
+        if "smart_reruns" in report:
+            terminalreporter.write_line(format_rerun_summary(report["smart_reruns"]))
+
+    stats = get_session_stats(config)
+    if not stats:
+        return
+    terminalreporter.section("session stats")
+    for name, values in stats.items():
+        terminalreporter.write_line(f"{name}: {format_stats(values)}")
+
+
+# ================== Function Fixtures ==================
+@pytest.fixture(scope="function")
+def context(browser, login_states, route_cache, resource_sizes, context_pool, request):
+    """每个测试方法一个全新 context（--context-pool 时从池中取重置过的热 context）"""
+    attempt = getattr(request.node, "execution_count", 1)
+    request.node._current_attempt = attempt  # 🔒 锁定本次 context 对应的 attempt（关键）
+
+    attempt_dir = f"attempt_{attempt}"
+    # 临时目录按 worker 隔离：并行时其他 worker 的 rmtree 不会删掉本 worker 正在录制的文件
+    # 再按用例序号隔离：后台清理 / 移动上一个用例的文件时，下一个用例已经在录制
+    record_key = f"{next(RECORD_SEQ):04d}_{attempt_dir}"
+    record_video_dir = Path("videos") / get_worker_id() / record_key
+    record_tracing_dir = Path("tracing") / get_worker_id() / record_key
+
+    # 按采集策略决定本次 attempt 是否录 video / trace（重量级采集默认只给重跑）
+    plan = plan_capture(request.config.getoption("--record-mode"), attempt)
+    request.node._capture_plan = plan
+
+    # @pytest.mark.need_login 默认使用 success_login，也可指定用户：@pytest.mark.need_login("xxx_user")
+    need_login = request.node.get_closest_marker("need_login")
+    storage_state = login_states.get(*need_login.args) if need_login else None
+    request.node._storage_state = storage_state
+
+    record_options = {}
+    if plan.video:
+        record_video_dir.mkdir(parents=True, exist_ok=True)
+        record_options = {
+            "record_video_dir": str(record_video_dir),
+            # Playwright只知道videos/，不会关系artifacts，video文件只有在context.close()后才会真正落盘
+            "record_video_size": parse_size(request.config.getini("artifact_video_size"))}
+
+    # 请求拦截：marker 优先，其次 pytest.ini 的 block_profile
+    block_profile = get_block_profile(request)
+
+    # 需要录 video/trace 的 attempt、标记 isolated 的用例不走 context 池
+    isolated = plan.heavy or request.node.get_closest_marker("isolated") is not None
+    pooled = None
+    if context_pool and not isolated:
+        with TIMING.span("context.acquire"):
+            pooled, setup_time, reused = context_pool.acquire(storage_state, block_profile)
+        context, blocker = pooled.context, pooled.blocker
+    else:
+        start = time.perf_counter()
+        with TIMING.span("context.create"):
+            context, blocker = new_test_context(browser, storage_state, block_profile, route_cache, resource_sizes,
+                                                record_options)
+        setup_time, reused = time.perf_counter() - start, False
+    request.node._blocker = blocker
+    request.node._context_setup = {"context_setup": round(setup_time, 3), "context_reused": reused}
+
+    #  ======== 手动开启tracing ========
+    #  为啥手动开启：
+    #  因为Playwright不会自动帮你管理tracing文件
+    # 你需要 start→stop→ 指定zip路径
+    if plan.tracing:
+        record_tracing_dir.mkdir(parents=True, exist_ok=True)
+        with TIMING.span("tracing.start"):
+            context.tracing.start(
+                name=attempt_dir,
+                screenshots=True,
+                snapshots=True,
+                sources=True)
+
+    yield context
+
+    #  ======== teardown阶段：video、trace即将生成，page已close========
+    trace_path = record_tracing_dir / "trace.zip"
+    if pooled:
+        with TIMING.span("context.release"):
+            context_pool.release(pooled)  # 放回池中，下一个同 flavor 用例取用前重置
+    else:
+        try:
+            if plan.tracing:
+                with TIMING.span("tracing.stop"):
+                    context.tracing.stop(path=trace_path)  # stop tracing，trace.zip 在这里真正生成
+        finally:
+            with TIMING.span("context.close"):
+                context.close()  # 一定要先close：释放video文件句柄、video真正写入磁盘
+    record_session_stats(request.config, "resource_blocking",
+                         {"blocked_requests": blocker.blocked, "blocked_bytes": blocker.bytes_saved})
+
+    # 执行成功用例删除video、trace（后台删除）
+    writer = get_artifact_writer(request.config)
+    failed = getattr(request.node, "_failed", False)
+    if not failed:
+        writer.remove_tree(record_video_dir)
+        writer.remove_tree(record_tracing_dir)
+        return
+
+    #  执行失败用例移动video、trace到artifacts目录
+    module = request.node.module.__name__.split(".")[-1]
+    cls = request.node.cls.__name__ if request.node.cls else "no_class"
+    name = request.node.name
+
+    target_dir = get_attempt_dir(artifact_root(request.config), module, cls, name, attempt)  # 构建artifacts目录
+    # 移动video、trace到artifacts（后台执行，这里只确定文件清单）
+    videos, has_trace = move_artifacts(writer, record_video_dir, trace_path, target_dir)
+
+    # 更新_attempts信息
+    attempts = getattr(request.node, "_attempts", [])
+    attempt = request.node._current_attempt  # 🔑 用 setup 阶段锁定的 attempt
+    current = next(
+        a for a in attempts
+        if a["attempt"] == attempt
+    )
+    # 产物可能还在后台队列里，用 save_failure_artifacts 返回的清单而不是读 target_dir
+    failure = getattr(request.node, "_failure_artifacts", {})
+    current.update({  # current 不是一个拷贝，它就是 _attempts[-1] 的引用
+        "has_screenshot": failure.get("has_screenshot", False),
+        "ring_screenshots": len(failure.get("ring_shots", [])),
+        "has_video": bool(videos),
+        "has_trace": has_trace,
+        "url": failure.get("url"),
+        "base_dir": str(target_dir)
+    })
+
+    # 捕获执行失败的video、trace、环形截图
+    attach_artifacts_to_allure(writer, failure.get("ring_shots", []), videos, target_dir if has_trace else None)
+
+    # 只在最后一次 attempt attach Attempt Summary
+    max_attempts = getattr(request.node.config.option, "reruns", 0) + 1
+    # if attempt == max_attempts:
+    #     attach_attempt_summary(attempts)
+
+
+@pytest.fixture(scope="function")
+def page(context, catalog_cache, journey_checkpoints, request):
+    """每个测试方法一个新 page"""
+    with TIMING.span("page.new"):
+        page = context.new_page()
+
+    # 轻量采集（retain-on-failure-lite）：BasePage 每个动作后截图进内存环形缓冲，失败时才写盘
+    plan = request.node._capture_plan
+    if plan.screenshot_ring:
+        page._screenshot_ring = ScreenshotRing(plan.screenshot_ring)
+
+    # 场景状态捷径：seeded 模式下 CheckOutPage.prepare 直接写入购物车、打开目标步骤页；checkpoint 模式从旅程检查点恢复
+    request.node._setup_mode = get_setup_mode(request)
+    if request.node._setup_mode == "seeded":
+        page._cart_seeder = CartSeeder(page, catalog_cache.get(context), origin_of(URLS[ENV]["inventory"]))
+    elif request.node._setup_mode == "checkpoint":
+        page._journey_checkpoints = JourneyCheckpoints(journey_checkpoints, page, request.node._storage_state)
+
+    # 前端性能：观察器必须在页面脚本之前注册，BasePage.open / wait_url 按步骤读取
+    if request.config.getoption("--web-vitals") or request.node.get_closest_marker("web_vitals"):
+        page.add_init_script(WEB_VITALS_INIT_JS)
+        page._web_vitals = WebVitalsRecorder()
+
+    # ------------浏览器控制台报错----------
+    console_error = []
+    page.on(  # page.on() 是Playwright 浏览器事件的 API，它只能监听浏览器事件，比如 console、dialog、response 等。
+        "console",
+        lambda msg: console_error.append({
+            "type": msg.type,
+            "text": msg.text,
+            "location": msg.location
+        }) if msg.type == "error" else None
+    )
+    page._console_errors = console_error  # 挂到page上，方便hook里取
+    yield page
+    page.close()
+
+
+# ================== Pytest Hook：失败重跑调度 ==================
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """--smart-reruns：失败 attempt 记为 rerun，用例排进队列，主流程结束后再跑（不 sleep）
+       显式传入 --reruns 时交回 pytest-rerunfailures 的原有行为"""
+    if get_rerun_scheduler(item.config) is None:
+        return None
+    run_attempt(item, nextitem)
+    return True
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtestloop(session):
+    yield
+    run_rerun_batches(session)
+
+
+# ================== Pytest Hook：分阶段计时 ==================
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    """每个 attempt 一棵 span 树，从 setup（browser context 创建等）开始"""
+    item._failed = False  # 每个 attempt 重新判定，重跑通过时不保留 video / trace
+    item._failure_kind = item._rerun_reason = None
+    recorder = getattr(item.config, "_impact_recorder", None)
+    if recorder:
+        recorder.start()  # setup / call / teardown 用到的符号都记到本用例
+    TIMING.start_test(item.nodeid)
+    with TIMING.span("setup"):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    with TIMING.span("call"):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    with TIMING.span("teardown"):  # 包含 tracing.stop、context.close（video 落盘）
+        yield
+    recorder = getattr(item.config, "_impact_recorder", None)
+    if recorder:
+        record_impact(item.config, item.nodeid, recorder.stop(item.fixturenames))
+
+
+# ================== Pytest Hook：失败处理 ==================
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """测试失败时自动保存：截图、URL、Console errors"""
+    outcome = yield
+    rep = outcome.get_result()
+    duration = round(rep.duration, 2)  # call 阶段真实耗时（由 pytest 计时）
+
+    # teardown 结束：本 attempt 的 span 树完整，写入记录并附加到 Allure
+    if rep.when == "teardown":
+        finish_attempt_timing(item)
+        return
+
+    # 失败分类，决定本 attempt 是否重跑（setup 失败也算）
+    if rep.failed and rep.when in ("setup", "call"):
+        plan_rerun(item, call)
+
+    # 只处理 call 阶段
+    if rep.when != "call":
+        return
+
+    if not hasattr(item, "_attempts"):
+        item._attempts = []
+
+    attempt = len(item._attempts) + 1
+
+    item._attempts.append({
+        "attempt": attempt,
+        "status": "FAILED" if rep.failed else "PASSED",
+        "duration": duration,
+        "error": str(rep.longrepr) if rep.failed else "",
+        **(item._blocker.summary() if hasattr(item, "_blocker") else {}),
+        **getattr(item, "_context_setup", {}),
+        "setup_mode": getattr(item, "_setup_mode", None),
+        "failure_kind": item._failure_kind,
+        "rerun": item._rerun_reason
+    })
+
+    page = item.funcargs.get("page")
+    # page object / 定位注册表开销（见 pages/session.py），失败时附带用例走过的页面
+    page_session = getattr(page, "_page_session", None)
+    if page_session:
+        stats = page_session.stats()
+        item._attempts[-1]["page_session"] = stats
+        if rep.failed:
+            item._attempts[-1]["visited"] = list(page_session.navigations)
+        record_session_stats(item.config, "page_session", stats)
+    slow_waits = getattr(page, "_slow_waits", None)
+    if slow_waits:
+        item._attempts[-1]["slow_waits"] = slow_waits  # 超过 SLOW_WAIT_SECONDS 或 lite 等待超时（见 utils/waits.py）
+
+    # 前端性能指标按步骤附加到用例记录与 Allure（通过、失败都记录）
+    recorder = getattr(page, "_web_vitals", None)
+    if recorder and recorder.steps:
+        item._attempts[-1]["web_vitals"] = recorder.steps
+        allure.attach(json.dumps(recorder.steps, ensure_ascii=False, indent=2), name="🚀 Web vitals",
+                      attachment_type=allure.attachment_type.JSON)
+
+    if not rep.failed:
+        return
+
+    # ========= UI 项目的职责 =========
+    if not page:
+        return
+
+    # 保存 Python 端的断言错误到 page
+    page._test_error = str(rep.longrepr) if rep.failed else ""
+
+    item._failed = True
+
+    # 收集失败数据
+    # attempt = getattr(item, "execution_count", 1)
+    # record_failed_attempt(item, attempt, "FAILED" if rep.failed else "PASSED", duration,
+    #                       str(rep.longrepr) if rep.failed else "")
+
+    # 构建artifacts 目录,报错错误证据
+    module_name = item.module.__name__.split(".")[-1]
+    class_name = item.cls.__name__ if item.cls else "no_class"
+    test_name = item.name
+    attempt_dir = f"attempt_{attempt}"
+    base_dir = artifact_root(item.config) / module_name / class_name / test_name / attempt_dir
+    base_dir.mkdir(parents=True, exist_ok=True)
+
+    item._failure_artifacts = save_failure_artifacts(page, base_dir, get_artifact_writer(item.config),
+                                                     item.config.getini("artifact_screenshot"))
+
+
+# ================== Utility Functions ==================
+RECORD_SEQ = itertools.count(1)  # 本进程内 video / trace 临时目录序号
+
+def is_xdist_worker(config) -> bool:
+    """pytest-xdist 的 worker 进程才有 workerinput"""
+    return hasattr(config, "workerinput")
+
+
+def get_worker_id() -> str:
+    """当前 worker 标识：gw0、gw1...，串行执行时为 master"""
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def new_test_context(browser, storage_state, block_profile, route_cache, resource_sizes, record_options=None):
+    """创建用例 context，接入静态资源缓存与请求拦截"""
+    context = browser.new_context(
+        storage_state=str(storage_state) if storage_state else None,
+        viewport={"width": 1920, "height": 1080},
+        **(record_options or {}))
+    if route_cache:
+        route_cache.attach(context)  # 静态资源走 session 共享缓存，新 context 不再冷启动下载
+
+    # 后注册的路由先执行：拦截器先判断，未拦截的再交给 route cache
+    blocker = ResourceBlocker(block_profile, resource_sizes)
+    blocker.attach(context)
+    return context, blocker
+
+
+def finish_attempt_timing(item):
+    root = TIMING.finish_test()
+    if root is None:
+        return
+    tree = root.to_dict()
+    if not hasattr(item.config, "_span_trees"):
+        item.config._span_trees = {}
+    item.config._span_trees.setdefault(item.nodeid, []).append(tree)  # 重跑时一个用例多棵树
+    attempts = getattr(item, "_attempts", [])
+    if attempts and "wall_time" not in attempts[-1]:
+        attempts[-1]["wall_time"] = round(root.duration, 2)  # setup + call + teardown
+    current = attempts[-1] if attempts else {}
+    record_perf_attempt(item.config, {
+        "nodeid": item.nodeid,
+        "attempt": getattr(item, "execution_count", 1),
+        "status": current.get("status", "ERROR"),  # setup 失败时没有 call 记录
+        "failure_kind": getattr(item, "_failure_kind", None),
+        "rerun": getattr(item, "_rerun_reason", None),
+        "wall_time": round(root.duration, 3),
+        "actions": {name: round(seconds, 3) for name, seconds in action_totals(root).items()}})
+    allure.attach(json.dumps(tree, ensure_ascii=False, indent=2), name="⏱ Timing spans",
+                  attachment_type=allure.attachment_type.JSON)
+
+
+def finish_perf_report(session):
+    """主进程：汇总所有 attempt 生成报告、追加历史，--perf-gate 时对比基线"""
+    config = session.config
+    records = get_perf_records(config)
+    if not records:
+        return
+    report = build_perf_report(records, time.perf_counter() - config._session_start,
+                               rerun_delay=getattr(config.option, "reruns_delay", 0) or 0, env=ENV)
+    if get_rerun_scheduler(config):
+        report["smart_reruns"] = summarize_reruns(records)
+        history = FlakeHistory(FLAKY_HISTORY_FILE)
+        history.update(records)
+        history.save()
+    shard = getattr(config, "_shard_summary", None)
+    durations = update_durations(records, Path(config.getoption("--durations-file")), save=shard is None)
+    if shard:
+        shard["wall_time"] = report["wall_time"]
+        shard["durations"] = {r["nodeid"]: durations[r["nodeid"]] for r in records}  # 合并时写回总的 durations.json
+        report["shard"] = shard
+        write_shard_summary(shard, getattr(config, "_shard"))
+    append_history(report, HISTORY_FILE)
+    config._perf_report = report
+
+    baseline_path = Path(config.getoption("--perf-baseline"))
+    if config.getoption("--perf-gate"):
+        baseline = load_baseline(baseline_path)
+        if baseline is None:
+            config._perf_gate_result = [f"perf gate: 没有基线 {baseline_path}，跳过（--perf-update-baseline 生成）"]
+        else:
+            skip_reason = gate_skip_reason(report, baseline)
+            if skip_reason:
+                config._perf_gate_result = [f"perf gate: {skip_reason}，与基线不可比，跳过"]
+            else:
+                thresholds = {metric: float(config.getini(f"perf_gate_{metric}")) for metric in DEFAULT_GATE_THRESHOLDS}
+                failures = check_regressions(report, baseline, thresholds)
+                config._perf_gate_result = [f"❌ perf regression {line}" for line in failures] or ["✅ perf gate passed"]
+                if failures and session.exitstatus == pytest.ExitCode.OK:
+                    session.exitstatus = pytest.ExitCode.TESTS_FAILED
+    if config.getoption("--perf-update-baseline"):
+        save_baseline(report, baseline_path)
+
+
+def write_shard_summary(summary: dict, shard):
+    """perf/shard-K.json：合并脚本据此打印各 shard 的预计 / 实际耗时"""
+    path = PERF_DIR / f"{shard_label(shard)}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def get_rerun_scheduler(config) -> RerunScheduler | None:
+    """--smart-reruns 0 或显式使用 --reruns 时返回 None"""
+    if config.getoption("--smart-reruns") <= 0 or getattr(config.option, "reruns", None) is not None:
+        return None
+    if not hasattr(config, "_rerun_scheduler"):
+        config._rerun_scheduler = RerunScheduler(FlakeHistory(FLAKY_HISTORY_FILE), config.getoption("--smart-reruns"),
+                                                 float(config.getini("smart_rerun_min_flake_rate")))
+    return config._rerun_scheduler
+
+
+def plan_rerun(item, call):
+    item._failure_kind = classify_failure(call.excinfo)
+    scheduler = get_rerun_scheduler(item.config)
+    if scheduler:
+        item._rerun_reason = scheduler.decide(item.nodeid, item._failure_kind, getattr(item, "execution_count", 1))
+        if item._rerun_reason:
+            scheduler.schedule(item)  # 在 teardown 之前入队，PendingReruns 据此保留 session fixture
+
+
+def run_attempt(item, nextitem):
+    """一次 attempt：和 pytest 默认 protocol 相同，只是失败且需要重跑时报告为 rerun"""
+    item.execution_count = getattr(item, "execution_count", 0) + 1
+    if item.execution_count > 1:
+        reset_for_rerun(item)
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    nextitem = nextitem or PendingReruns(get_rerun_scheduler(item.config), item.session)
+    reports = runtestprotocol(item, nextitem=nextitem, log=False)
+    rerun = getattr(item, "_rerun_reason", None)
+    for report in reports:
+        report.rerun = item.execution_count - 1
+        if rerun and report.failed:
+            report.outcome = "rerun"
+        item.ihook.pytest_runtest_logreport(report=report)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    reporter = item.config.pluginmanager.get_plugin("terminalreporter")
+    if rerun and reporter:
+        reporter.write_line(f"🔁 {item.nodeid} 第 {item.execution_count} 次失败（{item._failure_kind}，{rerun}），排入重跑",
+                            yellow=True)
+
+
+def run_rerun_batches(session):
+    """主流程结束后成批重跑；每批中再次失败且仍可重跑的用例进入下一批"""
+    scheduler = get_rerun_scheduler(session.config)
+    while scheduler and scheduler.queue and not (session.shouldfail or session.shouldstop):
+        batch = scheduler.next_batch()
+        start = time.perf_counter()
+        for index, item in enumerate(batch):
+            run_attempt(item, batch[index + 1] if index + 1 < len(batch) else None)
+        record_session_stats(session.config, "smart_reruns",
+                             {"batches": 1, "reruns": len(batch), "batch_seconds": round(time.perf_counter() - start, 2)})
+
+
+def get_block_profile(request) -> str:
+    marker = request.node.get_closest_marker("block_profile")
+    name = marker.args[0] if marker else request.config.getini("block_profile")
+    if name not in BLOCK_PROFILES:
+        raise pytest.UsageError(f"未知的 block_profile：{name}，可选 {list(BLOCK_PROFILES)}")
+    return name
+
+
+def get_setup_mode(request) -> str:
+    marker = request.node.get_closest_marker("setup_mode")
+    mode = marker.args[0] if marker else request.config.getini("setup_mode")
+    if mode not in SETUP_MODES:
+        raise pytest.UsageError(f"未知的 setup_mode：{mode}，可选 {list(SETUP_MODES)}")
+    return mode
+
+
+def start_local_storefront(config):
+    """ENV=local 时在主进程启动本地 storefront（已有实例在运行则直接复用），worker 共用同一个"""
+    host, port = LOCAL_STOREFRONT["host"], LOCAL_STOREFRONT["port"]
+    if ENV != "local" or is_running(host, port):
+        return
+    config._storefront = StorefrontServer(host, port, LOCAL_STOREFRONT["items"]).start()
+    print(f"🛒 本地 storefront 已启动 -> {config._storefront.base_url}")
+
+
+def clean_directories(paths: list[str]):
+    """清理 session 启动前的目录（get_clean_paths 决定清理哪些）"""
+    for path in paths:
+        p = Path(path)
+        if p.exists():
+            shutil.rmtree(p)
+        p.mkdir(parents=True)
+
+
+def get_artifact_writer(config):
+    """每个进程一个后台写入线程，第一次有产物要处理时创建；pytest_sessionfinish 中 close"""
+    if not hasattr(config, "_artifact_writer"):
+        config._artifact_writer = build_artifact_writer(config)
+    return config._artifact_writer
+
+
+def evict_artifact_store(config):
+    """主进程在所有 worker 结束后淘汰过期 / 超额的 blob"""
+    if not config.getini("artifact_store"):
+        return
+    store = ArtifactStore(max_mb=int(config.getini("artifact_store_max_mb")),
+                          max_age_days=float(config.getini("artifact_store_max_age_days")))
+    stats = store.evict()
+    if stats["store_blobs"] or stats["evicted_blobs"]:
+        record_session_stats(config, "artifact_store", stats)
+
+
+def artifact_root(config) -> Path:
+    """--shard 时为 artifacts/shard-K，多台机器的产物目录合并时不会冲突"""
+    shard = getattr(config, "_shard", None)
+    return Path("artifacts") / shard_label(shard) if shard else Path("artifacts")
+
+
+def get_clean_paths(config) -> list[str]:
+    """分片时只清理本 shard 的 artifacts / allure-results 子目录，同一台机器上依次执行多个 shard 也能合并"""
+    paths = {name: name for name in CLEAN_DIRS}
+    if getattr(config, "_shard", None):
+        paths["artifacts"] = str(artifact_root(config))
+        paths["allure-results"] = getattr(config.option, "allure_report_dir", None) or paths["allure-results"]
+    return list(paths.values())
+
+
+def get_attempt_dir(root, module, cls, test_name, attempt):
+    """构建 attempt artifacts 目录"""
+    attempt_dir = f"attempt_{attempt}"
+    target_dir = root / module / cls / test_name / attempt_dir
+    target_dir.mkdir(parents=True, exist_ok=True)
+    return target_dir
+
+
+def save_failure_artifacts(page, base_dir, writer, screenshot_format="png") -> dict:
+    """保存失败截图、URL、console errors；截图必须在此刻同步取（页面状态），写盘交给后台"""
+    if screenshot_format == "jpeg":
+        screenshot = page.screenshot(full_page=True, type="jpeg", quality=80)  # 生成失败用例截图
+        writer.write_bytes(base_dir / "failure.jpg", screenshot)
+    else:
+        screenshot = page.screenshot(full_page=True)  # 生成失败用例截图
+        writer.write_bytes(base_dir / "failure.png", screenshot)
+
+    writer.write_bytes(base_dir / "url.txt", page.url)  # 生成失败用例URL文件
+
+    console_errors = getattr(page, "_console_errors", [])
+    writer.write_bytes(base_dir / "browser_console_errors.json",  # 生成失败用例Console errors文件（过大时 gzip）
+                       json.dumps(console_errors, indent=2, ensure_ascii=False), compress=True)
+
+    ring = getattr(page, "_screenshot_ring", None)
+    ring_shots = ring.dump(base_dir, writer) if ring else []  # 失败前最近几个动作的截图
+
+    error_file = base_dir / "test_failure_errors.txt"
+    if getattr(page, "_test_error", None):
+        writer.write_bytes(error_file, page._test_error, compress=True)
+
+    return {"has_screenshot": bool(screenshot), "url": page.url, "ring_shots": ring_shots}
+
+
+def move_artifacts(writer, src_video_dir, src_trace, dst_dir) -> tuple[list[Path], bool]:
+    """移动视频和trace到目标目录，返回移动后的视频路径与是否有 trace"""
+    videos = []
+    for video_file in src_video_dir.glob("*.webm"):
+        writer.move(video_file, dst_dir / video_file.name)
+        videos.append(dst_dir / video_file.name)
+    has_trace = src_trace.exists()
+    if has_trace:
+        writer.move(src_trace, dst_dir / "trace.zip")
+    writer.remove_tree(src_video_dir)
+    writer.remove_tree(src_trace.parent)
+    return videos, has_trace
+
+
+def attach_artifacts_to_allure(writer, ring_shots, videos, trace_dir):
+    """将 video / trace / 环形截图 附件到 Allure：附件记录此刻写入用例结果，文件由后台复制（排在移动之后）"""
+    for shot in ring_shots:
+        writer.attach(shot, name=f"📷 {shot.stem}", attachment_type=allure.attachment_type.JPG)
+    for video in videos:
+        writer.attach(video, name="📎 Video", attachment_type=allure.attachment_type.WEBM)
+    if trace_dir:
+        writer.attach(trace_dir / "trace.zip", name="Playwright-Trace.zip", attachment_type=allure.attachment_type.ZIP)
+
+
+def record_failed_attempt(item, attempt, status, duration, error=""):
+    """记录一次失败的 attempt"""
+    if not hasattr(item, "_attempts"):
+        item._attempts = []
+    item._attempts.append({
+        "attempt": attempt,
+        "status": status,
+        "duration": duration,
+        "error": error,
+        "url": None  # 稍后在 teardown 补
+    })
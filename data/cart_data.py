@@ -1,6 +1,6 @@
-ADD_PRODUCT_COUNT = 4
-DELETE_PRODUCT_COUNT=2
-
-# continue shopping add product count
-FIRST_PRODUCT_COUNT=1
-SECOND_PRODUCT_COUNT=2
+ADD_PRODUCT_COUNT = 4
+DELETE_PRODUCT_COUNT=2
+
+# continue shopping add product count
+FIRST_PRODUCT_COUNT=1
+SECOND_PRODUCT_COUNT=2
@@ -1,12 +1,12 @@
-ADD_PRODUCT_NUM = 3
-
-CONTAINER_INFO = {
-    "first_name": "John",
-    "last_name": "Smith",
-    "postal": "100000"
-}
-
-# CONTAINER_EMPTY_ERROR_MSG = "First Name is required"
-# FINISH_PAGE_MESSAGE="Thank you for your order!"
-FINISH_PAGE_MESSAGE = "哈哈哈!"
-CONTAINER_EMPTY_ERROR_MSG = "吼吼吼！"
+ADD_PRODUCT_NUM = 3
+
+CONTAINER_INFO = {
+    "first_name": "John",
+    "last_name": "Smith",
+    "postal": "100000"
+}
+
+# CONTAINER_EMPTY_ERROR_MSG = "First Name is required"
+# FINISH_PAGE_MESSAGE="Thank you for your order!"
+FINISH_PAGE_MESSAGE = "哈哈哈!"
+CONTAINER_EMPTY_ERROR_MSG = "吼吼吼！"
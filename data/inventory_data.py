@@ -1,8 +1,8 @@
-PRODUCT_COUNT = 6 # inventory商品总数
-
-PRODUCT_SORT = {
-    "name_asc": "Name (A to Z)",
-    "name_desc": "Name (Z to A)",
-    "price_asc": "Price (low to high)",
-    "price_desc": "Price (high to low)"
+PRODUCT_COUNT = 6 # inventory商品总数
+
+PRODUCT_SORT = {
+    "name_asc": "Name (A to Z)",
+    "name_desc": "Name (Z to A)",
+    "price_asc": "Price (low to high)",
+    "price_desc": "Price (high to low)"
 }
\ No newline at end of file
@@ -0,0 +1,14 @@
+"""压测 profile（scripts/load_checkout.py --profile xxx）：
+local —— 本地 storefront 离线压测，不对 saucedemo 产生流量
+smoke —— 任意环境下验证旅程能跑通
+soak  —— 长时间稳定性（超过 cookie 有效期，登录态在运行中按需重新生成）
+"""
+
+LOAD_PROFILES = {
+    "local": {"env": "local", "users": 20, "duration": 60, "iterations": None, "ramp_up": 10,
+              "think_time": (0.2, 0.5)},
+    "smoke": {"env": None, "users": 2, "duration": None, "iterations": 2, "ramp_up": 0, "think_time": (1.0, 2.0)},
+    "soak": {"env": None, "users": 10, "duration": 30 * 60, "iterations": None, "ramp_up": 60,
+             "think_time": (2.0, 5.0)},
+}
+DEFAULT_LOAD_PROFILE = "local"
@@ -1,25 +1,31 @@
-"""login功能测试用例：
-测试正常登录流程
-用户名错误
-密码错误
-用户名和密码都为空
-密码为空
-用户名不存在
-"""
-
-LOGIN_USERS = {
-    "success_login": {"username": "standard_user", "password": "secret_sauce"},
-    "wrong_username": {"username": "HAHAHA", "password": "secret_sauce",
-                       "error_msg": "Username and password do not match any user in this service"},
-    "wrong_password": {"username": "standard_user", "password": "12345",
-                       "error_msg": "Username and password do not match any user in this service"},
-    "empty_username_password": {"username": "", "password": "", "error_msg": "Username is required"},
-    "empty_password": {"username": "standard_user", "password": "", "error_msg": "Password is required"},
-    "inexistence_username": {"username": "test_user", "password": "secret_sauce",
-                             "error_msg": "Username and password do not match any user in this service"}
-}
-
-LOGIN_SUCCESS_URL="/inventory.html"
-
-SAVE_LOGIN_STATE_PATH="storage"
-SAVE_LOGIN_STATE_FILE="/login.json"
\ No newline at end of file
+"""login功能测试用例：
+测试正常登录流程
+用户名错误
+密码错误
+用户名和密码都为空
+密码为空
+用户名不存在
+"""
+
+LOGIN_USERS = {
+    "success_login": {"username": "standard_user", "password": "secret_sauce"},
+    "wrong_username": {"username": "HAHAHA", "password": "secret_sauce",
+                       "error_msg": "Username and password do not match any user in this service"},
+    "wrong_password": {"username": "standard_user", "password": "12345",
+                       "error_msg": "Username and password do not match any user in this service"},
+    "empty_username_password": {"username": "", "password": "", "error_msg": "Username is required"},
+    "empty_password": {"username": "standard_user", "password": "", "error_msg": "Password is required"},
+    "inexistence_username": {"username": "test_user", "password": "secret_sauce",
+                             "error_msg": "Username and password do not match any user in this service"}
+}
+
+LOGIN_SUCCESS_URL="/inventory.html"
+
+SAVE_LOGIN_STATE_PATH="storage"
+SAVE_LOGIN_STATE_FILE="login_{env}_{user_key}.json"  # 登录态按 环境+用户 分别缓存
+LOGIN_STATE_MIN_TTL = 300  # cookie 剩余有效期少于该秒数视为过期，避免用例执行中途登录态失效
+
+# saucedemo 登录成功后写入的会话 cookie（cookie 注入登录使用）
+SESSION_COOKIE_NAME = "session-username"
+SESSION_COOKIE_TTL = 600  # saucedemo 会话 cookie 有效期 10 分钟
+COOKIE_VERIFY_TTL = 24 * 3600  # cookie 注入方式与 UI 登录的对比结果跨 session 复用的时长（秒）
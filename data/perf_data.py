@@ -0,0 +1,6 @@
+"""前端性能预算（web vitals）：
+LCP / FCP / TTFB 单位 ms，CLS 为分数
+数值参考 web.dev 的 good 阈值
+"""
+
+WEB_VITALS_BUDGET = {"lcp": 2500, "fcp": 1800, "ttfb": 800, "cls": 0.1}
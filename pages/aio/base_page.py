@@ -0,0 +1,52 @@
+from playwright.async_api import Page, expect
+
+from pages.base_page import EXTRACT_ROWS_JS, normalize_schema, parse_rows
+from pages.session import PageSession
+from utils.waits import DOM_QUIET_JS, url_pattern
+
+
+class BasePage:
+    """pages.base_page.BasePage 的 asyncio 版本：同一进程内多个 page 可并发驱动"""
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.session = PageSession.of(page)
+        self.session.register(self)
+
+    # ========= 基础动作 =========
+    async def open(self, url: str):
+        await self.page.goto(url)
+
+    async def click(self, locator):
+        await locator.click()
+
+    async def fill(self, locator, value: str):
+        await locator.fill(value)
+
+    async def text(self, locator) -> str:
+        return await locator.inner_text()
+
+    async def get_texts(self, locator) -> list[str]:
+        return await locator.evaluate_all("els => els.map(el => el.innerText)")
+
+    async def get_attrs(self, locator, attr: str) -> list[str]:
+        return await locator.evaluate_all("(els, attr) => els.map(el => el.getAttribute(attr))", attr)
+
+    async def get_rows(self, container, schema: dict) -> list[dict]:
+        """行快照，schema 规则同 pages.base_page.BasePage.get_rows"""
+        fields = normalize_schema(schema)
+        rows = await container.evaluate_all(EXTRACT_ROWS_JS, [[key, f.selector, f.attr] for key, f in fields.items()])
+        return parse_rows(rows, fields)
+
+    async def get_count(self, locator) -> int:
+        return await locator.count()
+
+    # ========= 等待 =========
+    async def wait_visible(self, locator):
+        await expect(locator).to_be_visible()
+
+    async def wait_url(self, pattern: str):
+        await expect(self.page).to_have_url(url_pattern(pattern))
+
+    async def wait_dom_quiet(self, container, quiet_ms: int = 100, timeout_ms: int = 5000) -> bool:
+        return (await container.evaluate(DOM_QUIET_JS, [quiet_ms, timeout_ms]))["quiet"]
@@ -0,0 +1,67 @@
+from playwright.async_api import Page
+
+from config.locators import CART_LOCATORS, LOGIN_LOCATORS
+from pages.base_page import Field
+from pages.aio.base_page import BasePage
+from pages.aio.inventory_page import InventoryPage
+from pages.inventory_page import PRODUCT_ROW, ProductInfo
+from pages.session import Loc
+from assertions.cart_assert import CartAssert
+
+
+class CartPage(BasePage):
+    products_list = InventoryPage.item_product  # 商品列表（与 InventoryPage 共用）
+    add_product_button = Loc(CART_LOCATORS["add_product_button"])  # add商品按钮
+    remove_product_button = Loc(CART_LOCATORS["remove_product_button"])  # remove商品按钮
+    shopping_cart_visible_count = Loc(CART_LOCATORS["shopping_cart_visible_count"])  # 购物车显示商品数
+    shopping_cart_button = Loc(LOGIN_LOCATORS["shopping_cart_visible"])  # 购物车icon
+    continue_shopping_button = Loc(CART_LOCATORS["continue"])  # continue-shopping按钮
+
+    # ================= 页面行为 =================
+    async def add_product(self, add_product_num: int) -> list[ProductInfo]:
+        rows = await self.get_rows(self.products_list, {**PRODUCT_ROW,
+                                                        "can_add": Field(CART_LOCATORS["add_product_button"],
+                                                                         "data-test")})
+        addable = [row for row in rows if row.pop("can_add") is not None]
+        assert len(addable) >= add_product_num, f"可加购商品不足"
+        for _ in range(add_product_num):
+            await self.click(self.add_product_button.first)
+        return addable[:add_product_num]
+
+    async def remove_product(self, count: int):
+        for i in range(count):
+            await self.click(self.remove_product_button.nth(i))
+
+    async def go_to_cart(self, pattern: str):
+        await self.click(self.shopping_cart_button)
+        await self.wait_url(pattern)
+
+    async def continue_shopping(self, pattern: str):
+        await self.click(self.continue_shopping_button)
+        await self.wait_url(pattern)
+
+    # ================= 数据获取 =================
+    async def get_cart_badge_count(self) -> int:
+        if await self.shopping_cart_visible_count.count() == 0:
+            return 0
+        return int(await self.text(self.shopping_cart_visible_count))
+
+    async def get_remove_count(self) -> int:
+        return await self.get_count(self.remove_product_button)
+
+    async def get_cart_products_info(self) -> list[ProductInfo]:
+        return await self.get_rows(self.products_list, PRODUCT_ROW)
+
+    # ================= 基础验证 =================
+    async def verify_add_product(self, add_count: int):
+        CartAssert.cart_badge_count(await self.get_cart_badge_count(), add_count)
+        CartAssert.remove_count(await self.get_remove_count(), add_count)
+
+    async def verify_delete(self, add_count: int, delete_count: int):
+        CartAssert.cart_badge_count(await self.get_cart_badge_count(), add_count - delete_count)
+        CartAssert.remove_count(await self.get_remove_count(), add_count - delete_count)
+
+    async def verify_cart_product_info_match_inventory(self, added_products: list):
+        cart_products = await self.get_cart_products_info()
+        CartAssert.added_product_count(added_products, cart_products)
+        CartAssert.product_detail_info(added_products, cart_products)
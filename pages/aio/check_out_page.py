@@ -0,0 +1,108 @@
+from decimal import Decimal
+
+from playwright.async_api import Page, expect
+
+from config.locators import CHECKOUT_LOCATORS
+from utils.common_utils import parse_money
+from pages.aio.base_page import BasePage
+from pages.session import Loc
+from pages.aio.inventory_page import InventoryPage
+from pages.aio.cart_page import CartPage
+from pages.check_out_page import CheckOutPage as SyncCheckOutPage
+from pages.inventory_page import ProductInfo
+from assertions.check_out_assert import CheckOutAssert
+
+
+class CheckOutPage(BasePage):
+    ORDER_PRODUCT_ROW = SyncCheckOutPage.ORDER_PRODUCT_ROW
+
+    #  step one 收货人信息
+    checkout_button = Loc(CHECKOUT_LOCATORS["checkout_button"])  # 结算按钮
+    firstName_input = Loc(CHECKOUT_LOCATORS["firstName_input"])  # firstName输入框
+    lastName_input = Loc(CHECKOUT_LOCATORS["lastName_input"])  # lastName输入框
+    postalCode_input = Loc(CHECKOUT_LOCATORS["postalCode_input"])  # postalCode输入框
+    container_empty_error_msg = Loc(CHECKOUT_LOCATORS["container_error_msg"])  # 收货人未填写错误提示
+    step_one_cancel_button = Loc(CHECKOUT_LOCATORS["step_one_cancel_button"])  # 取消按钮
+    continue_button = Loc(CHECKOUT_LOCATORS["continue_button"])  # 继续按钮
+    #  step two 商品信息、订单价格
+    item_product = Loc(CHECKOUT_LOCATORS["item_list"])
+    payment_information = Loc(CHECKOUT_LOCATORS["payment_information"])  # 支付信息value
+    shipping_information = Loc(CHECKOUT_LOCATORS["shipping_information"])  # 运费信息value
+    item_total = Loc(CHECKOUT_LOCATORS["products_price"])  # 商品总价格
+    tax = Loc(CHECKOUT_LOCATORS["tax_price"])  # 运费
+    total = Loc(CHECKOUT_LOCATORS["order_price"])  # 订单价格
+    # 操作步骤
+    step_two_cancel_button = Loc(CHECKOUT_LOCATORS["step_two_cancel_button"])  # 取消按钮
+    finish_button = Loc(CHECKOUT_LOCATORS["finish_button"])  # 完成按钮
+    finish_message = Loc(CHECKOUT_LOCATORS["finish_page_message"])
+
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self.added_products: list[ProductInfo] = []  # 存储加购的商品
+
+    # ========== 前提条件准备 ==========
+    async def prepare(self, inventory_url: str, add_count: int, cart_url: str, step_one_url: str):
+        """checkout 模块前置条件：inventory 加购 → 进入 cart → 进入 checkout step one"""
+        await self.session.page_object(InventoryPage).open_inventory(inventory_url)
+        cart_page = self.session.page_object(CartPage)
+        self.added_products = await cart_page.add_product(add_count)
+        await cart_page.go_to_cart(cart_url)
+        await self.click_checkout(step_one_url)
+
+    # ========== 页面行为 ==========
+    async def click_checkout(self, pattern: str):
+        await self.click(self.checkout_button)
+        await self.wait_url(pattern)
+
+    async def fill_container(self, first_name: str, last_name: str, postal_code: str):
+        await self.fill(self.firstName_input, first_name)
+        await self.fill(self.lastName_input, last_name)
+        await self.fill(self.postalCode_input, postal_code)
+
+    async def stet_one_continue(self, pattern: str):
+        await self.click(self.continue_button)
+        await self.wait_url(pattern)
+
+    async def stet_one_cancel(self, pattern: str):
+        await self.click(self.step_one_cancel_button)
+        await self.wait_url(pattern)
+
+    async def step_two_cancel(self, pattern: str):
+        await self.click(self.step_two_cancel_button)
+        await self.wait_url(pattern)
+
+    async def step_two_submit(self, pattern: str):
+        await self.click(self.finish_button)
+        await self.wait_url(pattern)
+
+    # ================= 数据获取 =================
+    async def get_step_two_products_info(self) -> list[ProductInfo]:
+        await expect(self.item_product).not_to_have_count(0)
+        return await self.get_rows(self.item_product, self.ORDER_PRODUCT_ROW)
+
+    # ========== checkout-step-one 基本验证 ==========
+    async def verify_container_empty(self, expect_error_msg: str):
+        CheckOutAssert.tips_message(await self.text(self.container_empty_error_msg), expect_error_msg)
+
+    # ========== checkout-step-two 基本验证 ==========
+    async def verify_order_products_match_added(self):
+        order_products = await self.get_step_two_products_info()
+        CheckOutAssert.product_count(self.added_products, order_products)
+        CheckOutAssert.product_detail_match(self.added_products, order_products)
+
+    async def verify_order_base_info(self):
+        payment, shipping = await self.text(self.payment_information), await self.text(self.shipping_information)
+        item_total, tax, total = await self.text(self.item_total), await self.text(self.tax), await self.text(self.total)
+        CheckOutAssert.not_empty(payment)
+        CheckOutAssert.not_empty(shipping)
+        CheckOutAssert.price_format(item_total)
+        CheckOutAssert.price_format(tax)
+        CheckOutAssert.price_format(total)
+
+        products_sum = sum((p["product_price"] for p in await self.get_step_two_products_info()), Decimal("0"))
+        CheckOutAssert.price_equal(products_sum, parse_money(item_total))
+        CheckOutAssert.order_price(parse_money(item_total), parse_money(tax), parse_money(total))
+
+    # ========== 提交订单页面 ==========
+    async def verify_submit_order(self, finish_message: str):
+        CheckOutAssert.tips_message(await self.text(self.finish_message), finish_message)
@@ -0,0 +1,58 @@
+from decimal import Decimal
+
+from playwright.async_api import Page
+
+from config.locators import INVENTORY_LOCATORS
+from pages.aio.base_page import BasePage
+from pages.session import Loc
+from pages.inventory_page import INVENTORY_SNAPSHOT_ROW, PRICE_ROW
+from assertions.inventory_assert import InventoryAssert
+
+
+class InventoryPage(BasePage):
+    product_list = Loc(INVENTORY_LOCATORS["product_list"])  # 商品列表容器
+    item_product = Loc(INVENTORY_LOCATORS["item_product"])  # 商品列表
+    item_product_name = Loc(INVENTORY_LOCATORS["item_product_name"])
+    item_product_price = Loc(INVENTORY_LOCATORS["item_product_price"])
+    product_sort_type = Loc(INVENTORY_LOCATORS["product_sort_type"])  # 排序下拉框
+
+    # ================= 页面行为 =================
+    async def open_inventory(self, inventory_url: str):
+        await self.open(inventory_url)
+        await self.wait_visible(self.item_product.first)
+
+    async def sort_by(self, label: str):
+        await self.product_sort_type.select_option(label=label)
+        await self.wait_dom_quiet(self.product_list)  # 列表在前端重排，等容器 DOM 静默再读取
+
+    # ================= 数据获取 =================
+    async def get_products_snapshot(self) -> list[dict]:
+        return await self.get_rows(self.item_product, INVENTORY_SNAPSHOT_ROW)
+
+    async def get_product_names(self) -> list[str]:
+        return await self.get_texts(self.item_product_name)
+
+    async def get_product_prices_as_number(self) -> list[Decimal]:
+        return [p["product_price"] for p in await self.get_rows(self.item_product, PRICE_ROW)]
+
+    # ========== 基础校验 ==========
+    async def verify_base_info(self, expect_count: int):
+        products = await self.get_products_snapshot()
+        InventoryAssert.product_count(len(products), expect_count)
+        InventoryAssert.column_not_empty([p["product_name"] for p in products])
+        InventoryAssert.column_not_empty([p["product_desc"] for p in products])
+        InventoryAssert.column_not_empty([p["product_img"] for p in products])
+        InventoryAssert.product_price_format([p["product_price_text"] for p in products])
+        InventoryAssert.product_price_is_decimal([p["product_price"] for p in products])
+
+    async def verify_name_asc(self):
+        InventoryAssert.sort_asc(await self.get_product_names())
+
+    async def verify_name_desc(self):
+        InventoryAssert.sort_desc(await self.get_product_names())
+
+    async def verify_price_asc(self):
+        InventoryAssert.sort_asc(await self.get_product_prices_as_number())
+
+    async def verify_price_desc(self):
+        InventoryAssert.sort_desc(await self.get_product_prices_as_number())
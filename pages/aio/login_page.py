@@ -0,0 +1,30 @@
+from playwright.async_api import Page
+
+from config.locators import LOGIN_LOCATORS
+from pages.aio.base_page import BasePage
+from pages.session import Loc
+from assertions.login_assert import LoginAssert
+
+
+class LoginPage(BasePage):
+    username_input = Loc(LOGIN_LOCATORS["username_input"])  # 用户名输入框
+    password_input = Loc(LOGIN_LOCATORS["password_input"])  # 密码输入框
+    login_button = Loc(LOGIN_LOCATORS["login_button"])  # 登录按钮
+    error_message = Loc(LOGIN_LOCATORS["error_msg"])  # 登录校验错误提示信息
+
+    # ================= 页面行为 =================
+    async def open_login(self, login_url: str):
+        await self.open(login_url)
+        await self.wait_visible(self.username_input)
+
+    async def login(self, username, password):
+        await self.fill(self.username_input, username)
+        await self.fill(self.password_input, password)
+        await self.click(self.login_button)
+
+    # ========== 登录校验 ==========
+    async def verify_login_success(self, pattern: str):
+        await self.wait_url(pattern)
+
+    async def verify_login_fail(self, expect_msg: str):
+        LoginAssert.error_message(await self.text(self.error_message), expect_msg)
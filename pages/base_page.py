@@ -1,46 +1,165 @@
-from playwright.sync_api import Page, expect
-import re
-from pathlib import Path
-
-
-class BasePage:
-
-    def __init__(self, page: Page):
-        self.page = page
-
-    # ========= 基础动作 =========
-    def open(self, url: str):
-        self.page.goto(url)
-
-    def click(self, locator):
-        locator.scroll_into_view_if_needed()
-        locator.click()
-
-    def fill(self, locator, value: str):
-        locator.fill(value)
-
-    def text(self, locator) -> str:
-        return locator.inner_text()
-
-    def get_texts(self, locator) -> list[str]:
-        return [locator.nth(i).inner_text() for i in range(locator.count())]
-
-    def get_attrs(self, locator, attr: str) -> list[str]:
-        return [locator.nth(i).get_attribute(attr) for i in range(locator.count())]
-
-    def get_count(self, locator) -> int:
-        return locator.count()
-
-    # ========= 等待 =========
-    def wait_visible(self, locator):
-        expect(locator).to_be_visible()  # 有一个严格模式规则：expect 只能作用在「唯一元素」上，若locator定位到多个元素，则取第一个元素判断
-
-    def wait_url(self, pattern: str):
-        expect(self.page).to_have_url(re.compile(pattern))
-
-    # ========= 辅助 =========
-    # def screenshot(self, filename: str):
-    #     path = self.SCREENSHOT_DIR / self.__class__.__name__
-    #     path.mkdir(parents=True, exist_ok=True)
-    #     # self.SCREENSHOT_DIR.mkdir(exist_ok=True)
-    #     self.page.screenshot(path=path / filename, full_page=True)
+from playwright.sync_api import Page, expect
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+from assertions.perf_assert import PerfAssert
+from utils.timing import TIMING, timed
+from utils.waits import DOM_QUIET_JS, SLOW_WAIT_SECONDS, url_pattern
+from pages.session import PageSession
+
+# 在浏览器端一次性遍历所有行、所有字段，只产生 1 次 CDP 往返
+EXTRACT_ROWS_JS = """
+(els, fields) => els.map(el => {
+    const row = {};
+    for (const [key, selector, attr] of fields) {
+        const target = selector ? el.querySelector(selector) : el;
+        row[key] = !target ? null : attr ? target.getAttribute(attr) : target.innerText;
+    }
+    return row;
+})
+"""
+
+
+class Field(NamedTuple):
+    """行 schema 字段：子元素css（None 为行元素本身）+ 可选属性名 + 可选解析函数（如 parse_money）"""
+    selector: str | None
+    attr: str | None = None
+    parser: Callable[[str], Any] | None = None
+
+
+def normalize_schema(schema: dict) -> dict[str, Field]:
+    """行 schema 统一转成 Field：css 字符串 / (css, attr) 元组 / Field"""
+    return {key: spec if isinstance(spec, Field) else Field(*spec) if isinstance(spec, tuple) else Field(spec)
+            for key, spec in schema.items()}
+
+
+def parse_rows(rows: list[dict], fields: dict[str, Field]) -> list[dict]:
+    """在 Python 端对浏览器取回的原始字符串执行 parser"""
+    for row in rows:
+        for key, f in fields.items():
+            if f.parser and row[key] is not None:
+                row[key] = f.parser(row[key])
+    return rows
+
+
+class BasePage:
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.session = PageSession.of(page)  # 同一 page 上的 page object 共用定位注册表与导航记录
+        self.session.register(self)
+
+    # ========= 基础动作 =========
+    @timed("page.open")
+    def open(self, url: str):
+        self.page.goto(url)
+        self.collect_vitals("open")
+        self.capture("open")
+
+    @timed("page.click")
+    def click(self, locator):
+        locator.click()  # actionability 检查只在元素不在视口内时滚动，无需预先 scroll_into_view_if_needed
+        self.capture("click")
+
+    @timed("page.fill")
+    def fill(self, locator, value: str):
+        locator.fill(value)
+        self.capture("fill")
+
+    @timed("page.text")
+    def text(self, locator) -> str:
+        return locator.inner_text()
+
+    @timed("page.get_texts")
+    def get_texts(self, locator) -> list[str]:
+        """一次 evaluate 取回全部元素的 innerText（原 count + nth(i) 需要 N+1 次往返）"""
+        return locator.evaluate_all("els => els.map(el => el.innerText)")
+
+    @timed("page.get_attrs")
+    def get_attrs(self, locator, attr: str) -> list[str]:
+        """一次 evaluate 取回全部元素的属性值"""
+        return locator.evaluate_all("(els, attr) => els.map(el => el.getAttribute(attr))", attr)
+
+    @timed("page.get_rows")
+    def get_rows(self, container, schema: dict) -> list[dict]:
+        """
+        行快照：container 匹配的每个元素为一行，一次浏览器调用取回所有字段
+        schema = {"字段名": "子元素css"} 取 innerText，{"字段名": ("子元素css", "属性名")} 取属性，
+        或 {"字段名": Field(css, attr, parser)} 取值后在 Python 端解析
+        子元素css 为 None 时取 container 元素本身；子元素不存在时值为 None（不解析）
+        """
+        fields = normalize_schema(schema)
+        rows = container.evaluate_all(EXTRACT_ROWS_JS, [[key, f.selector, f.attr] for key, f in fields.items()])
+        return parse_rows(rows, fields)
+
+    def get_count(self, locator) -> int:
+        return locator.count()
+
+    # ========= 等待 =========
+    def wait_visible(self, locator):
+        with self.waiting("wait_visible", str(locator)):
+            expect(locator).to_be_visible()  # 有一个严格模式规则：expect 只能作用在「唯一元素」上，若locator定位到多个元素，则取第一个元素判断
+
+    def wait_url(self, pattern: str):
+        with self.waiting("wait_url", pattern):
+            expect(self.page).to_have_url(url_pattern(pattern))
+        self.collect_vitals(f"wait_url:{pattern}")
+
+    def wait_dom_quiet(self, container, quiet_ms: int = 100, timeout_ms: int = 5000) -> bool:
+        """容器（及子树）quiet_ms 内没有 DOM 变更，即列表渲染/重排完成；超时返回 False"""
+        with self.waiting("wait_dom_quiet", str(container)) as outcome:
+            quiet = container.evaluate(DOM_QUIET_JS, [quiet_ms, timeout_ms])["quiet"]
+            outcome["timed_out"] = not quiet
+        return quiet
+
+    @contextmanager
+    def waiting(self, name: str, target: str = ""):
+        """所有等待的统一出口：记录 span，超过 SLOW_WAIT_SECONDS（含超时失败）或返回 False 的 lite 等待记入 page._slow_waits"""
+        start, outcome = time.perf_counter(), {"timed_out": False}
+        try:
+            with TIMING.span(f"page.{name}"):
+                yield outcome
+        finally:
+            elapsed = time.perf_counter() - start
+            if elapsed >= SLOW_WAIT_SECONDS or outcome["timed_out"]:
+                if not hasattr(self.page, "_slow_waits"):
+                    self.page._slow_waits = []
+                record = {"wait": name, "target": target, "seconds": round(elapsed, 2)}
+                if outcome["timed_out"]:
+                    record["timed_out"] = True
+                self.page._slow_waits.append(record)
+
+    # ========= 前端性能 =========
+    def web_vitals(self, label: str | None = None) -> dict | None:
+        """最近一次（或指定步骤）采集的前端性能指标，未开启 web vitals 时为 None"""
+        recorder = getattr(self.page, "_web_vitals", None)
+        return recorder.last(label) if recorder else None
+
+    def verify_web_vitals(self, budget: dict, label: str | None = None):
+        """budget 如 data/perf_data.py 的 WEB_VITALS_BUDGET：{"lcp": 2500, "cls": 0.1, ...}"""
+        step = self.web_vitals(label)
+        for metric, limit in budget.items():
+            PerfAssert.under(step, metric, limit)
+
+    # ========= 辅助 =========
+    def collect_vitals(self, label: str):
+        """开启 web vitals 时（conftest 挂载 page._web_vitals）记录本步骤的前端性能指标"""
+        recorder = getattr(self.page, "_web_vitals", None)
+        if recorder is not None:
+            with TIMING.span("page.web_vitals"):
+                recorder.collect(self.page, label)
+
+    def capture(self, label: str):
+        """轻量采集模式下（conftest 挂载 page._screenshot_ring）动作后截图进内存环形缓冲"""
+        ring = getattr(self.page, "_screenshot_ring", None)
+        if ring is not None:
+            with TIMING.span("page.capture"):
+                ring.capture(self.page, label)
+
+    # def screenshot(self, filename: str):
+    #     path = self.SCREENSHOT_DIR / self.__class__.__name__
+    #     path.mkdir(parents=True, exist_ok=True)
+    #     # self.SCREENSHOT_DIR.mkdir(exist_ok=True)
+    #     self.page.screenshot(path=path / filename, full_page=True)
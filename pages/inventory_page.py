@@ -1,82 +1,110 @@
-import re
-from time import sleep
-
-from playwright.sync_api import Page, expect
-from config.locators import INVENTORY_LOCATORS
-from pages.base_page import BasePage
-from assertions.inventory_assert import InventoryAssert
-from decimal import Decimal
-
-
-class InventoryPage(BasePage):
-    def __init__(self, page: Page):
-        super().__init__(page)
-        # 商品列表
-        self.item_product = page.locator(INVENTORY_LOCATORS["item_product"])
-
-        # 商品明细
-        self.item_product_name = page.locator(INVENTORY_LOCATORS["item_product_name"])
-        self.item_product_price = page.locator(INVENTORY_LOCATORS["item_product_price"])
-        self.item_product_desc = page.locator(INVENTORY_LOCATORS["item_product_desc"])
-        self.item_product_img = page.locator(INVENTORY_LOCATORS["item_product_img"])
-
-        # 排序下拉框
-        self.product_sort_type = page.locator(INVENTORY_LOCATORS["product_sort_type"])
-
-    # ================= 页面行为 =================
-    def open_inventory(self, inventory_url: str):
-        self.open(inventory_url)
-        self.wait_visible(self.item_product.first)
-
-    # 选择排序方式
-    def sort_by(self, label: str):
-        self.product_sort_type.select_option(label=label)
-
-    # ================= 数据获取 =================
-    def get_product_count(self) -> int:
-        return self.get_count(self.item_product)
-
-    def get_product_names(self) -> list[str]:
-        return self.get_texts(self.item_product_name)
-
-    def get_product_description(self) -> list[str]:
-        return self.get_texts(self.item_product_desc)
-
-    def get_product_imgs(self) -> list[str]:
-        return self.get_attrs(self.item_product_img, "src")
-
-    def get_product_prices(self) -> list[str]:
-        return self.get_texts(self.item_product_price)
-
-    def get_product_prices_as_number(self) -> list[Decimal]:
-        return [Decimal(p.replace("$", "")) for p in self.get_product_prices()]
-
-    def get_product_info_by_index(self, index: int):
-        """保存单商品基本信息"""
-        item = self.item_product.nth(index)
-        return {
-            "product_name": self.text(item.locator(self.item_product_name)),
-            "product_price": self.text(item.locator(self.item_product_price)),
-            "product_desc": self.text(item.locator(self.item_product_desc))
-        }
-
-    # ========== 基础校验 ==========
-    def verify_base_info(self, expect_count: int):
-        InventoryAssert.product_count(self.get_product_count(), expect_count)  # 商品数量一致
-        InventoryAssert.column_not_empty(self.get_product_names())  # 商品名称非空
-        InventoryAssert.column_not_empty(self.get_product_description())  # 商品描述非空
-        InventoryAssert.column_not_empty(self.get_product_imgs())  # 商品图片非空
-        InventoryAssert.product_price_format(self.get_product_prices())  # 商品价格非空
-        InventoryAssert.product_price_is_decimal(self.get_product_prices_as_number())  # 商品价格是Decimal
-
-    def verify_name_asc(self):
-        InventoryAssert.sort_asc(self.get_product_names())
-
-    def verify_name_desc(self):
-        InventoryAssert.sort_desc(self.get_product_names())
-
-    def verify_price_asc(self):
-        InventoryAssert.sort_asc(self.get_product_prices_as_number())
-
-    def verify_price_desc(self):
-        InventoryAssert.sort_desc(self.get_product_prices_as_number())
+import re
+
+from typing import TypedDict
+
+from playwright.sync_api import Page, expect
+from config.locators import INVENTORY_LOCATORS
+from pages.base_page import BasePage, Field
+from pages.session import Loc
+from assertions.inventory_assert import InventoryAssert
+from decimal import Decimal
+from utils.common_utils import parse_money
+
+
+class ProductInfo(TypedDict):
+    """商品行记录：加购、购物车、结算页对比的统一结构"""
+    product_name: str
+    product_price: Decimal
+    product_desc: str
+
+
+# 商品行 schema（相对 inventory-item 容器），inventory / cart 页共用同一 DOM 结构
+PRODUCT_ROW = {
+    "product_name": Field(INVENTORY_LOCATORS["item_product_name"]),
+    "product_price": Field(INVENTORY_LOCATORS["item_product_price"], parser=parse_money),
+    "product_desc": Field(INVENTORY_LOCATORS["item_product_desc"]),
+}
+
+# inventory 列表快照：在 PRODUCT_ROW 基础上加图片与价格原文（校验价格格式用）
+INVENTORY_SNAPSHOT_ROW = {
+    **PRODUCT_ROW,
+    "product_price_text": Field(INVENTORY_LOCATORS["item_product_price"]),
+    "product_img": Field(INVENTORY_LOCATORS["item_product_img"], "src"),
+}
+PRICE_ROW = {"product_price": PRODUCT_ROW["product_price"]}
+
+
+class InventoryPage(BasePage):
+
+    # 商品列表
+    product_list = Loc(INVENTORY_LOCATORS["product_list"])
+    item_product = Loc(INVENTORY_LOCATORS["item_product"])
+
+    # 商品明细
+    item_product_name = Loc(INVENTORY_LOCATORS["item_product_name"])
+    item_product_price = Loc(INVENTORY_LOCATORS["item_product_price"])
+    item_product_desc = Loc(INVENTORY_LOCATORS["item_product_desc"])
+    item_product_img = Loc(INVENTORY_LOCATORS["item_product_img"])
+
+    # 排序下拉框
+    product_sort_type = Loc(INVENTORY_LOCATORS["product_sort_type"])
+
+    # ================= 页面行为 =================
+    def open_inventory(self, inventory_url: str):
+        self.open(inventory_url)
+        self.wait_visible(self.item_product.first)
+
+    # 选择排序方式
+    def sort_by(self, label: str):
+        self.product_sort_type.select_option(label=label)
+        # 列表在前端重排，等容器 DOM 静默再读取；超时不失败（数据仍以断言为准），记入 slow_waits
+        self.wait_dom_quiet(self.product_list)
+
+    # ================= 数据获取 =================
+    def get_product_count(self) -> int:
+        return self.get_count(self.item_product)
+
+    def get_product_names(self) -> list[str]:
+        return self.get_texts(self.item_product_name)
+
+    def get_product_description(self) -> list[str]:
+        return self.get_texts(self.item_product_desc)
+
+    def get_product_imgs(self) -> list[str]:
+        return self.get_attrs(self.item_product_img, "src")
+
+    def get_product_prices(self) -> list[str]:
+        return self.get_texts(self.item_product_price)
+
+    def get_product_prices_as_number(self) -> list[Decimal]:
+        return [p["product_price"] for p in self.get_rows(self.item_product, PRICE_ROW)]
+
+    def get_products_snapshot(self) -> list[dict]:
+        """一次浏览器调用取回整个商品列表的名称、价格、描述、图片"""
+        return self.get_rows(self.item_product, INVENTORY_SNAPSHOT_ROW)
+
+    def get_product_info_by_index(self, index: int) -> ProductInfo:
+        """保存单商品基本信息"""
+        return self.get_rows(self.item_product.nth(index), PRODUCT_ROW)[0]
+
+    # ========== 基础校验 ==========
+    def verify_base_info(self, expect_count: int):
+        products = self.get_products_snapshot()  # 同一份快照，避免对同一列表重复往返 5 次
+        InventoryAssert.product_count(len(products), expect_count)  # 商品数量一致
+        InventoryAssert.column_not_empty([p["product_name"] for p in products])  # 商品名称非空
+        InventoryAssert.column_not_empty([p["product_desc"] for p in products])  # 商品描述非空
+        InventoryAssert.column_not_empty([p["product_img"] for p in products])  # 商品图片非空
+        InventoryAssert.product_price_format([p["product_price_text"] for p in products])  # 商品价格非空
+        InventoryAssert.product_price_is_decimal([p["product_price"] for p in products])  # 商品价格是Decimal
+
+    def verify_name_asc(self):
+        InventoryAssert.sort_asc(self.get_product_names())
+
+    def verify_name_desc(self):
+        InventoryAssert.sort_desc(self.get_product_names())
+
+    def verify_price_asc(self):
+        InventoryAssert.sort_asc(self.get_product_prices_as_number())
+
+    def verify_price_desc(self):
+        InventoryAssert.sort_desc(self.get_product_prices_as_number())
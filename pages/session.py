@@ -0,0 +1,80 @@
+import time
+
+"""page 级共享会话：同一个 Playwright page 上的所有 page object 共用一个 PageSession
+    locators —— 元素定位注册表：Loc 描述符首次访问时才创建 locator，按 selector 缓存（不同 page object 共用）
+    page_object(cls) —— 按类缓存 page object，页面之间跳转不再重复实例化
+    navigations —— 主 frame 导航记录，失败时可以看到用例走过的页面
+sync（pages/）与 asyncio（pages/aio/）共用：page.locator / page.on 在两套 API 中都是同步调用
+"""
+
+
+class Loc:
+    """页面元素描述符：Loc(CART_LOCATORS["continue"])，取值时经 PageSession 的注册表解析"""
+
+    def __init__(self, selector: str):
+        self.selector = selector
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj.session.locators.get(self.selector)
+
+
+class LocatorRegistry:
+    def __init__(self, page):
+        self.page = page
+        self.cache = {}
+        self.hits = 0
+        self.build_time = 0.0
+
+    def get(self, selector: str):
+        locator = self.cache.get(selector)
+        if locator is not None:
+            self.hits += 1
+            return locator
+        start = time.perf_counter()
+        locator = self.cache[selector] = self.page.locator(selector)
+        self.build_time += time.perf_counter() - start
+        return locator
+
+
+class PageSession:
+    def __init__(self, page):
+        self.page = page
+        self.locators = LocatorRegistry(page)
+        self.objects = {}
+        self.reuses = 0
+        self.build_time = 0.0
+        self.navigations: list[str] = []
+        page.on("framenavigated", self._on_navigated)
+
+    @classmethod
+    def of(cls, page) -> "PageSession":
+        session = getattr(page, "_page_session", None)
+        if session is None:
+            session = page._page_session = cls(page)
+        return session
+
+    def _on_navigated(self, frame):
+        if frame == self.page.main_frame:
+            self.navigations.append(frame.url)
+
+    def register(self, page_object):
+        """BasePage.__init__ 调用：测试 fixture 里创建的实例也能被其他 page object 复用"""
+        self.objects.setdefault(type(page_object), page_object)
+
+    def page_object(self, cls):
+        page_object = self.objects.get(cls)
+        if page_object is not None:
+            self.reuses += 1
+            return page_object
+        start = time.perf_counter()
+        page_object = cls(self.page)  # __init__ 中 register
+        self.build_time += time.perf_counter() - start
+        return page_object
+
+    def stats(self) -> dict:
+        return {"page_objects": len(self.objects), "page_object_reuses": self.reuses,
+                "locators": len(self.locators.cache), "locator_hits": self.locators.hits,
+                "navigations": len(self.navigations),
+                "page_object_overhead_ms": round((self.build_time + self.locators.build_time) * 1000, 2)}
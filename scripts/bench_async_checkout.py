@@ -0,0 +1,79 @@
+import argparse
+import time
+
+from playwright.sync_api import sync_playwright
+
+from config.pages import URLS, ENV
+from data.checkout_data import ADD_PRODUCT_NUM, CONTAINER_INFO
+from pages.check_out_page import CheckOutPage
+from pages.aio.check_out_page import CheckOutPage as AsyncCheckOutPage
+from utils.async_runner import AsyncScenarioRunner, DEFAULT_CONCURRENCY
+from utils.browser_server import connect_or_launch
+from utils.login_state import login_state_path
+
+"""sync 串行 vs asyncio 并发 benchmark：同一条 checkout 旅程跑 N 次
+    单独执行该脚本命令：python -m scripts.bench_async_checkout --journeys 16 --concurrency 8
+    需要先生成登录态：python -m scripts.save_login_state
+"""
+
+STORAGE_STATE = str(login_state_path())
+
+
+def sync_journey(page, env: str = ENV):
+    check_out_page = CheckOutPage(page)
+    check_out_page.prepare(URLS[env]["inventory"], ADD_PRODUCT_NUM, "/cart.html", "/checkout-step-one.html")
+    check_out_page.fill_container(CONTAINER_INFO["first_name"], CONTAINER_INFO["last_name"], CONTAINER_INFO["postal"])
+    check_out_page.stet_one_continue("/checkout-step-two.html")
+    check_out_page.verify_order_products_match_added()
+    check_out_page.step_two_submit("/checkout-complete.html")
+
+
+async def async_journey(page):
+    check_out_page = AsyncCheckOutPage(page)
+    await check_out_page.prepare(URLS[ENV]["inventory"], ADD_PRODUCT_NUM, "/cart.html", "/checkout-step-one.html")
+    await check_out_page.fill_container(CONTAINER_INFO["first_name"], CONTAINER_INFO["last_name"],
+                                        CONTAINER_INFO["postal"])
+    await check_out_page.stet_one_continue("/checkout-step-two.html")
+    await check_out_page.verify_order_products_match_added()
+    await check_out_page.step_two_submit("/checkout-complete.html")
+
+
+def run_sync(journeys: int) -> float:
+    """现有 sync 路径：一个进程一次只能驱动一个 page"""
+    with sync_playwright() as p:
+        browser, _ = connect_or_launch(p)
+        start = time.perf_counter()
+        for _ in range(journeys):
+            context = browser.new_context(storage_state=STORAGE_STATE)
+            try:
+                sync_journey(context.new_page())
+            finally:
+                context.close()
+        elapsed = time.perf_counter() - start
+        browser.close()
+    return elapsed
+
+
+def run_async(journeys: int, concurrency: int) -> tuple[float, int]:
+    runner = AsyncScenarioRunner(concurrency=concurrency, context_options={"storage_state": STORAGE_STATE}).start()
+    try:
+        start = time.perf_counter()
+        results = runner.run({f"journey_{i}": async_journey for i in range(journeys)})
+        elapsed = time.perf_counter() - start
+    finally:
+        runner.close()
+    return elapsed, sum(r.status == "FAILED" for r in results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--journeys", type=int, default=16, help="checkout 旅程执行次数")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="asyncio 并发 context 上限")
+    args = parser.parse_args()
+
+    sync_elapsed = run_sync(args.journeys)
+    async_elapsed, failed = run_async(args.journeys, args.concurrency)
+    print(f"sync  串行 : {args.journeys} journeys in {sync_elapsed:.1f}s")
+    print(f"async 并发 : {args.journeys} journeys in {async_elapsed:.1f}s "
+          f"(concurrency={args.concurrency}, failed={failed})")
+    print(f"speedup    : {sync_elapsed / async_elapsed:.1f}x")
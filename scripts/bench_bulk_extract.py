@@ -0,0 +1,108 @@
+import time
+
+from playwright.sync_api import sync_playwright
+
+from pages.inventory_page import InventoryPage
+from utils.browser_server import connect_or_launch
+
+"""批量提取 benchmark：逐个 nth(i) 读取 vs BasePage.get_rows 一次读取
+    单独执行该脚本命令：python -m scripts.bench_bulk_extract
+"""
+
+ITEM_SIZES = [6, 100, 1000]
+
+
+class CallCounter:
+    """统计 Locator 上真正发往浏览器的调用次数（每次调用 = 1 次往返）"""
+    ROUND_TRIP_METHODS = ("count", "inner_text", "get_attribute", "evaluate_all")
+
+    def __init__(self):
+        self.calls = 0
+
+    def wrap(self, locator):
+        counter = self
+
+        class _Counted:
+            def __getattr__(self, name):
+                attr = getattr(locator, name)
+                if name in CallCounter.ROUND_TRIP_METHODS:
+                    def call(*args, **kwargs):
+                        counter.calls += 1
+                        return attr(*args, **kwargs)
+
+                    return call
+                if name == "nth":
+                    return lambda i: counter.wrap(attr(i))
+                return attr
+
+        return _Counted()
+
+
+def build_inventory_html(size: int) -> str:
+    """生成与 saucedemo 相同 data-test 结构的商品列表"""
+    items = "".join(
+        f"""<div class="inventory_item" data-test="inventory-item">
+              <div class="inventory_item_img"><img src="/static/media/item_{i}.jpg"></div>
+              <div data-test="inventory-item-name">Product {i}</div>
+              <div data-test="inventory-item-desc">Description of product {i}</div>
+              <div data-test="inventory-item-price">${i % 50 + 9}.99</div>
+            </div>"""
+        for i in range(size))
+    return f"<html><body><div class='inventory_list'>{items}</div></body></html>"
+
+
+def legacy_read(inventory_page: InventoryPage, counter: CallCounter) -> int:
+    """原 verify_base_info 的读取方式：每列 count + nth(i)"""
+    columns = [
+        (inventory_page.item_product_name, None),
+        (inventory_page.item_product_desc, None),
+        (inventory_page.item_product_img, "src"),
+        (inventory_page.item_product_price, None),
+        (inventory_page.item_product_price, None),  # get_product_prices_as_number 再读一遍价格
+    ]
+    counter.wrap(inventory_page.item_product).count()
+    for locator, attr in columns:
+        counted = counter.wrap(locator)
+        for i in range(counted.count()):
+            item = counted.nth(i)
+            item.get_attribute(attr) if attr else item.inner_text()
+    return counter.calls
+
+
+def batched_read(inventory_page: InventoryPage, counter: CallCounter) -> int:
+    """BasePage.get_rows：整张列表一次 evaluate_all"""
+    item_product = inventory_page.item_product
+    inventory_page.item_product = counter.wrap(item_product)
+    try:
+        inventory_page.get_products_snapshot()
+    finally:
+        inventory_page.item_product = item_product
+    return counter.calls
+
+
+def run_benchmark():
+    with sync_playwright() as p:
+        browser, _ = connect_or_launch(p)
+        page = browser.new_page()
+        inventory_page = InventoryPage(page)
+
+        print(f"{'items':>6} | {'legacy calls':>12} | {'legacy ms':>10} | {'batched calls':>13} | {'batched ms':>10} | speedup")
+        for size in ITEM_SIZES:
+            page.set_content(build_inventory_html(size))
+
+            start = time.perf_counter()
+            legacy_calls = legacy_read(inventory_page, CallCounter())
+            legacy_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            batched_calls = batched_read(inventory_page, CallCounter())
+            batched_ms = (time.perf_counter() - start) * 1000
+
+            print(f"{size:>6} | {legacy_calls:>12} | {legacy_ms:>10.1f} | {batched_calls:>13} | {batched_ms:>10.1f} | "
+                  f"{legacy_ms / batched_ms:.1f}x")
+
+        browser.close()
+
+
+if __name__ == "__main__":
+    run_benchmark()
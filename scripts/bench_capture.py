@@ -0,0 +1,82 @@
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from playwright.sync_api import sync_playwright
+
+from config.pages import LOCAL_STOREFRONT, URLS
+from storefront.server import StorefrontServer, is_running
+from utils.browser_server import connect_or_launch
+from utils.capture_policy import SCREENSHOT_RING_SIZE, ScreenshotRing
+from utils.login_state import LoginStateCache
+from utils.session_provider import build_session_provider
+from scripts.bench_async_checkout import sync_journey
+
+"""失败证据采集成本 benchmark：同一条 checkout 旅程在绿色 attempt 上的耗时
+    none        —— 不采集（on-first-retry 的首次执行）
+    ring        —— 每个动作后内存截图（retain-on-failure-lite）
+    video+trace —— 1080p video + tracing（always，及 on-first-retry 的重跑）
+    单独执行该脚本命令：python -m scripts.bench_capture --journeys 10（自动启动本地 storefront）
+"""
+
+ENV = "local"
+MODES = ("none", "ring", "video+trace")
+
+
+def run_mode(browser, mode: str, journeys: int, storage_state: str) -> float:
+    """-> 每条旅程平均耗时（秒，含 context 创建与关闭、video 落盘）"""
+    record_dir = Path(tempfile.mkdtemp(prefix="bench_capture_"))
+    try:
+        start = time.perf_counter()
+        for i in range(journeys):
+            options = {"record_video_dir": str(record_dir / str(i)),
+                       "record_video_size": {"width": 1920, "height": 1080}} if mode == "video+trace" else {}
+            context = browser.new_context(storage_state=storage_state, viewport={"width": 1920, "height": 1080},
+                                          **options)
+            if mode == "video+trace":
+                context.tracing.start(screenshots=True, snapshots=True, sources=True)
+            try:
+                page = context.new_page()
+                if mode == "ring":
+                    page._screenshot_ring = ScreenshotRing(SCREENSHOT_RING_SIZE)
+                sync_journey(page, ENV)
+            finally:
+                if mode == "video+trace":
+                    context.tracing.stop(path=record_dir / f"trace_{i}.zip")
+                context.close()
+        return (time.perf_counter() - start) / journeys
+    finally:
+        shutil.rmtree(record_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--journeys", type=int, default=10, help="每种模式执行的 checkout 旅程次数")
+    args = parser.parse_args()
+
+    storefront = None
+    host, port = LOCAL_STOREFRONT["host"], LOCAL_STOREFRONT["port"]
+    if not is_running(host, port):
+        storefront = StorefrontServer(host, port, LOCAL_STOREFRONT["items"]).start()
+    try:
+        with sync_playwright() as p:
+            browser, _ = connect_or_launch(p)
+            try:
+                storage_state = str(LoginStateCache(build_session_provider("cookie", browser), ENV).get())
+                run_mode(browser, "none", 1, storage_state)  # 预热：route / 登录态 / 渲染进程
+                results = {mode: run_mode(browser, mode, args.journeys, storage_state) for mode in MODES}
+            finally:
+                browser.close()
+    finally:
+        if storefront:
+            storefront.stop()
+
+    base = results["none"]
+    for mode, seconds in results.items():
+        print(f"{mode:>12} : {seconds * 1000:7.0f} ms / journey  (+{(seconds - base) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import time
+
+from playwright.sync_api import Error, sync_playwright
+
+from utils.browser_server import DEFAULT_HOST, DEFAULT_PORT, is_server_running
+
+"""常驻本地浏览器，本地反复执行单个用例时不再每次启动 Chromium
+    启动：python -m scripts.browser_server [--port 9333]，Ctrl+C 退出
+    之后的 pytest / scripts 入口自动连接（见 utils/browser_server.py）；没有启动时照常进程内 launch
+"""
+
+KEEPALIVE_INTERVAL = 1000  # ms
+
+
+def serve(host: str, port: int, warm_pages: int):
+    endpoint = f"http://{host}:{port}"
+    if is_server_running(endpoint):
+        raise SystemExit(f"{endpoint} 已有常驻浏览器在运行")
+    with sync_playwright() as p:
+        start = time.perf_counter()
+        browser = p.chromium.launch(headless=True, args=[f"--remote-debugging-port={port}",
+                                                         f"--remote-debugging-address={host}"])
+        # 预热：保持几个空白页，渲染进程常驻，客户端第一次 new_page 不必冷启动进程；第一个页面兼作 keepalive 计时
+        warm_context = browser.new_context()
+        pages = [warm_context.new_page() for _ in range(max(warm_pages, 1))]
+        print(f"🌐 常驻浏览器已启动 -> {endpoint}（{time.perf_counter() - start:.2f}s），Ctrl+C 退出")
+        try:
+            while browser.is_connected():
+                pages[0].wait_for_timeout(KEEPALIVE_INTERVAL)
+        except (KeyboardInterrupt, Error):
+            pass
+        finally:
+            if browser.is_connected():
+                browser.close()
+        print("🌐 常驻浏览器已退出")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动常驻 Chromium，pytest 与 scripts 通过 CDP 连接")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--warm-pages", type=int, default=2, help="预热保持的空白页数（至少 1 个）")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.warm_pages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from playwright.sync_api import sync_playwright
+
+from config.pages import URLS, ENV, LOCAL_STOREFRONT
+from data.checkout_data import ADD_PRODUCT_NUM, CONTAINER_INFO
+from data.load_data import LOAD_PROFILES, DEFAULT_LOAD_PROFILE
+from pages.aio.check_out_page import CheckOutPage
+from storefront.server import StorefrontServer, is_running
+from utils.async_runner import AsyncScenarioRunner
+from utils.browser_server import connect_or_launch
+from utils.load_runner import LoadJourney, LoadProfile, run_load, format_load_report
+from utils.login_state import LoginStateCache, is_login_state_valid, login_state_path
+from utils.session_provider import build_session_provider
+
+"""checkout 旅程压测：N 个虚拟用户复用 pages/aio 的 page object 循环下单，输出吞吐量与各步骤耗时分位数
+    离线压测（自动启动本地 storefront）：python -m scripts.load_checkout --profile local
+    指定参数：python -m scripts.load_checkout --profile smoke --env dev --users 5 --iterations 3
+    登录态 cookie 只有 SESSION_COOKIE_TTL（10 分钟）有效期：每次迭代前检查，剩余不足 LOGIN_STATE_MIN_TTL 时重新生成
+"""
+
+
+def checkout_journey(env: str) -> LoadJourney:
+    urls = URLS[env]
+    return LoadJourney(
+        name="checkout",
+        setup=CheckOutPage,
+        steps=[
+            ("prepare", lambda p: p.prepare(urls["inventory"], ADD_PRODUCT_NUM, "/cart.html",
+                                            "/checkout-step-one.html")),
+            ("fill_container", lambda p: p.fill_container(CONTAINER_INFO["first_name"], CONTAINER_INFO["last_name"],
+                                                          CONTAINER_INFO["postal"])),
+            ("stet_one_continue", lambda p: p.stet_one_continue("/checkout-step-two.html")),
+            ("step_two_submit", lambda p: p.step_two_submit("/checkout-complete.html")),
+        ])
+
+
+def ensure_login_state(env: str) -> Path:
+    """准备登录态：storage/ 下的文件有效则直接复用，不启动浏览器"""
+    path = login_state_path(env=env)
+    if is_login_state_valid(path):
+        return path
+    with sync_playwright() as p:
+        browser, _ = connect_or_launch(p)
+        try:
+            return LoginStateCache(build_session_provider("cookie", browser), env).get()
+        finally:
+            browser.close()
+
+
+class LoginStateRefresher:
+    """run_load 的 context_options：登录态快过期时重新生成，并发的虚拟用户只生成一次
+        sync_playwright 不能在事件循环线程里使用，生成放到工作线程
+    """
+
+    def __init__(self, env: str):
+        self.env = env
+        self.path = ensure_login_state(env)
+        self.refreshed = 0
+        self._lock = asyncio.Lock()
+
+    async def __call__(self) -> dict:
+        if not is_login_state_valid(self.path):
+            async with self._lock:
+                if not is_login_state_valid(self.path):
+                    self.path = await asyncio.to_thread(ensure_login_state, self.env)
+                    self.refreshed += 1
+        return {"storage_state": str(self.path)}
+
+
+def build_profile(args) -> tuple[str, LoadProfile]:
+    preset = LOAD_PROFILES[args.profile]
+    pick = lambda name: preset[name] if getattr(args, name) is None else getattr(args, name)
+    profile = LoadProfile(users=pick("users"), duration=pick("duration"), iterations=pick("iterations"),
+                          ramp_up=pick("ramp_up"), think_time=tuple(pick("think_time")))
+    return args.env or preset["env"] or ENV, profile
+
+
+def main(args):
+    env, profile = build_profile(args)
+    storefront = None
+    host, port = LOCAL_STOREFRONT["host"], LOCAL_STOREFRONT["port"]
+    if env == "local" and not is_running(host, port):
+        storefront = StorefrontServer(host, port, LOCAL_STOREFRONT["items"]).start()
+    try:
+        login_state = LoginStateRefresher(env)
+        runner = AsyncScenarioRunner(headless=not args.headed).start()
+        try:
+            report = runner.run_with_browser(lambda browser: run_load(
+                browser, checkout_journey(env), profile, login_state))
+        finally:
+            runner.close()
+    finally:
+        if storefront:
+            storefront.stop()
+
+    report["env"] = env
+    report["login_state_refreshed"] = login_state.refreshed
+    print("\n".join(format_load_report(report)))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile", choices=LOAD_PROFILES, default=DEFAULT_LOAD_PROFILE, help="见 data/load_data.py")
+    parser.add_argument("--env", choices=URLS, default=None, help="覆盖 profile 的环境（默认 UI_ENV）")
+    parser.add_argument("--users", type=int, default=None, help="虚拟用户数")
+    parser.add_argument("--duration", type=float, default=None, help="持续秒数")
+    parser.add_argument("--iterations", type=int, default=None, help="每个虚拟用户的迭代次数")
+    parser.add_argument("--ramp-up", type=float, default=None, help="逐个启动全部虚拟用户的秒数")
+    parser.add_argument("--think-time", type=float, nargs=2, default=None, metavar=("MIN", "MAX"),
+                        help="步骤间随机停顿区间（秒）")
+    parser.add_argument("--headed", action="store_true", help="非 headless 运行（调试用）")
+    parser.add_argument("--output", default=None, help="报告 JSON 输出路径")
+    main(parser.parse_args())
@@ -0,0 +1,91 @@
+import argparse
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+from utils.perf_report import PERF_DIR
+from utils.sharding import DURATIONS_FILE, load_durations, save_durations
+
+"""合并 pytest --shard K/N 的结果，生成一份 Allure 报告
+    每个输入目录是一台机器的工作目录（CI 中下载的 shard 产物），包含 allure-results/shard-K、artifacts/shard-K、perf/shard-K.json
+    本机依次执行多个 shard 时直接：python -m scripts.merge_shards
+    多台机器：python -m scripts.merge_shards shard-1/ shard-2/ shard-3/ --output allure-results-merged --report allure-report
+"""
+
+ENVIRONMENT_FILE = "environment.properties"
+
+
+def merge_allure(inputs: list[Path], output: Path) -> int:
+    """结果文件名是 uuid，直接复制即可；environment.properties 取并集"""
+    if output.exists():
+        shutil.rmtree(output)
+    output.mkdir(parents=True)
+    environment, copied = {}, 0
+    for result_dir in inputs:
+        for path in result_dir.iterdir():
+            if path.name == ENVIRONMENT_FILE:
+                for line in path.read_text(encoding="utf-8").splitlines():
+                    key, sep, value = line.partition("=")
+                    if sep:
+                        environment[key.strip()] = value.strip()
+            elif path.is_file():
+                shutil.copy2(path, output / path.name)
+                copied += 1
+    if environment:
+        (output / ENVIRONMENT_FILE).write_text("".join(f"{k}={v}\n" for k, v in environment.items()), encoding="utf-8")
+    return copied
+
+
+def merge_artifacts(workspaces: list[Path], target: Path = Path("artifacts")):
+    """其他机器的 artifacts/shard-K 复制到本地 artifacts/ 下（目录名带 shard 前缀，不会覆盖）"""
+    for workspace in workspaces:
+        source = workspace / "artifacts"
+        if not source.exists() or source.resolve() == target.resolve():
+            continue
+        for shard_dir in source.glob("shard-*"):
+            shutil.copytree(shard_dir, target / shard_dir.name, dirs_exist_ok=True)
+
+
+def merge_shard_summaries(workspaces: list[Path]) -> list[dict]:
+    """读取各 shard 的预计 / 实际耗时，并把本次各用例耗时写回 perf/durations.json（下次划分使用）"""
+    summaries = [json.loads(path.read_text(encoding="utf-8"))
+                 for workspace in workspaces for path in sorted((workspace / PERF_DIR).glob("shard-*.json"))]
+    durations = load_durations(DURATIONS_FILE)
+    for summary in summaries:
+        durations.update(summary.pop("durations", {}))
+    if summaries:
+        save_durations(durations, DURATIONS_FILE)
+    return sorted(summaries, key=lambda s: int(s["shard"].split("/")[0]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="合并各 shard 的 allure-results / artifacts，生成一份报告")
+    parser.add_argument("workspaces", nargs="*", default=["."], help="各 shard 的工作目录，默认当前目录")
+    parser.add_argument("--output", default="allure-results-merged", help="合并后的 allure-results 目录")
+    parser.add_argument("--report", default="allure-report", help="Allure HTML 报告目录")
+    args = parser.parse_args()
+
+    workspaces = [Path(w) for w in args.workspaces]
+    result_dirs = [d for w in workspaces for d in sorted((w / "allure-results").glob("shard-*")) if d.is_dir()]
+    if not result_dirs:
+        raise SystemExit(f"没有找到 allure-results/shard-*：{', '.join(args.workspaces)}")
+    copied = merge_allure(result_dirs, Path(args.output))
+    merge_artifacts(workspaces)
+    print(f"📦 合并 {len(result_dirs)} 个 shard 的 Allure 结果（{copied} 个文件）-> {args.output}")
+
+    for summary in merge_shard_summaries(workspaces):
+        print(f"shard {summary['shard']}: {summary['tests']} tests, "
+              f"predicted={summary['predicted']}s, wall_time={summary.get('wall_time', '-')}s")
+
+    allure = shutil.which("allure")
+    command = [allure or "allure", "generate", args.output, "--clean", "-o", args.report]
+    if allure is None:
+        print(f"未安装 Allure CLI，手动生成报告：{' '.join(command)}")
+        return
+    subprocess.run(command, check=True)
+    print(f"📊 Allure 报告 -> {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import re
+
+"""本地 storefront 商品目录：前 6 个与 saucedemo 同名同价，其余按序号确定性生成（规模测试用）"""
+
+BASE_PRODUCTS = [
+    {"id": 4, "name": "Sauce Labs Backpack", "price": "29.99",
+     "desc": "Carry all the things with the sleek, streamlined Sly Pack that melds uncompromising style "
+             "with unequaled laptop and tablet protection."},
+    {"id": 0, "name": "Sauce Labs Bike Light", "price": "9.99",
+     "desc": "A red light isn't the desired state in testing but it sure helps when riding your bike at night."},
+    {"id": 1, "name": "Sauce Labs Bolt T-Shirt", "price": "15.99",
+     "desc": "Get your testing superhero on with the Sauce Labs bolt T-shirt. From American Apparel, "
+             "100% ringspun combed cotton, heather gray with red bolt."},
+    {"id": 5, "name": "Sauce Labs Fleece Jacket", "price": "49.99",
+     "desc": "It's not every day that you come across a midweight quarter-zip fleece jacket capable of "
+             "handling everything from a relaxing day outdoors to a busy day at the office."},
+    {"id": 2, "name": "Sauce Labs Onesie", "price": "7.99",
+     "desc": "Rib snap infant onesie for the junior automation engineer in development. "
+             "Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel."},
+    {"id": 3, "name": "Test.allTheThings() T-Shirt (Red)", "price": "15.99",
+     "desc": "This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard to automate "
+             "a few tests. Super-soft and comfy ringspun combed cotton."},
+]
+
+
+def slugify(name: str) -> str:
+    """与 saucedemo 按钮 data-test 一致：add-to-cart-sauce-labs-backpack"""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def build_catalog(size: int = len(BASE_PRODUCTS)) -> list[dict]:
+    products = BASE_PRODUCTS[:size]
+    for i in range(len(products), size):
+        cents = 499 + (i * 737) % 9500  # 确定性价格：$4.99 ~ $99.98
+        products.append({"id": i + 1000, "name": f"Sauce Labs Product {i:05d}",
+                         "price": f"{cents // 100}.{cents % 100:02d}",
+                         "desc": f"Generated catalog item #{i} for scale tests."})
+    return [{**p, "slug": slugify(p["name"]), "img": f"/static/media/{p['id']}.svg"} for p in products]
@@ -0,0 +1,106 @@
+import argparse
+import json
+import socket
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from storefront.catalog import build_catalog
+
+"""本地 storefront：离线、低延迟地替代 https://www.saucedemo.com
+    单独执行该脚本命令：python -m storefront.server --port 8800 --items 1000
+"""
+
+STATIC_DIR = Path(__file__).parent / "static"
+PAGES = {
+    "/": "login",
+    "/index.html": "login",
+    "/inventory.html": "inventory",
+    "/cart.html": "cart",
+    "/checkout-step-one.html": "checkout-step-one",
+    "/checkout-step-two.html": "checkout-step-two",
+    "/checkout-complete.html": "checkout-complete",
+}
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Swag Labs</title></head>
+<body data-page="{page}"><div id="root"></div>
+<script>window.STOREFRONT_CATALOG = {catalog};</script>
+<script src="/static/app.js"></script>
+</body></html>"""
+PRODUCT_IMG = """<svg xmlns="http://www.w3.org/2000/svg" width="160" height="160">
+<rect width="160" height="160" fill="#e2231a"/><text x="80" y="88" font-size="24" text-anchor="middle" fill="#fff">{id}</text>
+</svg>"""
+
+
+class StorefrontHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, catalog_json: str, **kwargs):
+        self.catalog_json = catalog_json
+        super().__init__(*args, directory=str(STATIC_DIR), **kwargs)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path in PAGES:
+            return self._send(PAGE_TEMPLATE.format(page=PAGES[path], catalog=self.catalog_json), "text/html")
+        if path.startswith("/static/media/"):
+            return self._send(PRODUCT_IMG.format(id=Path(path).stem), "image/svg+xml")
+        if path.startswith("/static/"):
+            self.path = self.path[len("/static"):]
+            return super().do_GET()
+        self.send_error(404)
+
+    def _send(self, body: str, content_type: str):
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # 不打印每个请求，避免刷屏测试输出
+
+
+class StorefrontServer:
+    """后台线程运行的本地 storefront；items 控制商品目录规模"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8800, items: int = 6):
+        # 目录序列化一次，后续每个页面请求直接复用
+        catalog_json = json.dumps(build_catalog(items), ensure_ascii=False).replace("</", "<\\/")
+        self.httpd = ThreadingHTTPServer((host, port), partial(StorefrontHandler, catalog_json=catalog_json))
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="storefront", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def is_running(host: str, port: int) -> bool:
+    """端口已被占用视为 storefront 已在运行（例如手动启动的实例）"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.2)
+        return sock.connect_ex((host, port)) == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--items", type=int, default=6, help="商品目录规模")
+    args = parser.parse_args()
+
+    server = StorefrontServer(args.host, args.port, args.items)
+    print(f"🛒 storefront running at {server.base_url} ({args.items} items)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,227 @@
+// 本地 storefront：与 saucedemo 相同的 data-test DOM、cart-contents(localStorage)、session-username(cookie)
+(function () {
+    const CATALOG = window.STOREFRONT_CATALOG;
+    const PAGE = document.body.dataset.page;
+    const VALID_USERS = ["standard_user", "problem_user", "performance_glitch_user", "error_user", "visual_user"];
+    const LOCKED_USERS = ["locked_out_user"];
+    const PASSWORD = "secret_sauce";
+    const SESSION_TTL = 600;
+    const TAX_RATE = 0.08;
+    const byId = new Map(CATALOG.map(p => [p.id, p]));
+    const app = document.getElementById("root");
+
+    // ========= 状态 =========
+    const getCookie = name => (document.cookie.split("; ").find(c => c.startsWith(name + "=")) || "").split("=")[1];
+    const session = () => getCookie("session-username");
+    const cart = () => JSON.parse(localStorage.getItem("cart-contents") || "[]");
+    const saveCart = ids => ids.length ? localStorage.setItem("cart-contents", JSON.stringify(ids))
+        : localStorage.removeItem("cart-contents");
+    const cents = price => Math.round(parseFloat(price) * 100);
+    const money = c => "$" + (c / 100).toFixed(2);
+    const go = path => { window.location.href = path; };
+    const esc = s => String(s).replace(/[&<>"]/g, ch => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[ch]));
+
+    function el(html) {
+        const t = document.createElement("template");
+        t.innerHTML = html.trim();
+        return t.content.firstElementChild;
+    }
+
+    function showError(container, message) {
+        let error = container.querySelector("[data-test='error']");
+        if (!error) {
+            error = el(`<h3 data-test="error" class="error-message"></h3>`);
+            container.prepend(error);
+        }
+        error.textContent = message;
+    }
+
+    // ========= 公共头部 =========
+    function header() {
+        const count = cart().length;
+        return `<div class="primary_header">
+            <div class="app_logo">Swag Labs</div>
+            <a class="shopping_cart_link" data-test="shopping-cart-link" href="/cart.html">
+                ${count ? `<span class="shopping_cart_badge" data-test="shopping-cart-badge">${count}</span>` : ""}
+            </a>
+        </div>`;
+    }
+
+    function refreshBadge() {
+        const link = document.querySelector("[data-test='shopping-cart-link']");
+        const count = cart().length;
+        link.innerHTML = count ? `<span class="shopping_cart_badge" data-test="shopping-cart-badge">${count}</span>` : "";
+    }
+
+    function itemRow(p, button) {
+        return `<div class="inventory_item" data-test="inventory-item">
+            <div class="inventory_item_img"><a id="item_${p.id}_img_link" href="#"><img alt="${esc(p.name)}" src="${p.img}"></a></div>
+            <div class="inventory_item_description">
+                <a id="item_${p.id}_title_link" href="#"><div class="inventory_item_name" data-test="inventory-item-name">${esc(p.name)}</div></a>
+                <div class="inventory_item_desc" data-test="inventory-item-desc">${esc(p.desc)}</div>
+                <div class="pricebar"><div class="inventory_item_price" data-test="inventory-item-price">$${p.price}</div>${button || ""}</div>
+            </div>
+        </div>`;
+    }
+
+    function cartButton(p, inCart) {
+        return inCart
+            ? `<button class="btn" data-test="remove-${p.slug}" data-id="${p.id}">Remove</button>`
+            : `<button class="btn" data-test="add-to-cart-${p.slug}" data-id="${p.id}">Add to cart</button>`;
+    }
+
+    // ========= 页面 =========
+    function renderLogin() {
+        app.innerHTML = `<div class="login_wrapper"><form id="login_form">
+            <input data-test="username" id="user-name" placeholder="Username" type="text">
+            <input data-test="password" id="password" placeholder="Password" type="password">
+            <input data-test="login-button" id="login-button" type="submit" value="Login">
+        </form></div>`;
+        const form = document.getElementById("login_form");
+        if (new URLSearchParams(location.search).get("denied")) {
+            showError(form, `Epic sadface: You can only access '${new URLSearchParams(location.search).get("denied")}' when you are logged in.`);
+        }
+        form.addEventListener("submit", e => {
+            e.preventDefault();
+            const username = form.querySelector("[data-test='username']").value;
+            const password = form.querySelector("[data-test='password']").value;
+            if (!username) return showError(form, "Epic sadface: Username is required");
+            if (!password) return showError(form, "Epic sadface: Password is required");
+            if (LOCKED_USERS.includes(username) && password === PASSWORD) {
+                return showError(form, "Epic sadface: Sorry, this user has been locked out.");
+            }
+            if (!VALID_USERS.includes(username) || password !== PASSWORD) {
+                return showError(form, "Epic sadface: Username and password do not match any user in this service");
+            }
+            document.cookie = `session-username=${username}; path=/; max-age=${SESSION_TTL}`;
+            go("/inventory.html");
+        });
+    }
+
+    const SORTS = {
+        az: (a, b) => a.name.localeCompare(b.name),
+        za: (a, b) => b.name.localeCompare(a.name),
+        lohi: (a, b) => cents(a.price) - cents(b.price),
+        hilo: (a, b) => cents(b.price) - cents(a.price),
+    };
+
+    function renderInventory() {
+        let sort = "az";
+        app.innerHTML = `${header()}
+            <div class="header_secondary_container"><span class="title" data-test="title">Products</span>
+                <select class="product_sort_container" data-test="product-sort-container">
+                    <option value="az">Name (A to Z)</option><option value="za">Name (Z to A)</option>
+                    <option value="lohi">Price (low to high)</option><option value="hilo">Price (high to low)</option>
+                </select>
+            </div>
+            <div class="inventory_list" data-test="inventory-list"></div>`;
+        const list = app.querySelector("[data-test='inventory-list']");
+        const draw = () => {
+            const ids = new Set(cart());
+            list.innerHTML = [...CATALOG].sort(SORTS[sort]).map(p => itemRow(p, cartButton(p, ids.has(p.id)))).join("");
+        };
+        app.querySelector("[data-test='product-sort-container']").addEventListener("change", e => {
+            sort = e.target.value;
+            draw();
+        });
+        list.addEventListener("click", e => {
+            const id = e.target.dataset && e.target.dataset.id;
+            if (id === undefined) return;
+            const ids = cart().filter(x => x !== Number(id));
+            const adding = e.target.dataset.test.startsWith("add-to-cart");
+            saveCart(adding ? [...ids, Number(id)] : ids);
+            e.target.outerHTML = cartButton(byId.get(Number(id)), adding);
+            refreshBadge();
+        });
+        draw();
+    }
+
+    function cartItems() {
+        return cart().map(id => byId.get(id)).filter(Boolean);
+    }
+
+    function renderCart() {
+        app.innerHTML = `${header()}
+            <div class="cart_list">${cartItems().map(p => itemRow(p, cartButton(p, true))).join("")}</div>
+            <button class="btn" data-test="continue-shopping">Continue Shopping</button>
+            <button class="btn" data-test="checkout">Checkout</button>`;
+        app.querySelector(".cart_list").addEventListener("click", e => {
+            const id = e.target.dataset && e.target.dataset.id;
+            if (id === undefined) return;
+            saveCart(cart().filter(x => x !== Number(id)));
+            e.target.closest("[data-test='inventory-item']").remove();
+            refreshBadge();
+        });
+        app.querySelector("[data-test='continue-shopping']").addEventListener("click", () => go("/inventory.html"));
+        app.querySelector("[data-test='checkout']").addEventListener("click", () => go("/checkout-step-one.html"));
+    }
+
+    function renderStepOne() {
+        app.innerHTML = `${header()}<form id="checkout_info">
+            <input data-test="firstName" id="first-name" placeholder="First Name" type="text">
+            <input data-test="lastName" id="last-name" placeholder="Last Name" type="text">
+            <input data-test="postalCode" id="postal-code" placeholder="Zip/Postal Code" type="text">
+            <button class="btn" data-test="cancel" type="button">Cancel</button>
+            <input class="btn" data-test="continue" type="submit" value="Continue">
+        </form>`;
+        const form = document.getElementById("checkout_info");
+        form.querySelector("[data-test='cancel']").addEventListener("click", () => go("/cart.html"));
+        form.addEventListener("submit", e => {
+            e.preventDefault();
+            const required = [["firstName", "First Name"], ["lastName", "Last Name"], ["postalCode", "Postal Code"]];
+            for (const [field, label] of required) {
+                if (!form.querySelector(`[data-test='${field}']`).value) return showError(form, `Error: ${label} is required`);
+            }
+            go("/checkout-step-two.html");
+        });
+    }
+
+    function renderStepTwo() {
+        const items = cartItems();
+        const subtotal = items.reduce((sum, p) => sum + cents(p.price), 0);
+        const tax = Math.round(subtotal * TAX_RATE);
+        app.innerHTML = `${header()}
+            <div class="cart_list">${items.map(p => itemRow(p)).join("")}</div>
+            <div class="summary_info">
+                <div data-test="payment-info-label">Payment Information:</div>
+                <div data-test="payment-info-value">SauceCard #31337</div>
+                <div data-test="shipping-info-label">Shipping Information:</div>
+                <div data-test="shipping-info-value">Free Pony Express Delivery!</div>
+                <div data-test="subtotal-label">Item total: ${money(subtotal)}</div>
+                <div data-test="tax-label">Tax: ${money(tax)}</div>
+                <div data-test="total-label">Total: ${money(subtotal + tax)}</div>
+            </div>
+            <button class="btn" data-test="cancel">Cancel</button>
+            <button class="btn" data-test="finish">Finish</button>`;
+        app.querySelector("[data-test='cancel']").addEventListener("click", () => go("/inventory.html"));
+        app.querySelector("[data-test='finish']").addEventListener("click", () => {
+            saveCart([]);
+            go("/checkout-complete.html");
+        });
+    }
+
+    function renderComplete() {
+        app.innerHTML = `${header()}<div class="checkout_complete_container">
+            <h2 class="complete-header" data-test="complete-header">Thank you for your order!</h2>
+            <div data-test="complete-text">Your order has been dispatched, and will arrive just as fast as the pony can get there!</div>
+            <button class="btn" data-test="back-to-products">Back Home</button>
+        </div>`;
+        app.querySelector("[data-test='back-to-products']").addEventListener("click", () => go("/inventory.html"));
+    }
+
+    const PAGES = {
+        login: renderLogin,
+        inventory: renderInventory,
+        cart: renderCart,
+        "checkout-step-one": renderStepOne,
+        "checkout-step-two": renderStepTwo,
+        "checkout-complete": renderComplete,
+    };
+
+    // 未登录访问受保护页面：与 saucedemo 一样回到登录页并提示
+    if (PAGE !== "login" && !session()) {
+        go(`/?denied=${encodeURIComponent(location.pathname)}`);
+    } else {
+        PAGES[PAGE]();
+    }
+})();
@@ -0,0 +1,64 @@
+import pytest
+
+from config.pages import URLS, ENV
+from data.checkout_data import (CONTAINER_EMPTY_ERROR_MSG, ADD_PRODUCT_NUM, CONTAINER_INFO, FINISH_PAGE_MESSAGE)
+from pages.aio.check_out_page import CheckOutPage
+
+
+async def prepared_check_out_page(page) -> CheckOutPage:
+    check_out_page = CheckOutPage(page)
+    await check_out_page.prepare(URLS[ENV]["inventory"], ADD_PRODUCT_NUM, "/cart.html", "/checkout-step-one.html")
+    return check_out_page
+
+
+async def step_one_container_empty(page):
+    check_out_page = await prepared_check_out_page(page)
+    await check_out_page.fill_container("", "", "")
+    await check_out_page.stet_one_continue("/checkout-step-one.html")
+    await check_out_page.verify_container_empty(CONTAINER_EMPTY_ERROR_MSG)
+
+
+async def step_one_cancel(page):
+    check_out_page = await prepared_check_out_page(page)
+    await check_out_page.fill_container(CONTAINER_INFO["first_name"], CONTAINER_INFO["last_name"],
+                                        CONTAINER_INFO["postal"])
+    await check_out_page.stet_one_cancel("/cart.html")
+
+
+async def cancel_submit_order(page):
+    check_out_page = await prepared_check_out_page(page)
+    await check_out_page.fill_container(CONTAINER_INFO["first_name"], CONTAINER_INFO["last_name"],
+                                        CONTAINER_INFO["postal"])
+    await check_out_page.stet_one_continue("/checkout-step-two.html")
+    await check_out_page.step_two_cancel("/inventory.html")
+
+
+async def finish_submit_order(page):
+    check_out_page = await prepared_check_out_page(page)
+    await check_out_page.fill_container(CONTAINER_INFO["first_name"], CONTAINER_INFO["last_name"],
+                                        CONTAINER_INFO["postal"])
+    await check_out_page.stet_one_continue("/checkout-step-two.html")
+    await check_out_page.verify_order_products_match_added()
+    await check_out_page.verify_order_base_info()
+    await check_out_page.step_two_submit("/checkout-complete.html")
+    await check_out_page.verify_submit_order(FINISH_PAGE_MESSAGE)
+
+
+CHECKOUT_SCENARIOS = {
+    "step_one_container_empty": step_one_container_empty,
+    "step_one_cancel": step_one_cancel,
+    "cancel_submit_order": cancel_submit_order,
+    "finish_submit_order": finish_submit_order,
+}
+
+
+@pytest.mark.ui
+@pytest.mark.need_login
+@pytest.mark.async_engine  # 与 TestCheckOut 覆盖相同流程，默认不运行：pytest --async-engine
+class TestCheckOutAsync:
+
+    def test_checkout_flows_concurrently(self, async_runner):
+        """TestCheckOut 的 4 个流程作为协程并发跑在同一个 browser 上"""
+        results = async_runner.run(CHECKOUT_SCENARIOS)
+        failed = [f"{r.name}: {r.error}" for r in results if r.status == "FAILED"]
+        assert not failed, "并发 checkout 场景失败：\n" + "\n".join(failed)
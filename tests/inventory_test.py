@@ -1,44 +1,64 @@
-# import pytest
-#
-# from config.pages import URLS, ENV
-# from data.inventory_data import PRODUCT_COUNT, PRODUCT_SORT
-# from pages.inventory_page import InventoryPage
-#
-#
-# @pytest.fixture(scope="function")
-# def inventory_page(page):
-#     return InventoryPage(page)
-#
-#
-# @pytest.mark.ui
-# @pytest.mark.need_login
-# class TestInventory:
-#
-#     def test_inventory_base_info(self, inventory_page):
-#         """验证商品列表基础信息"""
-#         inventory_page.open_inventory(URLS[ENV]["inventory"])
-#         inventory_page.verify_base_info(PRODUCT_COUNT)  # 验证商品列表商品数量
-#
-#     def test_sort_by_name_asc(self, inventory_page):
-#         """验证按商品名称正序排列"""
-#         inventory_page.open_inventory(URLS[ENV]["inventory"])
-#         inventory_page.sort_by(PRODUCT_SORT["name_asc"])
-#         inventory_page.verify_name_asc()
-#
-#     def test_sort_by_name_desc(self, inventory_page):
-#         """验证按商品名称倒叙排列"""
-#         inventory_page.open_inventory(URLS[ENV]["inventory"])
-#         inventory_page.sort_by(PRODUCT_SORT["name_desc"])
-#         inventory_page.verify_name_desc()
-#
-#     def test_sort_by_price_asc(self, inventory_page):
-#         """验证按商品价格正序排列"""
-#         inventory_page.open_inventory(URLS[ENV]["inventory"])
-#         inventory_page.sort_by(PRODUCT_SORT["price_asc"])
-#         inventory_page.verify_price_asc()
-#
-#     def test_sort_by_price_desc(self, inventory_page):
-#         """验证按商品价格倒叙排列"""
-#         inventory_page.open_inventory(URLS[ENV]["inventory"])
-#         inventory_page.sort_by(PRODUCT_SORT["price_desc"])
-#         inventory_page.verify_price_desc()
+# import pytest
+#
+# from config.pages import URLS, ENV
+# from data.inventory_data import PRODUCT_COUNT, PRODUCT_SORT
+# from pages.inventory_page import InventoryPage
+#
+#
+# @pytest.fixture(scope="function")
+# def inventory_page(page):
+#     return InventoryPage(page)
+#
+#
+# @pytest.mark.ui
+# @pytest.mark.need_login
+# class TestInventory:
+#
+#     def test_inventory_base_info(self, inventory_page):
+#         """验证商品列表基础信息"""
+#         inventory_page.open_inventory(URLS[ENV]["inventory"])
+#         inventory_page.verify_base_info(PRODUCT_COUNT)  # 验证商品列表商品数量
+#
+#     def test_sort_by_name_asc(self, inventory_page):
+#         """验证按商品名称正序排列"""
+#         inventory_page.open_inventory(URLS[ENV]["inventory"])
+#         inventory_page.sort_by(PRODUCT_SORT["name_asc"])
+#         inventory_page.verify_name_asc()
+#
+#     def test_sort_by_name_desc(self, inventory_page):
+#         """验证按商品名称倒叙排列"""
+#         inventory_page.open_inventory(URLS[ENV]["inventory"])
+#         inventory_page.sort_by(PRODUCT_SORT["name_desc"])
+#         inventory_page.verify_name_desc()
+#
+#     def test_sort_by_price_asc(self, inventory_page):
+#         """验证按商品价格正序排列"""
+#         inventory_page.open_inventory(URLS[ENV]["inventory"])
+#         inventory_page.sort_by(PRODUCT_SORT["price_asc"])
+#         inventory_page.verify_price_asc()
+#
+#     def test_sort_by_price_desc(self, inventory_page):
+#         """验证按商品价格倒叙排列"""
+#         inventory_page.open_inventory(URLS[ENV]["inventory"])
+#         inventory_page.sort_by(PRODUCT_SORT["price_desc"])
+#         inventory_page.verify_price_desc()
+
+
+import pytest
+
+from config.pages import URLS, ENV
+from data.perf_data import WEB_VITALS_BUDGET
+from pages.inventory_page import InventoryPage
+
+
+@pytest.mark.ui
+@pytest.mark.need_login
+@pytest.mark.web_vitals
+@pytest.mark.skipif(ENV != "local", reason="性能预算只对本地 storefront 断言，线上站点受网络波动影响")
+class TestInventoryWebVitals:
+
+    def test_inventory_web_vitals(self, page):
+        """验证inventory页面的前端性能预算"""
+        inventory_page = InventoryPage(page)
+        inventory_page.open_inventory(URLS[ENV]["inventory"])
+        inventory_page.verify_web_vitals(WEB_VITALS_BUDGET, "open")
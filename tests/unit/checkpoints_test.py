@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from utils.checkpoints import CheckpointStore, checkpoint_key, checkpoint_path
+
+PARAMS = {"add_count": 2}
+DEPS = ({"item": "[data-test=inventory-item]"},)
+STORAGE_STATE = {"cookies": [{"name": "session-username", "value": "standard_user", "expires": -1}], "origins": []}
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    def new_page(self):
+        return type("FakePage", (), {"url": "http://127.0.0.1:8800/checkout-step-one.html"})()
+
+    def storage_state(self):
+        return STORAGE_STATE
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = 0
+
+    def new_context(self, **kwargs):
+        self.contexts += 1
+        return FakeContext()
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "storage"
+
+
+def prefix(page):
+    return {"added_products": ["Sauce Labs Backpack"]}
+
+
+class TestCheckpointStore:
+
+    def test_prefix_runs_once_per_session(self, storage):
+        browser = FakeBrowser()
+        store = CheckpointStore(browser)
+        for _ in range(3):
+            snapshot = store.get("checkout", PARAMS, DEPS, prefix, None)
+        assert snapshot["state"] == prefix(None)
+        assert browser.contexts == 1
+        assert store.stats["builds"] == 1 and store.stats["hits"] == 3
+
+    def test_memory_only_by_default(self, storage):
+        CheckpointStore(FakeBrowser()).get("checkout", PARAMS, DEPS, prefix, None)
+        assert not storage.exists()
+        browser = FakeBrowser()  # 下一个 session 重新真实跑前缀
+        CheckpointStore(browser).get("checkout", PARAMS, DEPS, prefix, None)
+        assert browser.contexts == 1
+
+    def test_persist_reused_across_sessions(self, storage):
+        CheckpointStore(FakeBrowser(), persist=True).get("checkout", PARAMS, DEPS, prefix, None)
+        key = checkpoint_key("checkout", {**PARAMS, "storage_state": None}, DEPS)
+        assert checkpoint_path("checkout", key).exists()
+        browser = FakeBrowser()
+        CheckpointStore(browser, persist=True).get("checkout", PARAMS, DEPS, prefix, None)
+        assert browser.contexts == 0
+
+    def test_expired_snapshot_rebuilt(self, storage):
+        store = CheckpointStore(FakeBrowser(), max_age=60)
+        assert store.is_valid({"created": time.time(), "storage_state": STORAGE_STATE})
+        assert not store.is_valid({"created": time.time() - 61, "storage_state": STORAGE_STATE})
@@ -0,0 +1,31 @@
+from decimal import Decimal
+
+import pytest
+
+from utils.common_utils import atomic_write_bytes, atomic_write_text, parse_money
+
+
+class TestAtomicWrite:
+
+    def test_creates_parents_and_replaces(self, tmp_path):
+        path = tmp_path / "storage" / "state.json"
+        atomic_write_text(path, "旧")
+        atomic_write_text(path, "新")
+        assert path.read_text(encoding="utf-8") == "新"
+        assert [p.name for p in path.parent.iterdir()] == ["state.json"]  # 不留临时文件
+
+    def test_bytes(self, tmp_path):
+        path = tmp_path / "blob.bin"
+        atomic_write_bytes(path, b"\x00\x01")
+        assert path.read_bytes() == b"\x00\x01"
+
+
+class TestParseMoney:
+
+    @pytest.mark.parametrize("text, amount", [("Item total: $39.98", Decimal("39.98")), ("$7.99", Decimal("7.99"))])
+    def test_amount(self, text, amount):
+        assert parse_money(text) == amount
+
+    def test_no_amount(self):
+        with pytest.raises(AssertionError):
+            parse_money("Item total")
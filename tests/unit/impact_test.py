@@ -0,0 +1,151 @@
+import importlib.util
+import sys
+import textwrap
+
+import pytest
+
+from utils.impact import (MODULE_SYMBOL, ImpactRecorder, code_qualname, depends_on, parse_diff, select_tests,
+                          symbol_spans, symbols_at)
+
+SOURCE = textwrap.dedent('''\
+    import re
+
+    PATTERN = re.compile("x")
+
+
+    class CartPage:
+        badge = "shopping_cart_badge"
+
+        @property
+        def count(self):
+            return 1
+
+        def add(self, n):
+            def inner():
+                return n
+            return inner()
+
+
+    def helper():
+        return PATTERN
+''')
+
+DIFF = textwrap.dedent('''\
+    diff --git a/pages/cart_page.py b/pages/cart_page.py
+    index 1111111..2222222 100644
+    --- a/pages/cart_page.py
+    +++ b/pages/cart_page.py
+    @@ -7 +7 @@ class CartPage:
+    -    badge = "a"
+    +    badge = "b"
+    @@ -20,0 +21,3 @@ def helper():
+    +
+    +def added():
+    +    pass
+    diff --git a/data/cart_data.py b/data/cart_data.py
+    deleted file mode 100644
+    --- a/data/cart_data.py
+    +++ /dev/null
+    @@ -1,2 +0,0 @@
+    -ADD_PRODUCT_COUNT = 3
+    -DELETE_PRODUCT_COUNT = 1
+''')
+
+
+class TestParseDiff:
+
+    def test_ranges(self):
+        assert parse_diff(DIFF) == [("pages/cart_page.py", [(7, 7)], [(7, 7), (21, 23)]),
+                                    ("data/cart_data.py", [(1, 2)], [])]
+
+    def test_empty(self):
+        assert parse_diff("") == []
+
+
+class TestSymbolsAt:
+
+    @pytest.mark.parametrize("start, end, symbols", [
+        (1, 1, {MODULE_SYMBOL}),                  # import
+        (3, 3, {"PATTERN"}),                      # 模块级常量
+        (7, 7, {"CartPage"}),                     # 类体
+        (9, 11, {"CartPage.count"}),              # 装饰器算方法
+        (15, 15, {"CartPage.add"}),               # 嵌套函数算外层方法
+        (11, 13, {"CartPage.count", "CartPage.add", "CartPage"}),
+        (18, 19, {MODULE_SYMBOL, "helper"}),
+    ])
+    def test_lines(self, start, end, symbols):
+        assert symbols_at(symbol_spans(SOURCE), start, end) == symbols
+
+
+class TestSelectTests:
+
+    INDEX = {"tests": {
+        "tests/cart_test.py::test_add": {"symbols": ["pages/cart_page.py::CartPage.add", "data/cart_data.py::N"]},
+        "tests/cart_test.py::test_badge": {"symbols": ["pages/cart_page.py::CartPage"]},
+    }}
+    NODEIDS = ["tests/cart_test.py::test_add", "tests/cart_test.py::test_badge", "tests/cart_test.py::test_new"]
+
+    @pytest.mark.parametrize("changed, selected", [
+        (set(), ["tests/cart_test.py::test_new"]),
+        ({"pages/cart_page.py::CartPage.add"}, ["tests/cart_test.py::test_add", "tests/cart_test.py::test_new"]),
+        ({"pages/cart_page.py::CartPage", "data/cart_data.py::N"}, NODEIDS),
+        ({"pages/login_page.py::LoginPage"}, ["tests/cart_test.py::test_new"]),
+    ])
+    def test_selection(self, changed, selected):
+        assert select_tests(self.NODEIDS, self.INDEX, changed)[0] == selected
+
+    def test_reasons(self):
+        _, reasons = select_tests(self.NODEIDS, self.INDEX, {"data/cart_data.py::N"})
+        assert reasons == {"tests/cart_test.py::test_add": "data/cart_data.py::N",
+                           "tests/cart_test.py::test_new": "not indexed"}
+
+
+class TestRecorder:
+
+    @pytest.fixture
+    def module(self, tmp_path, monkeypatch):
+        """tmp_path/pages/cart_page.py 作为被监视模块导入"""
+        path = tmp_path / "pages" / "cart_page.py"
+        path.parent.mkdir()
+        path.write_text(SOURCE, encoding="utf-8")
+        spec = importlib.util.spec_from_file_location("impact_fake_cart_page", path)
+        module = importlib.util.module_from_spec(spec)
+        monkeypatch.setitem(sys.modules, spec.name, module)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_code_qualname(self, module):
+        assert code_qualname(module.CartPage.add.__code__) == "CartPage.add"
+        assert code_qualname(module.CartPage.count.fget.__code__) == "CartPage.count"
+        assert code_qualname(module.helper.__code__) == "helper"
+
+    def test_resolve_nested_function(self, module, tmp_path):
+        inner = module.CartPage.add.__code__.co_consts
+        code = next(c for c in inner if hasattr(c, "co_name") and c.co_name == "inner")
+        symbols = ImpactRecorder(tmp_path).resolve(code, vars(module))
+        assert "pages/cart_page.py::CartPage.add" in symbols
+        assert "pages/cart_page.py::CartPage" in symbols
+
+    def test_fixture_symbols_merged(self, module, tmp_path):
+        recorder = ImpactRecorder(tmp_path)
+        recorder.start()
+        recorder.start_fixture()  # 第一个用例的 setup 中执行 session fixture
+        recorder.current.add("pages/cart_page.py::CartPage")
+        recorder.stop_fixture("cart")
+        assert recorder.stop(["cart"]) == {"pages/cart_page.py::CartPage"}
+        recorder.start()  # 之后的用例不再执行该 fixture
+        assert recorder.stop(["cart", "page"]) == {"pages/cart_page.py::CartPage"}
+        recorder.start()
+        assert recorder.stop(["page"]) == set()
+
+    def test_depends_on(self, module, tmp_path):
+        recorder = ImpactRecorder(tmp_path)
+        ImpactRecorder.active = recorder
+        try:
+            recorder.start()
+            depends_on((module.CartPage, module.PATTERN))
+            symbols = recorder.stop()
+        finally:
+            ImpactRecorder.active = None
+        assert {"pages/cart_page.py::CartPage.add", "pages/cart_page.py::helper",
+                "pages/cart_page.py::PATTERN", f"pages/cart_page.py::{MODULE_SYMBOL}"} <= symbols
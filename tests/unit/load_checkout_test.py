@@ -0,0 +1,71 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+import scripts.load_checkout as load_checkout
+from scripts.load_checkout import LoginStateRefresher, ensure_login_state
+from utils.login_state import login_state_path, write_login_state
+from utils.session_provider import build_cookie_state
+
+ENV = "dev"
+
+
+@pytest.fixture
+def state_path(tmp_path, monkeypatch):
+    """storage/ 相对当前目录"""
+    monkeypatch.chdir(tmp_path)
+    return login_state_path(env=ENV)
+
+
+def write_state(path, ttl: int):
+    state = build_cookie_state("success_login", ENV)
+    state["cookies"][0]["expires"] = int(time.time()) + ttl
+    write_login_state(path, state)
+
+
+class TestEnsureLoginState:
+
+    def test_valid_state_skips_browser(self, state_path, monkeypatch):
+        write_state(state_path, 600)
+        monkeypatch.setattr(load_checkout, "sync_playwright", lambda: pytest.fail("不应启动浏览器"))
+        assert ensure_login_state(ENV) == state_path
+
+
+class TestLoginStateRefresher:
+
+    @pytest.fixture
+    def mints(self, monkeypatch):
+        """登录态生成换成直接写入 600s 有效期的 cookie，记录调用次数"""
+        calls = []
+
+        def ensure(env):
+            calls.append(env)
+            path = login_state_path(env=env)
+            write_state(path, 600)
+            return path
+
+        monkeypatch.setattr(load_checkout, "ensure_login_state", ensure)
+        return calls
+
+    def test_valid_state_reused(self, state_path, mints):
+        refresher = LoginStateRefresher(ENV)
+
+        async def run():
+            return [await refresher() for _ in range(3)]
+
+        assert asyncio.run(run()) == [{"storage_state": str(state_path)}] * 3
+        assert mints == [ENV] and refresher.refreshed == 0
+
+    def test_expiring_state_refreshed_once(self, state_path, mints):
+        refresher = LoginStateRefresher(ENV)
+        write_state(state_path, 60)  # 剩余有效期不足 LOGIN_STATE_MIN_TTL
+
+        async def run():
+            return await asyncio.gather(*(refresher() for _ in range(5)))
+
+        asyncio.run(run())
+        assert mints == [ENV, ENV] and refresher.refreshed == 1
+        cookie = json.loads(state_path.read_text(encoding="utf-8"))["cookies"][0]
+        assert cookie["expires"] > time.time() + 500
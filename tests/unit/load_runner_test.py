@@ -0,0 +1,56 @@
+import asyncio
+
+from utils.load_runner import LoadJourney, LoadProfile, run_load
+
+
+class FakeContext:
+
+    async def new_page(self):
+        return "page"
+
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+
+    def __init__(self):
+        self.options = []
+
+    async def new_context(self, **options):
+        self.options.append(options)
+        return FakeContext()
+
+
+async def noop(page):
+    pass
+
+
+class TestRunLoad:
+    journey = LoadJourney(name="noop", setup=lambda page: page, steps=[("step", noop)])
+    profile = LoadProfile(users=2, duration=None, iterations=2, ramp_up=0, think_time=(0, 0))
+
+    def test_static_context_options(self):
+        browser = FakeBrowser()
+        report = asyncio.run(run_load(browser, self.journey, self.profile, {"storage_state": "a.json"}))
+        assert report["iterations"] == {"passed": 4, "failed": 0}
+        assert browser.options == [{"storage_state": "a.json"}] * 4
+
+    def test_context_options_called_per_iteration(self):
+        browser, calls = FakeBrowser(), []
+
+        async def options():
+            calls.append(len(calls))
+            return {"storage_state": f"{len(calls)}.json"}
+
+        asyncio.run(run_load(browser, self.journey, self.profile, options))
+        assert len(calls) == 4
+        assert sorted(o["storage_state"] for o in browser.options) == ["1.json", "2.json", "3.json", "4.json"]
+
+    def test_failed_options_counted(self):
+        async def options():
+            raise RuntimeError("login")
+
+        report = asyncio.run(run_load(FakeBrowser(), self.journey, self.profile, options))
+        assert report["iterations"] == {"passed": 0, "failed": 4}
+        assert report["errors"] == {"context: RuntimeError": 4}
@@ -0,0 +1,62 @@
+import pytest
+
+from utils.perf_report import build_perf_report, check_regressions, gate_skip_reason, percentile, suite_digest
+
+THRESHOLDS = {"p50": 20, "p95": 25, "wall_time": 15}
+
+
+def records(*nodeids, wall_time=1.0):
+    return [{"nodeid": nodeid, "attempt": 1, "status": "PASSED", "wall_time": wall_time} for nodeid in nodeids]
+
+
+def report(*nodeids, wall_time=10.0, env="dev", test_time=1.0):
+    return build_perf_report(records(*nodeids, wall_time=test_time), wall_time, env=env)
+
+
+def baseline_of(report: dict) -> dict:
+    return {key: report[key] for key in ("env", "tests", "suite", "p50", "p95", "wall_time")}
+
+
+FULL = ("tests/check_out_test.py::test_a", "tests/check_out_test.py::test_b", "tests/login_test.py::test_c")
+
+
+class TestGateSkipReason:
+
+    @pytest.mark.parametrize("current", [
+        report(*FULL[:2]),              # -k / --impact-base / --shard：部分用例
+        report(*FULL[:2], "tests/login_test.py::test_new"),  # 用例数相同但集合不同
+        report(*FULL, env="local"),     # 环境不同
+    ])
+    def test_not_comparable(self, current):
+        assert gate_skip_reason(current, baseline_of(report(*FULL))) is not None
+
+    def test_same_suite(self):
+        assert gate_skip_reason(report(*reversed(FULL)), baseline_of(report(*FULL))) is None
+
+    def test_legacy_baseline_by_count(self):
+        legacy = {key: value for key, value in baseline_of(report(*FULL)).items() if key != "suite"}
+        assert gate_skip_reason(report(*FULL), legacy) is None
+        assert gate_skip_reason(report(*FULL[:1]), legacy) is not None
+
+
+class TestCheckRegressions:
+
+    def test_wall_time_regression(self):
+        baseline = baseline_of(report(*FULL, wall_time=10.0))
+        assert check_regressions(report(*FULL, wall_time=11.0), baseline, THRESHOLDS) == []
+        failures = check_regressions(report(*FULL, wall_time=12.0), baseline, THRESHOLDS)
+        assert [line.split(":")[0] for line in failures] == ["wall_time"]
+
+    def test_percentile_regression(self):
+        baseline = baseline_of(report(*FULL, test_time=1.0))
+        failures = check_regressions(report(*FULL, test_time=2.0), baseline, THRESHOLDS)
+        assert [line.split(":")[0] for line in failures] == ["p50", "p95"]
+
+
+def test_suite_digest_order_independent():
+    assert suite_digest(["b", "a"]) == suite_digest(["a", "b"]) != suite_digest(["a"])
+
+
+@pytest.mark.parametrize("values, pct, expected", [([], 50, 0.0), ([3, 1, 2], 50, 2), ([1, 2, 3, 4], 95, 3.85)])
+def test_percentile(values, pct, expected):
+    assert percentile(values, pct) == pytest.approx(expected)
@@ -0,0 +1,138 @@
+import pytest
+from playwright._impl._errors import TimeoutError as PlaywrightTimeoutError
+
+from utils.rerun_scheduler import FlakeHistory, PendingReruns, RerunScheduler, classify_failure
+
+# playwright expect() 超时的真实失败信息（format_call_log 拼接的 call log）
+EXPECT_TIMEOUT_MESSAGE = ('Locator expected to be visible\n'
+                          'Actual value: None\n'
+                          'Error: element(s) not found \n'
+                          'Call log:\n'
+                          '  - Expect "to_be_visible" with timeout 5000ms\n'
+                          '  - waiting for locator("[data-test=\\"inventory-item\\"]").first\n')
+
+
+def excinfo_of(exc: BaseException) -> pytest.ExceptionInfo:
+    try:
+        raise exc
+    except BaseException:
+        return pytest.ExceptionInfo.from_current()
+
+
+@pytest.fixture
+def history(tmp_path):
+    return FlakeHistory(tmp_path / "flaky_history.json")
+
+
+def record(nodeid, attempt, status, kind=None, rerun=None):
+    return {"nodeid": nodeid, "attempt": attempt, "status": status, "failure_kind": kind, "rerun": rerun,
+            "wall_time": 1.0}
+
+
+class TestClassifyFailure:
+
+    @pytest.mark.parametrize("exc, kind", [
+        (AssertionError(EXPECT_TIMEOUT_MESSAGE), "timeout"),
+        (PlaywrightTimeoutError('Locator.click: Timeout 30000ms exceeded.\nCall log:\n'
+                                '  - waiting for get_by_role("button", name="Finish")\n'), "timeout"),
+        (AssertionError("assert 3 == 2"), "assertion"),
+        (AssertionError("Locator expected to have text 'x'\nActual value: y"), "assertion"),
+        (Exception("Page.goto: net::ERR_CONNECTION_REFUSED at http://127.0.0.1:8000/"), "network"),
+        (Exception("Target page, context or browser has been closed"), "browser"),
+        (KeyError("price"), "error"),
+    ])
+    def test_kind(self, exc, kind):
+        assert classify_failure(excinfo_of(exc)) == kind
+
+    def test_no_excinfo(self):
+        assert classify_failure(None) == "error"
+
+
+class TestRerunScheduler:
+
+    def test_flaky_kind_reruns_until_max(self, history):
+        scheduler = RerunScheduler(history, max_reruns=2)
+        assert scheduler.decide("t", "timeout", 1) == "timeout"
+        assert scheduler.decide("t", "timeout", 2) == "timeout"
+        assert scheduler.decide("t", "timeout", 3) is None
+
+    def test_bootstrap_without_history(self, history):
+        scheduler = RerunScheduler(history, bootstrap_runs=3)
+        assert scheduler.decide("t", "assertion", 1) == "bootstrap"
+        assert scheduler.decide("t", "assertion", 2) is None  # 只多给一次
+
+    def test_stable_history_skips_rerun(self, history):
+        for _ in range(3):
+            history.update([record("t", 1, "FAILED", "assertion")])
+        assert RerunScheduler(history, bootstrap_runs=3).decide("t", "assertion", 1) is None
+
+    def test_flaky_history_reruns(self, history):
+        history.update([record("t", 1, "FAILED", "assertion", "bootstrap"), record("t", 2, "PASSED")])
+        for _ in range(3):
+            history.update([record("t", 1, "PASSED")])
+        assert history.flake_rate("t") == 0.25
+        assert RerunScheduler(history, min_flake_rate=0.05).decide("t", "assertion", 1) == "history 25%"
+
+    def test_history_round_trip(self, history):
+        history.update([record("t", 1, "FAILED", "timeout", "timeout"), record("t", 2, "PASSED")])
+        history.save()
+        loaded = FlakeHistory(history.path)
+        assert loaded.runs("t") == 1
+        assert loaded.tests["t"]["kinds"] == {"timeout": 1}
+
+
+class TestPendingReruns:
+
+    def test_keeps_session_while_queued(self, history):
+        scheduler, session = RerunScheduler(history), object()
+        pending = PendingReruns(scheduler, session)
+        assert pending.listchain() == []
+        scheduler.schedule("item")
+        assert pending.listchain() == [session]
+
+
+class TestResetForRerun:
+    """pytester 中用与 conftest run_attempt 相同的方式重跑：session 保留，失败后复位再跑一次"""
+
+    CONFTEST = '''
+import pytest
+from _pytest.runner import runtestprotocol
+from utils.rerun_scheduler import reset_for_rerun
+
+RESET = {reset}
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    if any(report.failed for report in runtestprotocol(item, nextitem=item.session, log=False)):
+        if RESET:
+            reset_for_rerun(item)
+        for report in runtestprotocol(item, nextitem=nextitem, log=False):
+            item.ihook.pytest_runtest_logreport(report=report)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+'''
+    TESTS = '''
+import pytest
+
+CALLS = []
+
+
+@pytest.fixture(scope="session")
+def storefront():
+    CALLS.append(1)
+    if len(CALLS) == 1:
+        raise TimeoutError("storefront not ready")
+    return "up"
+
+
+def test_uses_storefront(storefront):
+    assert storefront == "up"
+'''
+
+    @pytest.mark.parametrize("reset, outcome", [(True, {"passed": 1}), (False, {"errors": 1})])
+    def test_failed_session_fixture(self, pytester, reset, outcome):
+        pytester.makeconftest(self.CONFTEST.format(reset=reset))
+        pytester.makepyfile(self.TESTS)
+        pytester.runpytest_inprocess("-p", "no:cacheprovider", "-p", "no:playwright").assert_outcomes(**outcome)
@@ -0,0 +1,79 @@
+import json
+import time
+
+import pytest
+
+import utils.session_provider as session_provider
+from utils.session_provider import (CookieSessionProvider, build_cookie_state, load_verification, same_session,
+                                    save_verification)
+
+ENV = "dev"
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """storage/ 相对当前目录"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "storage"
+
+
+@pytest.fixture
+def ui_logins(monkeypatch):
+    """UI 登录换成返回固定登录态，记录调用次数"""
+    calls = []
+
+    def login_via_ui(browser, user_key, env):
+        calls.append(user_key)
+        return {**build_cookie_state(user_key, env), "ui": True}
+
+    monkeypatch.setattr(session_provider, "login_via_ui", login_via_ui)
+    return calls
+
+
+class TestVerification:
+
+    def test_round_trip(self, storage):
+        assert load_verification(ENV) is None
+        save_verification(ENV, True)
+        assert load_verification(ENV) is True
+        assert load_verification("local") is None  # 按环境区分
+
+    def test_expired(self, storage):
+        save_verification(ENV, False)
+        path = storage / f"cookie_verified_{ENV}.json"
+        path.write_text(json.dumps({"verified": False, "checked": time.time() - 10}), encoding="utf-8")
+        assert load_verification(ENV, max_age=5) is None
+
+
+class TestCookieSessionProvider:
+
+    def test_first_mint_keeps_ui_state(self, storage, ui_logins):
+        path = storage / "login.json"
+        CookieSessionProvider(browser=None).mint("success_login", ENV, path)
+        assert ui_logins == ["success_login"]
+        assert json.loads(path.read_text(encoding="utf-8"))["ui"] is True  # UI 登录结果直接写入
+        assert load_verification(ENV) is True
+
+    def test_later_sessions_skip_ui_login(self, storage, ui_logins):
+        save_verification(ENV, True)
+        path = storage / "login.json"
+        CookieSessionProvider(browser=None).mint("success_login", ENV, path)
+        assert ui_logins == []
+        assert "ui" not in json.loads(path.read_text(encoding="utf-8"))
+
+    def test_mismatch_falls_back_to_ui(self, storage, ui_logins, monkeypatch):
+        save_verification(ENV, False)
+        monkeypatch.setattr(session_provider.UISessionProvider, "mint",
+                            lambda self, user_key, env, path, state=None: ui_logins.append("fallback") or path)
+        CookieSessionProvider(browser=None).mint("success_login", ENV, storage / "login.json")
+        assert ui_logins == ["fallback"]
+
+
+class TestSameSession:
+
+    def test_extra_app_storage_detected(self):
+        minted = build_cookie_state("success_login", ENV)
+        ui_state = {**minted, "origins": [{"origin": "https://www.saucedemo.com",
+                                          "localStorage": [{"name": "cart-contents", "value": "[]"}]}]}
+        assert same_session(minted, minted, ENV)
+        assert not same_session(minted, ui_state, ENV)
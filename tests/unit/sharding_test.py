@@ -0,0 +1,112 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utils.sharding import DEFAULT_DURATION, EWMA_ALPHA, load_durations, plan_shards, shard_items, update_durations
+
+
+class FakeItem:
+    """shard_items / group_key 用到的 Item 属性"""
+
+    def __init__(self, nodeid: str, cls=None, markers: dict | None = None):
+        self.nodeid = nodeid
+        self.cls = cls
+        self.markers = markers or {}
+
+    def get_closest_marker(self, name):
+        return self.markers.get(name)
+
+
+def marker(*args):
+    return SimpleNamespace(args=args)
+
+
+CartTests = type("TestCart", (), {})
+CheckOutTests = type("TestCheckOut", (), {})
+
+
+class TestPlanShards:
+
+    @pytest.mark.parametrize("durations, total, plan, loads", [
+        # LPT：从长到短，每组分给当前负载最小的 shard
+        ({"a": 8, "b": 7, "c": 6, "d": 5, "e": 4}, 2, [["a", "d", "e"], ["b", "c"]], [17, 13]),
+        ({"a": 8, "b": 7, "c": 6, "d": 5, "e": 4}, 3, [["a"], ["b", "e"], ["c", "d"]], [8, 11, 11]),
+        # 耗时相同按 key 排序，各机器划分一致
+        ({"b": 1, "a": 1, "c": 1}, 2, [["a", "c"], ["b"]], [2, 1]),
+        # shard 比组多：多出的 shard 为空
+        ({"a": 3}, 2, [["a"], []], [3, 0]),
+    ])
+    def test_lpt(self, durations, total, plan, loads):
+        shards, shard_loads, _ = plan_shards({key: [key] for key in durations}, durations, total)
+        assert shards == plan
+        assert shard_loads == loads
+
+    @pytest.mark.parametrize("durations, cost", [
+        ({"a": 2, "b": 4, "c": 9}, {"a": 2, "b": 4, "c": 9, "new": 4}),  # 没有记录：已知耗时的中位数
+        ({}, {"a": DEFAULT_DURATION, "b": DEFAULT_DURATION, "c": DEFAULT_DURATION, "new": DEFAULT_DURATION}),
+    ])
+    def test_unknown_duration_fallback(self, durations, cost):
+        groups = {key: [key] for key in ("a", "b", "c", "new")}
+        assert plan_shards(groups, durations, 2)[2] == cost
+
+    def test_group_cost_is_sum(self):
+        _, loads, cost = plan_shards({"g": ["a", "b"], "c": ["c"]}, {"a": 1, "b": 2, "c": 2.5}, 2)
+        assert cost == {"g": 3, "c": 2.5}
+        assert loads == [3, 2.5]
+
+
+class TestShardItems:
+
+    ITEMS = [
+        FakeItem("tests/cart_test.py::TestCart::test_add", CartTests, {"need_login": marker()}),
+        FakeItem("tests/cart_test.py::TestCart::test_delete", CartTests, {"need_login": marker()}),
+        FakeItem("tests/check_out_test.py::TestCheckOut::test_finish", CheckOutTests, {"need_login": marker()}),
+        FakeItem("tests/check_out_test.py::TestCheckOut::test_cancel", CheckOutTests, {"need_login": marker()}),
+        FakeItem("tests/login_test.py::test_login"),
+        FakeItem("tests/login_test.py::test_locked", markers={"shard_group": marker("locked")}),
+    ]
+    DURATIONS = {"tests/cart_test.py::TestCart::test_add": 5, "tests/cart_test.py::TestCart::test_delete": 5,
+                 "tests/check_out_test.py::TestCheckOut::test_finish": 6,
+                 "tests/check_out_test.py::TestCheckOut::test_cancel": 2,
+                 "tests/login_test.py::test_login": 3, "tests/login_test.py::test_locked": 1}
+
+    @pytest.mark.parametrize("shard, nodeids", [
+        ((1, 2), ["tests/cart_test.py::TestCart::test_add", "tests/cart_test.py::TestCart::test_delete",
+                  "tests/login_test.py::test_locked"]),
+        ((2, 2), ["tests/check_out_test.py::TestCheckOut::test_finish",
+                  "tests/check_out_test.py::TestCheckOut::test_cancel", "tests/login_test.py::test_login"]),
+    ])
+    def test_need_login_class_grouped(self, shard, nodeids):
+        selected, deselected, loads = shard_items(self.ITEMS, shard, self.DURATIONS)
+        assert [item.nodeid for item in selected] == nodeids
+        assert len(selected) + len(deselected) == len(self.ITEMS)
+        assert loads == [11, 11]
+
+    def test_shards_cover_all_items_once(self):
+        seen = [item.nodeid for k in (1, 2, 3) for item in shard_items(self.ITEMS, (k, 3), self.DURATIONS)[0]]
+        assert sorted(seen) == sorted(item.nodeid for item in self.ITEMS)
+
+
+class TestUpdateDurations:
+
+    @pytest.mark.parametrize("old, records, expected", [
+        ({}, [{"nodeid": "t", "wall_time": 4.0}], {"t": 4.0}),
+        # 重跑：各 attempt 耗时相加
+        ({}, [{"nodeid": "t", "wall_time": 4.0}, {"nodeid": "t", "wall_time": 2.0}], {"t": 6.0}),
+        # 指数平滑
+        ({"t": 10.0}, [{"nodeid": "t", "wall_time": 2.0}], {"t": 10.0 + EWMA_ALPHA * (2.0 - 10.0)}),
+        # 本次没有运行的用例保留原值
+        ({"t": 1.0, "u": 3.0}, [{"nodeid": "t", "wall_time": 1.0}], {"t": 1.0, "u": 3.0}),
+    ])
+    def test_ewma(self, tmp_path, old, records, expected):
+        path = tmp_path / "durations.json"
+        if old:
+            path.write_text(json.dumps(old), encoding="utf-8")
+        assert update_durations(records, path) == expected
+        assert load_durations(path) == expected
+
+    def test_no_save_for_shards(self, tmp_path):
+        path = tmp_path / "durations.json"
+        assert update_durations([{"nodeid": "t", "wall_time": 1.0}], path, save=False) == {"t": 1.0}
+        assert not path.exists()
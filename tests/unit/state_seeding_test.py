@@ -0,0 +1,80 @@
+import json
+import os
+import time
+from decimal import Decimal
+
+import pytest
+
+from utils.state_seeding import (CART_STORAGE_KEY, CATALOG_ROW, CatalogCache, CartSeeder, SEED_STORAGE_JS,
+                                 catalog_fingerprint)
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "storage"
+
+
+class TestCatalogRow:
+
+    @pytest.mark.parametrize("link_id, product_id", [("item_4_title_link", 4), ("item_0_title_link", 0),
+                                                     ("item_123_title_link", 123)])
+    def test_product_id(self, link_id, product_id):
+        assert CATALOG_ROW["product_id"].parser(link_id) == product_id
+
+    def test_fingerprint_stable(self):
+        assert catalog_fingerprint() == catalog_fingerprint()
+        assert len(catalog_fingerprint()) == 12
+
+
+class TestCatalogCache:
+
+    def write(self, cache: CatalogCache, rows: list[dict]):
+        cache.path.parent.mkdir(parents=True, exist_ok=True)
+        cache.path.write_text(json.dumps(rows), encoding="utf-8")
+
+    def test_missing_is_stale(self, storage):
+        assert not CatalogCache("local_6", "http://127.0.0.1:8800/inventory.html").is_fresh()
+
+    def test_age(self, storage):
+        cache = CatalogCache("local_6", "http://127.0.0.1:8800/inventory.html", max_age=60)
+        self.write(cache, [])
+        assert cache.is_fresh()
+        old = time.time() - 61
+        os.utime(cache.path, (old, old))
+        assert not cache.is_fresh()
+
+    def test_path_keyed_by_fingerprint(self, storage):
+        cache = CatalogCache("local_6", "http://127.0.0.1:8800/inventory.html")
+        assert cache.path.name == f"catalog_local_6_{catalog_fingerprint()}.json"
+
+    def test_fresh_file_not_harvested(self, storage):
+        cache = CatalogCache("local_6", "http://127.0.0.1:8800/inventory.html")
+        self.write(cache, [{"product_name": "Backpack", "product_price": "$29.99", "product_desc": "d",
+                            "product_id": 4}])
+        products = cache.get(context=None)  # 新鲜的缓存不会打开页面
+        assert products[0]["product_price"] == Decimal("29.99")
+
+
+class TestCartSeeder:
+
+    class FakePage:
+        def __init__(self):
+            self.scripts = []
+
+        def add_init_script(self, script):
+            self.scripts.append(script)
+
+    CATALOG = [{"product_name": f"p{i}", "product_price": Decimal(i), "product_desc": "", "product_id": i}
+               for i in (4, 0, 1)]
+
+    def test_seed_first_n(self):
+        page = self.FakePage()
+        products = CartSeeder(page, self.CATALOG, "http://127.0.0.1:8800").seed(2)
+        assert [p["product_name"] for p in products] == ["p4", "p0"]
+        assert page.scripts == [f"({SEED_STORAGE_JS})"
+                                f"({json.dumps(['http://127.0.0.1:8800', CART_STORAGE_KEY, '[4, 0]'])})"]
+
+    def test_not_enough_products(self):
+        with pytest.raises(AssertionError):
+            CartSeeder(self.FakePage(), self.CATALOG, "http://127.0.0.1:8800").seed(4)
@@ -0,0 +1,113 @@
+import hashlib
+import os
+import shutil
+import time
+from pathlib import Path
+
+from utils.common_utils import atomic_write_bytes
+
+"""失败产物内容寻址存储：同一份内容只存一个 blob（artifact_store/blobs/ab/<sha256>.<ext>）
+    artifacts/ 与 allure-results/ 里的文件都是指向 blob 的硬链接（不支持硬链接时退回复制）
+    重跑 attempt 之间相同的截图、Allure 对 artifacts 的重复副本都不再占用额外空间
+    artifact_store/ 跨 session 保留，session 结束时按时间和总大小淘汰最旧的 blob
+"""
+
+STORE_DIR = Path("artifact_store")
+DEFAULT_MAX_MB = 2048
+DEFAULT_MAX_AGE_DAYS = 7
+SCREENSHOT_FORMATS = ("png", "jpeg")
+HASH_CHUNK = 1024 * 1024
+
+
+def parse_size(value: str) -> dict:
+    """'1280x720' -> {"width": 1280, "height": 720}（Playwright record_video_size 格式）"""
+    width, height = (int(v) for v in value.lower().split("x"))
+    return {"width": width, "height": height}
+
+
+def link_or_copy(src: Path, dst: Path):
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f"{dst.name}.{os.getpid()}.tmp")  # 先链接到临时名再替换：读取方不会看到半个文件
+    try:
+        os.link(src, tmp)
+    except OSError:  # 跨文件系统 / 不支持硬链接
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+class ArtifactStore:
+    def __init__(self, root: Path = STORE_DIR, max_mb: int = DEFAULT_MAX_MB, max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        self.blobs = Path(root) / "blobs"
+        self.max_bytes = max_mb * 1024 * 1024
+        self.max_age = max_age_days * 86400
+        self.stats = {"blobs_added": 0, "stored_bytes": 0, "dedup_hits": 0, "dedup_saved_bytes": 0}
+
+    def blob_path(self, digest: str, suffix: str) -> Path:
+        return self.blobs / digest[:2] / f"{digest}{suffix}"
+
+    # ================== 写入 ==================
+    def put_bytes(self, data: bytes, suffix: str) -> Path:
+        blob = self.blob_path(hashlib.sha256(data).hexdigest(), suffix)
+        if self._reuse(blob, len(data)):
+            return blob
+        atomic_write_bytes(blob, data)  # 并行 worker 写同一个 blob 时内容相同，后写的覆盖无害
+        self._added(len(data))
+        return blob
+
+    def put_file(self, src: Path) -> Path:
+        """把文件收进 store（移动，不复制）；内容已存在时直接删除 src"""
+        digest = hashlib.sha256()
+        with open(src, "rb") as f:
+            while chunk := f.read(HASH_CHUNK):
+                digest.update(chunk)
+        size = src.stat().st_size
+        blob = self.blob_path(digest.hexdigest(), src.suffix)
+        if self._reuse(blob, size):
+            src.unlink()
+            return blob
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(src), blob)
+        self._added(size)
+        return blob
+
+    def store(self, data: bytes, dst: Path):
+        link_or_copy(self.put_bytes(data, dst.suffix), dst)
+
+    def store_file(self, src: Path, dst: Path):
+        link_or_copy(self.put_file(src), dst)
+
+    def _reuse(self, blob: Path, size: int) -> bool:
+        if not blob.exists():
+            return False
+        os.utime(blob)  # 刷新 mtime：淘汰按最近使用时间
+        self.stats["dedup_hits"] += 1
+        self.stats["dedup_saved_bytes"] += size
+        return True
+
+    def _added(self, size: int):
+        self.stats["blobs_added"] += 1
+        self.stats["stored_bytes"] += size
+
+    # ================== 淘汰 ==================
+    def evict(self, now: float | None = None) -> dict:
+        """先删超过 max_age 的 blob，再按 mtime 从旧到新删到总大小不超过 max_bytes
+            只删 store 里的链接：本次 session 的 artifacts / allure-results 硬链接不受影响
+        """
+        now = now if now is not None else time.time()
+        blobs = []
+        for path in self.blobs.rglob("*") if self.blobs.exists() else []:
+            if path.is_file() and not path.name.endswith(".tmp"):
+                stat = path.stat()
+                blobs.append((stat.st_mtime, stat.st_size, path))
+        blobs.sort()
+        total = sum(size for _, size, _ in blobs)
+        evicted = evicted_bytes = 0
+        for mtime, size, path in blobs:
+            if now - mtime <= self.max_age and total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+            evicted_bytes += size
+        return {"store_blobs": len(blobs) - evicted, "store_bytes": total,
+                "evicted_blobs": evicted, "evicted_bytes": evicted_bytes}
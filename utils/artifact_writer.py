@@ -0,0 +1,130 @@
+import gzip
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from utils.artifact_store import ArtifactStore, link_or_copy
+
+"""后台产物写入：失败截图落盘、video / trace 移动与清理、大文本压缩、Allure 附件复制都在后台线程按提交顺序执行
+    用例线程只做必须同步的部分（截图取字节、在 Allure 用例结果里登记附件），teardown 不再随产物大小变慢
+    配置了 ArtifactStore 时，落盘与移动都进内容寻址 store，目标路径只是硬链接（见 utils/artifact_store.py）
+    待写字节数有上限：超过 max_pending_bytes 时提交方阻塞等待，内存有界；session 结束时 close() 全部落盘
+"""
+
+DEFAULT_MAX_PENDING_BYTES = 256 * 1024 * 1024
+COMPRESS_MIN_BYTES = 64 * 1024  # 超过该大小的文本产物 gzip 后再写
+
+
+class ArtifactWriter:
+    def __init__(self, max_pending_bytes: int = DEFAULT_MAX_PENDING_BYTES, allure_listener=None,
+                 allure_dir: str | None = None, store: ArtifactStore | None = None):
+        self.max_pending_bytes = max_pending_bytes
+        self.store = store
+        self.allure_listener = allure_listener  # allure-pytest 的 AllureListener，未启用 --alluredir 时为 None
+        self.allure_dir = Path(allure_dir) if allure_dir else None
+        self.tasks = queue.Queue()
+        self.pending_bytes = 0
+        self.peak_pending_bytes = 0
+        self.stats = {"tasks": 0, "written_bytes": 0, "moved_files": 0, "compressed_files": 0,
+                      "allure_files": 0, "errors": 0, "blocked_ms": 0, "worker_ms": 0}
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    # ================== 用例线程调用 ==================
+    def write_bytes(self, path: Path, data: bytes | str, compress: bool = False):
+        data = data.encode("utf-8") if isinstance(data, str) else data
+        if compress and len(data) >= COMPRESS_MIN_BYTES:
+            path = path.with_name(path.name + ".gz")
+            self._submit(self._write_gzip, len(data), path, data)
+        else:
+            self._submit(self._write, len(data), path, data)
+
+    def move(self, src: Path, dst: Path):
+        self._submit(self._move, 0, src, dst)
+
+    def remove_tree(self, path: Path):
+        self._submit(self._remove_tree, 0, path)
+
+    def attach(self, path: Path, name: str, attachment_type):
+        """在当前用例的 Allure 结果里登记附件，文件复制交给后台；path 可以是尚未落盘的产物"""
+        if self.allure_listener is None or self.allure_dir is None:
+            return
+        file_name = self.allure_listener.allure_logger._attach(uuid4(), name=name, attachment_type=attachment_type)
+        self._submit(self._copy_to_allure, 0, path, self.allure_dir / file_name)
+
+    def close(self) -> dict:
+        self.tasks.put(None)
+        self._thread.join()
+        stats = {**self.stats, "peak_pending_bytes": self.peak_pending_bytes}
+        return {**stats, **self.store.stats} if self.store else stats
+
+    def _submit(self, fn, size: int, *args):
+        start = time.perf_counter()
+        with self._cond:
+            # 单个超大产物也要能提交：只在已有待写数据时等待
+            while self.pending_bytes and self.pending_bytes + size > self.max_pending_bytes:
+                self._cond.wait()
+            self.pending_bytes += size
+            self.peak_pending_bytes = max(self.peak_pending_bytes, self.pending_bytes)
+        self.stats["blocked_ms"] += round((time.perf_counter() - start) * 1000)
+        self.tasks.put((fn, size, args))
+
+    # ================== 后台线程 ==================
+    def _run(self):
+        while (task := self.tasks.get()) is not None:
+            fn, size, args = task
+            start = time.perf_counter()
+            try:
+                fn(*args)
+            except Exception as e:  # 单个产物失败不影响后续产物与用例结果
+                self.stats["errors"] += 1
+                print(f"⚠️ artifact writer: {fn.__name__}{args[:1]} 失败：{type(e).__name__}: {e}")
+            finally:
+                self.stats["tasks"] += 1
+                self.stats["worker_ms"] += round((time.perf_counter() - start) * 1000)
+                with self._cond:
+                    self.pending_bytes -= size
+                    self._cond.notify_all()
+
+    def _write(self, path: Path, data: bytes):
+        if self.store:
+            self.store.store(data, path)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        self.stats["written_bytes"] += len(data)
+
+    def _write_gzip(self, path: Path, data: bytes):
+        # mtime=0：相同内容压缩结果相同，store 才能去重
+        self._write(path, gzip.compress(data, compresslevel=6, mtime=0))
+        self.stats["compressed_files"] += 1
+
+    def _move(self, src: Path, dst: Path):
+        if not src.exists():
+            return
+        if self.store:
+            self.store.store_file(src, dst)
+        else:
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(src), dst)
+        self.stats["moved_files"] += 1
+
+    def _remove_tree(self, path: Path):
+        shutil.rmtree(path, ignore_errors=True)
+
+    def _copy_to_allure(self, src: Path, dst: Path):
+        link_or_copy(src, dst)  # 与 artifacts 下的文件共用同一份数据
+        self.stats["allure_files"] += 1
+
+
+def build_artifact_writer(config) -> ArtifactWriter:
+    store = None
+    if config.getini("artifact_store"):
+        store = ArtifactStore(max_mb=int(config.getini("artifact_store_max_mb")),
+                              max_age_days=float(config.getini("artifact_store_max_age_days")))
+    return ArtifactWriter(allure_listener=config.pluginmanager.get_plugin("allure_listener"),
+                          allure_dir=getattr(config.option, "allure_report_dir", None), store=store)
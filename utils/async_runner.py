@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, TypeVar
+
+from playwright.async_api import Browser, Page, async_playwright
+
+from utils.browser_server import async_connect_or_launch
+
+"""asyncio 引擎：一个 Chromium 承载多个 context，场景以协程并发执行"""
+
+DEFAULT_CONCURRENCY = 8
+
+Scenario = Callable[[Page], Awaitable[None]]
+T = TypeVar("T")
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    status: str  # PASSED / FAILED
+    duration: float
+    error: str = ""
+
+
+@dataclass
+class AsyncScenarioRunner:
+    """
+    在独立线程的事件循环中运行 async_playwright（不与 sync_playwright 的循环冲突）
+    run() 可从同步代码（pytest fixture、脚本）直接调用，内部用 Semaphore 限制并发 context 数
+    """
+    concurrency: int = DEFAULT_CONCURRENCY
+    headless: bool = True
+    context_options: dict = field(default_factory=dict)
+    browser_server: str | None = None  # 常驻浏览器 endpoint，None 取默认值，"off" 不连接
+
+    def __post_init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-playwright", daemon=True)
+        self._playwright = None
+        self._browser = None
+
+    def start(self):
+        self._thread.start()
+        try:
+            self._submit(self._launch())
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    def close(self):
+        try:
+            self._submit(self._shutdown())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def run(self, scenarios: dict[str, Scenario], concurrency: int | None = None) -> list[ScenarioResult]:
+        """并发执行 {场景名: async def scenario(page)}，每个场景一个全新 context；返回顺序与传入一致"""
+        return self._submit(self._run_all(scenarios, concurrency or self.concurrency))
+
+    def run_with_browser(self, fn: Callable[[Browser], Awaitable[T]]) -> T:
+        """在事件循环线程内执行 fn(browser)，context 由调用方自行管理（如压测的虚拟用户）"""
+        return self._submit(fn(self._browser))
+
+    # ================== 事件循环线程内 ==================
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _launch(self):
+        self._playwright = await async_playwright().start()
+        self._browser, _ = await async_connect_or_launch(self._playwright, self.browser_server, self.headless)
+
+    async def _shutdown(self):
+        if self._browser:
+            await self._browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+
+    async def _run_all(self, scenarios: dict[str, Scenario], concurrency: int) -> list[ScenarioResult]:
+        semaphore = asyncio.Semaphore(concurrency)
+        return list(await asyncio.gather(
+            *(self._run_one(name, scenario, semaphore) for name, scenario in scenarios.items())))
+
+    async def _run_one(self, name: str, scenario: Scenario, semaphore: asyncio.Semaphore) -> ScenarioResult:
+        async with semaphore:
+            start = time.perf_counter()
+            context = await self._browser.new_context(**self.context_options)
+            try:
+                page = await context.new_page()
+                await scenario(page)
+                return ScenarioResult(name, "PASSED", round(time.perf_counter() - start, 2))
+            except Exception as e:  # 断言失败、超时都记录为该场景失败，不影响其他协程
+                return ScenarioResult(name, "FAILED", round(time.perf_counter() - start, 2), f"{type(e).__name__}: {e}")
+            finally:
+                await context.close()
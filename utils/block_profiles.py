@@ -0,0 +1,114 @@
+import json
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from utils.common_utils import atomic_write_text
+
+"""请求拦截 profile：用例只断言文本、价格、URL，图片/字体/统计脚本的字节不需要下载
+    全局：pytest.ini 中 block_profile = no-images（默认 none：不注册 route，浏览器 HTTP 缓存照常生效）
+    单个用例：@pytest.mark.block_profile("text-only")
+"""
+
+ANALYTICS_PATTERNS = [r"google-analytics\.com", r"googletagmanager\.com", r"doubleclick\.net", r"backtrace\.io",
+                      r"segment\.(io|com)", r"hotjar\.com", r"optimizely\.com", r"newrelic\.com", r"nr-data\.net"]
+
+
+@dataclass(frozen=True)
+class BlockProfile:
+    resource_types: frozenset = frozenset()
+    url_patterns: tuple = ()
+
+    @property
+    def url_regex(self):
+        return re.compile("|".join(self.url_patterns)) if self.url_patterns else None
+
+
+BLOCK_PROFILES = {
+    "none": BlockProfile(),
+    "no-images": BlockProfile(resource_types=frozenset({"image"})),
+    "no-fonts": BlockProfile(resource_types=frozenset({"font"})),
+    "no-analytics": BlockProfile(url_patterns=tuple(ANALYTICS_PATTERNS)),
+    "text-only": BlockProfile(resource_types=frozenset({"image", "font", "media", "stylesheet"}),
+                              url_patterns=tuple(ANALYTICS_PATTERNS)),
+}
+DEFAULT_BLOCK_PROFILE = "none"
+RESOURCE_SIZES_FILE = Path(".route-cache/resource_sizes.json")
+RESOURCE_SIZES_MAX_ENTRIES = 5000  # 超出按最近使用淘汰（LRU）
+# 任一 profile 可能拦截的资源：只有这些 URL 的大小对估算有用
+BLOCKABLE_TYPES = frozenset().union(*(p.resource_types for p in BLOCK_PROFILES.values()))
+BLOCKABLE_URL_REGEX = re.compile("|".join(ANALYTICS_PATTERNS))
+
+
+class ResourceSizeBook:
+    """记录可拦截资源 URL 的响应大小（content-length，跨 session 持久化），用于估算拦截节省的字节"""
+
+    def __init__(self, path: Path = RESOURCE_SIZES_FILE, max_entries: int = RESOURCE_SIZES_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        sizes = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        self.sizes: OrderedDict[str, int] = OrderedDict(list(sizes.items())[-max_entries:])
+
+    def observe(self, response):
+        request = response.request  # 本地属性，不产生额外往返
+        if request.resource_type not in BLOCKABLE_TYPES and not BLOCKABLE_URL_REGEX.search(response.url):
+            return
+        length = response.headers.get("content-length")  # headers 是本地属性，不产生额外往返
+        if length and length.isdigit():
+            self.sizes[response.url] = int(length)
+            self.sizes.move_to_end(response.url)
+            if len(self.sizes) > self.max_entries:
+                self.sizes.popitem(last=False)
+
+    def get(self, url: str) -> int:
+        size = self.sizes.get(url, 0)
+        if size:
+            self.sizes.move_to_end(url)
+        return size
+
+    def save(self):
+        atomic_write_text(self.path, json.dumps(self.sizes))
+
+
+@dataclass
+class ResourceBlocker:
+    """单个 context 的拦截器；最后注册，先于 route cache 执行，不拦截的请求 fallback 给后者"""
+    profile_name: str
+    size_book: ResourceSizeBook
+    blocked: int = 0
+    bytes_saved: int = 0
+    blocked_types: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.profile = BLOCK_PROFILES[self.profile_name]
+        self.url_regex = self.profile.url_regex
+
+    def attach(self, context):
+        """none 不注册任何监听：route 会让每个请求经过 Python，并关闭浏览器 HTTP 缓存"""
+        if self.profile == BLOCK_PROFILES["none"]:
+            return
+        context.on("response", self.size_book.observe)
+        context.route("**/*", self.handle)
+
+    def should_block(self, request) -> bool:
+        return (request.resource_type in self.profile.resource_types
+                or bool(self.url_regex and self.url_regex.search(request.url)))
+
+    def handle(self, route, request):
+        if not self.should_block(request):
+            return route.fallback()
+        self.blocked += 1
+        self.bytes_saved += self.size_book.get(request.url)
+        self.blocked_types[request.resource_type] = self.blocked_types.get(request.resource_type, 0) + 1
+        route.abort("blockedbyclient")
+
+    def reset(self):
+        """context 池复用时清零计数，统计只属于当前用例"""
+        self.blocked = 0
+        self.bytes_saved = 0
+        self.blocked_types = {}
+
+    def summary(self) -> dict:
+        return {"block_profile": self.profile_name, "blocked_requests": self.blocked,
+                "blocked_bytes": self.bytes_saved, "blocked_types": dict(self.blocked_types)}
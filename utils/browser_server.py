@@ -0,0 +1,58 @@
+import os
+import urllib.request
+
+from playwright.sync_api import Error
+
+"""常驻浏览器：python -m scripts.browser_server 启动一个 Chromium 并开放 CDP 端口，
+    pytest session 与 scripts/ 下的入口先尝试 connect_over_cdp 连接，省掉每次 chromium.launch；端口不可用时自动回退为进程内 launch
+    断开连接（browser.close()）只清理本进程创建的 context，常驻浏览器继续运行
+    endpoint：--browser-server / 环境变量 BROWSER_SERVER，默认 http://127.0.0.1:9333，off 表示始终进程内启动
+"""
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9333
+DEFAULT_ENDPOINT = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
+ENDPOINT_ENV = "BROWSER_SERVER"
+PROBE_TIMEOUT = 0.2  # 秒：端口未监听时立即返回，这里只限制端口被其他程序占用、迟迟不响应的情况
+
+
+def resolve_endpoint(endpoint: str | None = None) -> str | None:
+    endpoint = endpoint or os.getenv(ENDPOINT_ENV) or DEFAULT_ENDPOINT
+    return None if endpoint == "off" else endpoint.rstrip("/")
+
+
+def is_server_running(endpoint: str) -> bool:
+    """/json/version 能访问才是 CDP 端口（只检查端口占用会误连其他服务）"""
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=PROBE_TIMEOUT) as resp:
+            return resp.status == 200
+    except (OSError, ValueError):
+        return False
+
+
+def server_endpoint(endpoint: str | None, headless: bool) -> str | None:
+    """headed 运行需要可见窗口，不连接常驻（headless）浏览器"""
+    endpoint = resolve_endpoint(endpoint)
+    return endpoint if headless and endpoint and is_server_running(endpoint) else None
+
+
+def connect_or_launch(playwright, endpoint: str | None = None, headless: bool = True):
+    """-> (browser, 是否连接到常驻浏览器)；两种情况都由调用方 browser.close()"""
+    endpoint = server_endpoint(endpoint, headless)
+    if endpoint:
+        try:
+            return playwright.chromium.connect_over_cdp(endpoint), True
+        except Error as e:
+            print(f"⚠️ 连接常驻浏览器失败，改为进程内启动：{e}")
+    return playwright.chromium.launch(headless=headless), False
+
+
+async def async_connect_or_launch(playwright, endpoint: str | None = None, headless: bool = True):
+    """connect_or_launch 的 async_playwright 版本"""
+    endpoint = server_endpoint(endpoint, headless)
+    if endpoint:
+        try:
+            return await playwright.chromium.connect_over_cdp(endpoint), True
+        except Error as e:
+            print(f"⚠️ 连接常驻浏览器失败，改为进程内启动：{e}")
+    return await playwright.chromium.launch(headless=headless), False
@@ -0,0 +1,60 @@
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+"""采集策略：按 attempt 决定本次 context 录制哪些失败证据
+    off                     —— 不录 video/trace，不截环形截图（失败截图、URL、console 仍保存）
+    on-first-retry          —— 首次执行不额外采集（绿色用例零开销）；重跑（attempt >= 2）才开启 video + trace
+    retain-on-failure-lite  —— 任何 attempt 都在每个动作后截图进内存环形缓冲，失败才落盘（每个动作多一次截图往返，需显式开启）
+    成本对比：python -m scripts.bench_capture
+    always                  —— 每次都录 1080p video + 完整 tracing（原行为）
+"""
+
+CAPTURE_MODES = ("off", "on-first-retry", "retain-on-failure-lite", "always")
+DEFAULT_CAPTURE_MODE = "on-first-retry"
+SCREENSHOT_RING_SIZE = 5  # 环形缓冲保留最近 N 个动作后的截图
+
+
+@dataclass(frozen=True)
+class CapturePlan:
+    video: bool = False
+    tracing: bool = False
+    screenshot_ring: int = 0  # 0 表示不开启环形截图
+
+    @property
+    def heavy(self) -> bool:
+        return self.video or self.tracing
+
+
+def plan_capture(mode: str, attempt: int) -> CapturePlan:
+    if mode == "always":
+        return CapturePlan(video=True, tracing=True)
+    if mode == "on-first-retry" and attempt > 1:
+        return CapturePlan(video=True, tracing=True)
+    if mode == "retain-on-failure-lite":
+        return CapturePlan(screenshot_ring=SCREENSHOT_RING_SIZE)
+    return CapturePlan()
+
+
+class ScreenshotRing:
+    """内存中的有界截图缓冲：每个 BasePage 动作后截一张低质量 jpeg，只在失败时写盘"""
+
+    def __init__(self, size: int = SCREENSHOT_RING_SIZE):
+        self.shots = deque(maxlen=size)
+        self.seq = 0
+
+    def capture(self, page, label: str):
+        self.seq += 1
+        self.shots.append((self.seq, label, page.screenshot(type="jpeg", quality=40)))
+
+    def dump(self, target_dir: Path, writer=None) -> list[Path]:
+        """writer 为 ArtifactWriter 时交给后台写盘，返回的路径稍后才落盘"""
+        paths = []
+        for seq, label, data in self.shots:
+            path = target_dir / f"ring_{seq:03d}_{label}.jpg"
+            if writer:
+                writer.write_bytes(path, data)
+            else:
+                path.write_bytes(data)
+            paths.append(path)
+        return paths
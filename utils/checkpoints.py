@@ -0,0 +1,140 @@
+import hashlib
+import inspect
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+from data.login_data import SAVE_LOGIN_STATE_PATH
+from utils.common_utils import atomic_write_text
+from utils.impact import depends_on
+from utils.login_state import cookies_alive
+
+"""旅程检查点：多个用例共享的 UI 前缀（如 inventory → 加购 N 个 → cart → checkout step one）每个 session 只跑一次
+    @pytest.mark.setup_mode("checkpoint") —— conftest 给 page 挂 JourneyCheckpoints；前缀在独立 context 中跑完后保存
+        storage state（cookie + localStorage）、当前 URL 和 page object 状态，之后每个用例在自己的全新 context 中恢复，直接打开该 URL
+    key = 前缀名 + 参数（如 ADD_PRODUCT_NUM、URL、登录用户）+ 依赖的 page 模块源码 / 定位字典指纹：改了定位或 page 代码自动重建
+    默认只保存在内存：每个 session 都真实跑一次前缀，站点上加购 / 跳转的回归当次就能发现
+    --checkpoint-cache：同时缓存到 storage/checkpoint_{name}_{key}.json 跨 session 复用（本地反复调试用），
+        超过 CHECKPOINT_MAX_AGE 或 cookie 即将过期时重建
+"""
+
+CHECKPOINT_MAX_AGE = 3600  # 秒：检查点里的业务状态（购物车等）不宜跨太久复用
+CHECKPOINT_VIEWPORT = {"width": 1920, "height": 1080}  # 与用例 context 一致，响应式页面走同一套 DOM
+
+# 与 SEED_STORAGE_JS 相同：sessionStorage 标记保证只在第一个文档写入，之后由应用自己维护
+RESTORE_STORAGE_JS = """
+(origins) => {
+    if (sessionStorage.getItem("__checkpoint_restored__")) return;
+    const entry = origins.find(o => o.origin === location.origin);
+    if (!entry) return;
+    for (const {name, value} of entry.localStorage) localStorage.setItem(name, value);
+    sessionStorage.setItem("__checkpoint_restored__", "1");
+}
+"""
+
+Prefix = Callable[[object], dict]  # prefix(page) -> 可写入 JSON 的 page object 状态
+
+
+def fingerprint(deps) -> str:
+    """类：所在模块及 pages/ 下各基类模块的源码；其他（定位字典等）：JSON"""
+    digest = hashlib.sha256()
+    for dep in deps:
+        if inspect.isclass(dep):
+            modules = dict.fromkeys(cls.__module__ for cls in dep.__mro__ if cls.__module__.startswith("pages."))
+            for module in modules:
+                digest.update(inspect.getsource(sys.modules[module]).encode("utf-8"))
+        else:
+            digest.update(json.dumps(dep, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def checkpoint_key(name: str, params: dict, deps) -> str:
+    raw = json.dumps({"name": name, "params": params, "deps": fingerprint(deps)}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def checkpoint_path(name: str, key: str) -> Path:
+    return Path(SAVE_LOGIN_STATE_PATH) / f"checkpoint_{name}_{key}.json"
+
+
+class CheckpointStore:
+    """session 级：内存缓存（persist 时加上 storage/）；缺失或失效时用 session 的 browser 新开 context 跑一次前缀"""
+
+    def __init__(self, browser, max_age: int = CHECKPOINT_MAX_AGE, persist: bool = False):
+        self.browser = browser
+        self.max_age = max_age
+        self.persist = persist
+        self.snapshots: dict[str, dict] = {}
+        self.stats = {"hits": 0, "builds": 0, "build_seconds": 0.0}
+
+    def get(self, name: str, params: dict, deps, prefix: Prefix, storage_state: Path | None) -> dict:
+        depends_on(deps)  # 命中检查点时前缀不会执行，影响分析按指纹依赖记录
+        # 登录用户不同，前缀跑出来的状态也不同
+        key = checkpoint_key(name, {**params, "storage_state": Path(storage_state).name if storage_state else None},
+                             deps)
+        snapshot = self.snapshots.get(key)
+        if snapshot is None or not self.is_valid(snapshot):
+            path = checkpoint_path(name, key)
+            snapshot = self.load(path) if self.persist else None
+            if snapshot is None:
+                snapshot = self.build(prefix, storage_state)
+                if self.persist:
+                    self.save(path, snapshot)
+                    print(f"📍 检查点已保存 -> {path}（{snapshot['url']}）")
+            self.snapshots[key] = snapshot
+        self.stats["hits"] += 1
+        return snapshot
+
+    def is_valid(self, snapshot: dict) -> bool:
+        return (time.time() - snapshot["created"] < self.max_age
+                and cookies_alive(snapshot["storage_state"].get("cookies", [])))
+
+    def load(self, path: Path) -> dict | None:
+        if not path.exists():
+            return None
+        try:
+            snapshot = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+        return snapshot if self.is_valid(snapshot) else None
+
+    def build(self, prefix: Prefix, storage_state: Path | None) -> dict:
+        start = time.perf_counter()
+        context = self.browser.new_context(storage_state=str(storage_state) if storage_state else None,
+                                           viewport=CHECKPOINT_VIEWPORT)
+        try:
+            page = context.new_page()
+            state = prefix(page)
+            snapshot = {"url": page.url, "state": state, "storage_state": context.storage_state(),
+                        "created": time.time()}
+        finally:
+            context.close()
+        self.stats["builds"] += 1
+        self.stats["build_seconds"] = round(self.stats["build_seconds"] + time.perf_counter() - start, 3)
+        return snapshot
+
+    @staticmethod
+    def save(path: Path, snapshot: dict):
+        atomic_write_text(path, json.dumps(snapshot, ensure_ascii=False))
+
+
+class JourneyCheckpoints:
+    """挂在 page._journey_checkpoints 上；restore 必须在打开目标页之前调用（与 CartSeeder 相同）"""
+
+    def __init__(self, store: CheckpointStore, page, storage_state: Path | None):
+        self.store = store
+        self.page = page
+        self.storage_state = storage_state
+
+    def restore(self, name: str, params: dict, deps, prefix: Prefix) -> tuple[str, dict]:
+        """把检查点的 cookie / localStorage 写入当前 context，返回 (检查点 URL, page object 状态)"""
+        snapshot = self.store.get(name, params, deps, prefix, self.storage_state)
+        storage = snapshot["storage_state"]
+        if storage.get("cookies"):
+            self.page.context.add_cookies(storage["cookies"])
+        origins = [o for o in storage.get("origins", []) if o.get("localStorage")]
+        if origins:
+            self.page.add_init_script(script=f"({RESTORE_STORAGE_JS})({json.dumps(origins)})")
+        return snapshot["url"], snapshot["state"]
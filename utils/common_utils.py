@@ -1,13 +1,29 @@
-from decimal import Decimal
-import re
-
-"""字符串中获取价格"""
-
-
-def parse_money(text: str) -> Decimal:
-    """
-        从 'Item total: $39.98' 提取 Decimal('39.98')
-        """
-    match = re.search(r"\$([\d.]+)", text)
-    assert match, f"无法从文本中解析金额：{text}"
-    return Decimal(match.group(1))
+import os
+import threading
+from decimal import Decimal
+from pathlib import Path
+import re
+
+"""字符串中获取价格；原子写文件"""
+
+
+def parse_money(text: str) -> Decimal:
+    """
+        从 'Item total: $39.98' 提取 Decimal('39.98')
+        """
+    match = re.search(r"\$([\d.]+)", text)
+    assert match, f"无法从文本中解析金额：{text}"
+    return Decimal(match.group(1))
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """先写临时文件再 os.replace：并行 worker / 线程同时写同一个文件时，读取方不会读到写了一半的内容"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def atomic_write_text(path: Path, text: str):
+    atomic_write_bytes(path, text.encode("utf-8"))
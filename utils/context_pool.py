@@ -0,0 +1,101 @@
+import json
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+"""context 池：按 flavor（登录态文件 + 拦截 profile）保留热 context，用例之间重置状态代替 new_context
+    重置：关闭残留 page → 清 cookie / 权限 → 逐个访问用过的 origin 清空 localStorage、sessionStorage → 恢复登录态
+    不入池：@pytest.mark.isolated 的用例、需要录 video / trace 的 attempt（见 conftest）
+"""
+
+RESET_PATH = "/__context_pool_reset__"
+CLEAR_STORAGE_JS = "() => { localStorage.clear(); sessionStorage.clear(); }"
+RESTORE_STORAGE_JS = "items => items.forEach(({name, value}) => localStorage.setItem(name, value))"
+
+
+class PooledContext:
+    def __init__(self, context, blocker, flavor: tuple):
+        self.context = context
+        self.blocker = blocker
+        self.flavor = flavor
+        self.origins: set[str] = set()
+        # 记录访问过的 origin：重置时只需清理这些 origin 的 storage
+        context.on("request", lambda r: self.origins.add(origin_of(r.url)) if r.resource_type == "document" else None)
+
+
+class ContextPool:
+    def __init__(self, factory):
+        self.factory = factory  # factory(storage_state, block_profile) -> (context, blocker)
+        self.idle: dict[tuple, list[PooledContext]] = {}
+        self.fresh_times: list[float] = []
+        self.reuse_times: list[float] = []
+
+    def acquire(self, storage_state: Path | None, block_profile: str) -> tuple[PooledContext, float, bool]:
+        """返回 (池化 context, 准备耗时, 是否复用)"""
+        flavor = (str(storage_state) if storage_state else None, block_profile)
+        start = time.perf_counter()
+        idle = self.idle.get(flavor)
+        if idle:
+            pooled = idle.pop()
+            reset_context(pooled, storage_state)
+            elapsed = time.perf_counter() - start
+            self.reuse_times.append(elapsed)
+            return pooled, elapsed, True
+
+        context, blocker = self.factory(storage_state, block_profile)
+        elapsed = time.perf_counter() - start
+        self.fresh_times.append(elapsed)
+        return PooledContext(context, blocker, flavor), elapsed, False
+
+    def release(self, pooled: PooledContext):
+        for page in pooled.context.pages:
+            page.close()
+        self.idle.setdefault(pooled.flavor, []).append(pooled)
+
+    def close(self):
+        for idle in self.idle.values():
+            for pooled in idle:
+                pooled.context.close()
+        self.idle.clear()
+
+    @property
+    def avg_fresh_time(self) -> float:
+        return sum(self.fresh_times) / len(self.fresh_times) if self.fresh_times else 0.0
+
+    def stats(self) -> dict:
+        saved = sum(max(self.avg_fresh_time - t, 0) for t in self.reuse_times)
+        return {"fresh_contexts": len(self.fresh_times), "reused_contexts": len(self.reuse_times),
+                "setup_saved_ms": round(saved * 1000)}
+
+
+def origin_of(url: str) -> str:
+    parts = urlparse(url)
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ("http", "https") else ""
+
+
+def reset_context(pooled: PooledContext, storage_state: Path | None):
+    context = pooled.context
+    context.clear_cookies()
+    context.clear_permissions()
+
+    state = json.loads(storage_state.read_text(encoding="utf-8")) if storage_state else {"cookies": [], "origins": []}
+    saved_storage = {o["origin"]: o.get("localStorage", []) for o in state.get("origins", [])}
+    origins = {o for o in pooled.origins | set(saved_storage) if o}
+    if origins:
+        # 在每个 origin 下打开一个本地 fulfill 的空白页执行清理，不产生真实网络请求
+        page = context.new_page()
+        for origin in origins:
+            url = origin + RESET_PATH
+            page.route(url, lambda route: route.fulfill(status=200, content_type="text/html", body="<html></html>"))
+            page.goto(url)
+            page.evaluate(CLEAR_STORAGE_JS)
+            if saved_storage.get(origin):
+                page.evaluate(RESTORE_STORAGE_JS, saved_storage[origin])
+            page.unroute(url)
+        page.close()
+    pooled.origins.clear()
+
+    if state.get("cookies"):
+        context.add_cookies(state["cookies"])  # 登录态按文件当前内容恢复（过期重新生成后也能拿到新 cookie）
+    if pooled.blocker:
+        pooled.blocker.reset()
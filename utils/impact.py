@@ -0,0 +1,358 @@
+import ast
+import json
+import re
+import subprocess
+import sys
+import threading
+import time
+from fnmatch import fnmatch
+from functools import lru_cache
+from pathlib import Path
+
+from utils.common_utils import atomic_write_text
+
+"""用例影响分析：只跑被改动的 page object / 断言 / 定位 / 数据影响到的用例
+    记录（--impact-record）：sys.setprofile 记录每个用例运行时调用到的 pages/ assertions/ config/ data/ tests/ 函数，
+        再静态解析这些函数（类体、测试方法、装饰器）引用的模块级常量，如 CHECKOUT_LOCATORS、FINISH_PAGE_MESSAGE
+    选择（--impact-base REF）：git diff REF 的改动行映射到符号（函数、方法、类体、模块级常量、其余行记为 <module>），
+        只保留用到这些符号的用例；索引里没有的用例（新增）照常执行
+    非 function 级 fixture 只在第一个用到它的用例里执行一次：单独记录，之后记到每个请求该 fixture 的用例
+    跨 session 缓存（登录态、商品目录、检查点）命中时生成它的代码不会执行：缓存提供方通过 depends_on 声明参与指纹的类 / 常量，
+        类按整个模块计（与 checkpoints.fingerprint 一致）
+    索引 impact/index.json 按用例增量更新：只替换本次运行过的用例，符号按名字而不是行号记录，无关改动不会让索引失效
+"""
+
+IMPACT_DIR = Path("impact")
+INDEX_FILE = IMPACT_DIR / "index.json"
+WATCHED_DIRS = ("pages", "assertions", "config", "data", "tests")
+IGNORED_PATTERNS = ("*.md", ".gitignore", "requests.jsonl")  # 改动这些文件不影响任何用例
+MODULE_SYMBOL = "<module>"
+HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+# ================== 源码符号 ==================
+def symbol_spans(source: str) -> list[tuple[int, int, str]]:
+    """[(起始行, 结束行, 符号)]：顶层函数 / 类 / 方法 / 模块级赋值；类体中方法以外的行记为类名"""
+    spans = []
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            spans.append((node_start(node), node.end_lineno, node.name))
+            if isinstance(node, ast.ClassDef):
+                for child in node.body:
+                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        spans.append((node_start(child), child.end_lineno, f"{node.name}.{child.name}"))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for name in ast.walk(target):
+                    if isinstance(name, ast.Name):
+                        spans.append((node.lineno, node.end_lineno, name.id))
+    return spans
+
+
+def node_start(node) -> int:
+    return min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+
+
+def symbols_at(spans: list[tuple[int, int, str]], start: int, end: int) -> set[str]:
+    """行区间 [start, end] 涉及的符号：方法行只算方法，类体其他行算类，顶层以外的行算 <module>"""
+    symbols = set()
+    for line in range(start, end + 1):
+        hits = [(s, e, name) for s, e, name in spans if s <= line <= e]
+        if not hits:
+            symbols.add(MODULE_SYMBOL)
+            continue
+        innermost = max(hits, key=lambda span: span[0])  # 方法起始行大于所在类
+        symbols.add(innermost[2])
+    return symbols
+
+
+@lru_cache(maxsize=None)
+def parse_file(path: str) -> ast.Module | None:
+    try:
+        return ast.parse(Path(path).read_text(encoding="utf-8"))
+    except (OSError, SyntaxError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def file_spans(path: str) -> list[tuple[int, int, str]]:
+    try:
+        return symbol_spans(Path(path).read_text(encoding="utf-8"))
+    except (OSError, SyntaxError):
+        return []
+
+
+def code_qualname(code) -> str:
+    """co_qualname 需要 Python 3.11（CI 为 3.10）：按 co_firstlineno 找所在的顶层函数 / 类 / 方法，嵌套函数归到外层"""
+    if code.co_name == MODULE_SYMBOL:
+        return MODULE_SYMBOL
+    return symbols_at(file_spans(code.co_filename), code.co_firstlineno, code.co_firstlineno).pop()
+
+
+def find_node(tree: ast.Module, qualname: str):
+    node = tree
+    for part in qualname.split("."):
+        node = next((child for child in node.body
+                     if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+                     and child.name == part), None)
+        if node is None:
+            return None
+    return node
+
+
+def referenced_names(node) -> set[str]:
+    """符号引用的全局名字；类只看类体（Loc 定位、基类），方法另算"""
+    roots = [node]
+    if isinstance(node, ast.ClassDef):
+        roots = node.bases + node.decorator_list + [child for child in node.body
+                                                    if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    return {n.id for root in roots for n in ast.walk(root) if isinstance(n, ast.Name)}
+
+
+# ================== 运行时记录 ==================
+class ImpactRecorder:
+    """整个 session 只安装一次 profile（包括之后启动的线程，如 asyncio 引擎的事件循环线程），按当前用例归集符号"""
+    active: "ImpactRecorder | None" = None  # depends_on 写入的 recorder
+
+    def __init__(self, root: Path):
+        self.root = Path(root).resolve()
+        self.current: set[str] | None = None
+        self.outer: list[set[str] | None] = []  # fixture 记录期间暂存用例的符号
+        self.fixture_symbols: dict[str, set[str]] = {}
+        self.code_symbols: dict[int, tuple[str, ...]] = {}
+        self.dep_symbols: dict[int, set[str]] = {}
+
+    def install(self):
+        ImpactRecorder.active = self
+        sys.setprofile(self._profile)
+        threading.setprofile(self._profile)
+
+    def uninstall(self):
+        ImpactRecorder.active = None
+        sys.setprofile(None)
+        threading.setprofile(None)
+
+    def start(self):
+        self.current = set()
+
+    def stop(self, fixturenames=()) -> set[str]:
+        """fixturenames：用例请求的 fixture（闭包），合并这些 fixture 记录下来的符号"""
+        symbols, self.current = self.current or set(), None
+        for name in fixturenames:
+            symbols |= self.fixture_symbols.get(name, set())
+        return symbols
+
+    def start_fixture(self):
+        self.outer.append(self.current)
+        self.current = set()
+
+    def stop_fixture(self, argname: str):
+        self.fixture_symbols.setdefault(argname, set()).update(self.current or set())
+        self.current = self.outer.pop()
+
+    def declare(self, deps):
+        if self.current is None:
+            return
+        for dep in deps:
+            if id(dep) not in self.dep_symbols:
+                self.dep_symbols[id(dep)] = self.dependency_symbols(dep)
+            self.current.update(self.dep_symbols[id(dep)])
+
+    def dependency_symbols(self, dep) -> set[str]:
+        """类：MRO 中各被监视模块的全部符号；其他对象：按同一性找到定义它的模块级名字"""
+        symbols = set()
+        if isinstance(dep, type):
+            for cls in dep.__mro__:
+                module = sys.modules.get(cls.__module__)
+                filename = getattr(module, "__file__", "") or ""
+                rel = self.relpath(filename)
+                if rel:
+                    symbols.add(f"{rel}::{MODULE_SYMBOL}")
+                    symbols.update(f"{rel}::{name}" for _, _, name in file_spans(filename))
+            return symbols
+        for module in list(sys.modules.values()):
+            rel = self.relpath(getattr(module, "__file__", "") or "")
+            names = [name for name, value in list(vars(module).items()) if value is dep] if rel else []
+            if names:
+                symbols.update({f"{rel}::{MODULE_SYMBOL}", *(f"{rel}::{name}" for name in names)})
+        return symbols
+
+    def _profile(self, frame, event, arg):
+        if event != "call" or self.current is None:
+            return
+        code = frame.f_code
+        symbols = self.code_symbols.get(id(code))
+        if symbols is None:
+            symbols = self.code_symbols[id(code)] = self.resolve(code, frame.f_globals)
+        self.current.update(symbols)
+
+    def relpath(self, filename: str) -> str | None:
+        if not filename or filename.startswith("<"):  # <string>、<frozen ...>
+            return None
+        try:
+            rel = Path(filename).resolve().relative_to(self.root)
+        except ValueError:
+            return None
+        return rel.as_posix() if rel.parts and rel.parts[0] in WATCHED_DIRS else None
+
+    def resolve(self, code, module_globals: dict) -> tuple[str, ...]:
+        rel = self.relpath(code.co_filename)
+        if rel is None:
+            return ()
+        qualname = code_qualname(code)
+        if qualname == MODULE_SYMBOL:  # import 阶段的模块代码不计
+            return ()
+        top = qualname.split(".")[0]
+        symbols = {f"{rel}::{MODULE_SYMBOL}", f"{rel}::{top}", f"{rel}::{qualname}"}
+        tree = parse_file(code.co_filename)
+        for name in {top, qualname}:
+            node = find_node(tree, name) if tree else None
+            if node is not None:
+                symbols.update(self.global_symbols(referenced_names(node), module_globals))
+        return tuple(sorted(symbols))
+
+    def global_symbols(self, names: set[str], module_globals: dict) -> set[str]:
+        """名字 -> 定义它的被监视模块里的符号（常量按对象同一性回溯到定义模块）"""
+        symbols = set()
+        for name in names:
+            if name not in module_globals:
+                continue
+            value = module_globals[name]
+            owner = getattr(value, "__module__", None) if callable(value) else None
+            if owner:  # 类 / 函数：按定义位置
+                module = sys.modules.get(owner)
+                rel = self.relpath(getattr(module, "__file__", "") or "") if module else None
+                if rel:
+                    symbols.update({f"{rel}::{MODULE_SYMBOL}", f"{rel}::{value.__qualname__.split('.')[0]}"})
+                continue
+            for module in list(sys.modules.values()):
+                rel = self.relpath(getattr(module, "__file__", "") or "")
+                if rel and rel.startswith(("config/", "data/")) and module.__dict__.get(name, None) is value:
+                    symbols.update({f"{rel}::{MODULE_SYMBOL}", f"{rel}::{name}"})
+        return symbols
+
+
+def depends_on(deps):
+    """缓存提供方调用：命中缓存时也把生成它的代码记到当前用例"""
+    if ImpactRecorder.active is not None:
+        ImpactRecorder.active.declare(deps)
+
+
+def record_impact(config, nodeid: str, symbols: set[str]):
+    """重跑时合并各 attempt；worker 进程同时写入 workeroutput，由主进程汇总"""
+    records = get_impact_records(config)
+    records[nodeid] = sorted(set(records.get(nodeid, [])) | symbols)
+    workeroutput = getattr(config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput.setdefault("impact", {})[nodeid] = records[nodeid]
+
+
+def collect_worker_impact(config, workeroutput: dict):
+    get_impact_records(config).update(workeroutput.get("impact", {}))
+
+
+def get_impact_records(config) -> dict[str, list[str]]:
+    if not hasattr(config, "_impact_records"):
+        config._impact_records = {}
+    return config._impact_records
+
+
+# ================== 索引 ==================
+def load_index(path: Path = INDEX_FILE) -> dict:
+    if not path.exists():
+        return {"tests": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def update_index(records: dict[str, list[str]], commit: str | None, path: Path = INDEX_FILE) -> dict:
+    """只替换本次运行过的用例"""
+    index = load_index(path)
+    now = time.strftime("%Y-%m-%dT%H:%M:%S")
+    for nodeid, symbols in records.items():
+        index["tests"][nodeid] = {"symbols": symbols, "commit": commit, "updated": now}
+    index["commit"] = commit
+    atomic_write_text(path, json.dumps(index, ensure_ascii=False, indent=1))
+    return index
+
+
+# ================== git diff -> 符号 ==================
+def git(root: Path, *args) -> str:
+    return subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, check=True).stdout
+
+
+def head_commit(root: Path) -> str | None:
+    try:
+        return git(root, "rev-parse", "HEAD").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def changed_symbols(root: Path, base: str) -> tuple[set[str], list[str]]:
+    """返回 (改动符号, 需要全量执行的文件)；第二项非空时无法缩小范围
+        git diff base 包含工作区未提交的改动
+    """
+    symbols, unscoped = set(), []
+    diff = git(root, "diff", "-U0", "--no-renames", base, "--", ".")
+    for path, old_ranges, new_ranges in parse_diff(diff):
+        if any(fnmatch(path, pattern) for pattern in IGNORED_PATTERNS):
+            continue
+        if not path.endswith(".py") or path.split("/")[0] not in WATCHED_DIRS:
+            unscoped.append(path)
+            continue
+        for ranges, source in ((old_ranges, git_show(root, base, path)), (new_ranges, read_source(root / path))):
+            if not ranges or source is None:
+                continue
+            try:
+                spans = symbol_spans(source)
+            except SyntaxError:
+                unscoped.append(path)
+                continue
+            for start, end in ranges:
+                symbols.update(f"{path}::{name}" for name in symbols_at(spans, start, end))
+    return symbols, unscoped
+
+
+def parse_diff(diff: str):
+    """-> [(path, 旧文件改动行区间, 新文件改动行区间)]"""
+    files, current = [], None
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            current = [line.split(" b/", 1)[1], [], []]
+            files.append(current)
+        elif line.startswith("@@") and current:
+            old_start, old_count, new_start, new_count = HUNK_RE.match(line).groups()
+            old_count = int(old_count) if old_count is not None else 1
+            new_count = int(new_count) if new_count is not None else 1
+            if old_count:
+                current[1].append((int(old_start), int(old_start) + old_count - 1))
+            if new_count:
+                current[2].append((int(new_start), int(new_start) + new_count - 1))
+    return [tuple(f) for f in files]
+
+
+def git_show(root: Path, base: str, path: str) -> str | None:
+    try:
+        return git(root, "show", f"{base}:{path}")
+    except subprocess.CalledProcessError:  # base 中不存在（新增文件）
+        return None
+
+
+def read_source(path: Path) -> str | None:
+    return path.read_text(encoding="utf-8") if path.exists() else None
+
+
+def select_tests(nodeids: list[str], index: dict, changed: set[str]) -> tuple[list[str], dict[str, str]]:
+    """-> (选中的 nodeid, 选中原因)；索引中没有的用例一律选中"""
+    selected, reasons = [], {}
+    for nodeid in nodeids:
+        entry = index["tests"].get(nodeid)
+        if entry is None:
+            selected.append(nodeid)
+            reasons[nodeid] = "not indexed"
+            continue
+        hit = changed.intersection(entry["symbols"])
+        if hit:
+            selected.append(nodeid)
+            reasons[nodeid] = sorted(hit)[0]
+    return selected, reasons
@@ -0,0 +1,125 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from playwright.async_api import Browser, Page
+
+from utils.perf_report import percentile
+
+"""压测模式：N 个虚拟用户循环执行同一条 page object 旅程（asyncio 引擎，一个 Chromium 多个 context）
+    每次迭代一个全新 context（登录态来自 storage_state），步骤之间按 think time 停顿
+    context_options 可以是返回 dict 的协程函数：每次迭代调用一次，长时间压测中途可以刷新登录态
+    think time 不计入步骤耗时；吞吐量按成功迭代数 / 总时长计算
+"""
+
+PERCENTILES = (50, 90, 95, 99)
+
+ContextOptions = dict | Callable[[], Awaitable[dict]]
+
+
+@dataclass
+class LoadProfile:
+    users: int = 10
+    duration: float | None = 60  # 秒；None 时按 iterations 结束
+    iterations: int | None = None  # 每个虚拟用户的迭代次数，和 duration 同时给出时先到先停
+    ramp_up: float = 10  # 秒内逐个启动全部虚拟用户
+    think_time: tuple[float, float] = (1.0, 3.0)  # 步骤间随机停顿区间（秒）
+
+
+@dataclass
+class LoadJourney:
+    """setup(page) 构建 page object，steps 依次以它为参数执行"""
+    name: str
+    setup: Callable[[Page], Any]
+    steps: list[tuple[str, Callable[[Any], Awaitable[None]]]]
+
+
+@dataclass
+class LoadStats:
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    passed: int = 0
+    failed: int = 0
+    errors: Counter = field(default_factory=Counter)
+
+    def record(self, step: str, seconds: float):
+        self.latencies.setdefault(step, []).append(seconds)
+
+
+async def run_load(browser: Browser, journey: LoadJourney, profile: LoadProfile,
+                   context_options: ContextOptions | None = None) -> dict:
+    if profile.duration is None and profile.iterations is None:
+        raise ValueError("duration 和 iterations 至少指定一个")
+    stats = LoadStats()
+    start = time.perf_counter()
+    deadline = start + profile.duration if profile.duration is not None else None
+
+    def keep_running(done: int) -> bool:
+        return ((profile.iterations is None or done < profile.iterations)
+                and (deadline is None or time.perf_counter() < deadline))
+
+    async def virtual_user(index: int):
+        await asyncio.sleep(profile.ramp_up * index / profile.users)
+        done = 0
+        while keep_running(done):
+            await run_iteration(browser, journey, profile, stats, context_options or {})
+            done += 1
+
+    await asyncio.gather(*(virtual_user(i) for i in range(profile.users)))
+    return build_load_report(journey.name, profile, stats, time.perf_counter() - start)
+
+
+async def run_iteration(browser: Browser, journey: LoadJourney, profile: LoadProfile, stats: LoadStats,
+                        context_options: ContextOptions):
+    step_name, context = "context", None
+    try:
+        options = await context_options() if callable(context_options) else context_options
+        context = await browser.new_context(**options)
+        target = journey.setup(await context.new_page())
+        journey_time = 0.0
+        for i, (step_name, step) in enumerate(journey.steps):
+            if i:
+                await asyncio.sleep(random.uniform(*profile.think_time))
+            step_start = time.perf_counter()
+            await step(target)
+            elapsed = time.perf_counter() - step_start
+            stats.record(step_name, elapsed)
+            journey_time += elapsed
+        stats.record(journey.name, journey_time)
+        stats.passed += 1
+    except Exception as e:  # 单次迭代失败只计数，虚拟用户继续下一次迭代
+        stats.failed += 1
+        stats.errors[f"{step_name}: {type(e).__name__}"] += 1
+    finally:
+        if context:
+            await context.close()
+
+
+def build_load_report(name: str, profile: LoadProfile, stats: LoadStats, elapsed: float) -> dict:
+    return {
+        "journey": name,
+        "users": profile.users,
+        "elapsed": round(elapsed, 2),
+        "iterations": {"passed": stats.passed, "failed": stats.failed},
+        "throughput_per_min": round(stats.passed / elapsed * 60, 2) if elapsed else 0.0,
+        "latency": {step: {"count": len(values),
+                           **{f"p{pct}": round(percentile(values, pct), 3) for pct in PERCENTILES},
+                           "max": round(max(values), 3)}
+                    for step, values in stats.latencies.items()},
+        "errors": dict(stats.errors),
+    }
+
+
+def format_load_report(report: dict) -> list[str]:
+    iterations = report["iterations"]
+    lines = [f"journey={report['journey']}, users={report['users']}, elapsed={report['elapsed']}s, "
+             f"passed={iterations['passed']}, failed={iterations['failed']}, "
+             f"throughput={report['throughput_per_min']}/min",
+             f"{'step':<24}{'count':>7}" + "".join(f"{f'p{pct}':>9}" for pct in PERCENTILES) + f"{'max':>9}"]
+    for step, values in report["latency"].items():
+        lines.append(f"{step:<24}{values['count']:>7}"
+                     + "".join(f"{values[f'p{pct}']:>8.2f}s" for pct in PERCENTILES) + f"{values['max']:>8.2f}s")
+    lines += [f"❌ {error} x{count}" for error, count in report["errors"].items()]
+    return lines
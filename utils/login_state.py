@@ -0,0 +1,84 @@
+import json
+import time
+from pathlib import Path
+
+from config.pages import URLS, ENV
+from data.login_data import (LOGIN_USERS, LOGIN_SUCCESS_URL, SAVE_LOGIN_STATE_PATH, SAVE_LOGIN_STATE_FILE,
+                             LOGIN_STATE_MIN_TTL)
+from pages.login_page import LoginPage
+from utils.common_utils import atomic_write_text
+from utils.impact import depends_on
+
+"""登录态缓存：storage/ 下按 环境+用户 持久化，跨 session 复用，cookie 过期才重新登录"""
+
+DEFAULT_LOGIN_USER = "success_login"
+LOGIN_STATE_DEPS = (LoginPage, LOGIN_USERS)  # 缓存命中时不会执行 UI 登录，影响分析按此记录依赖
+
+
+def login_state_path(user_key: str = DEFAULT_LOGIN_USER, env: str = ENV) -> Path:
+    return Path(SAVE_LOGIN_STATE_PATH) / SAVE_LOGIN_STATE_FILE.format(env=env, user_key=user_key)
+
+
+def is_login_state_valid(path: Path, min_ttl: int = LOGIN_STATE_MIN_TTL) -> bool:
+    """文件存在、可解析、有 cookie，且所有带过期时间的 cookie 剩余有效期 >= min_ttl"""
+    if not path.exists() or path.stat().st_size == 0:
+        return False
+    try:
+        cookies = json.loads(path.read_text(encoding="utf-8")).get("cookies", [])
+    except (ValueError, AttributeError):
+        return False
+    return bool(cookies) and cookies_alive(cookies, min_ttl)
+
+
+def cookies_alive(cookies: list[dict], min_ttl: int = LOGIN_STATE_MIN_TTL) -> bool:
+    deadline = time.time() + min_ttl
+    # expires == -1 为会话 cookie，不会过期
+    return all(c.get("expires", -1) < 0 or c["expires"] >= deadline for c in cookies)
+
+
+def write_login_state(path: Path, state: dict) -> Path:
+    atomic_write_text(path, json.dumps(state, ensure_ascii=False))
+    return path
+
+
+def login_via_ui(browser, user_key: str = DEFAULT_LOGIN_USER, env: str = ENV) -> dict:
+    """在传入的 browser 上通过 UI 登录，返回 context.storage_state()"""
+    user = LOGIN_USERS[user_key]
+    context = browser.new_context()
+    try:
+        page = context.new_page()
+        login_page = LoginPage(page)
+        login_page.open_login(URLS[env]["login"])
+        login_page.login(user["username"], user["password"])
+        login_page.verify_login_success(LOGIN_SUCCESS_URL)
+        return context.storage_state()
+    finally:
+        context.close()
+
+
+def generate_login_state(browser, user_key: str = DEFAULT_LOGIN_USER, env: str = ENV,
+                         path: Path | None = None, state: dict | None = None) -> Path:
+    """在传入的 browser 上通过 UI 登录并保存登录态（不再单独启动 Playwright）；已有 UI 登录结果时传 state 直接保存"""
+    path = path or login_state_path(user_key, env)
+    write_login_state(path, state or login_via_ui(browser, user_key, env))
+
+    if not is_login_state_valid(path):
+        raise RuntimeError(f"‼️ {path}生成失败，请检查浏览器或账号")
+    print(f"✅ 登录态已生成 -> {path}")
+    return path
+
+
+class LoginStateCache:
+    """session 级登录态缓存：只重新生成缺失/过期的条目，生成方式由 session provider 决定"""
+
+    def __init__(self, provider, env: str = ENV):
+        self.provider = provider  # utils.session_provider.SessionProvider
+        self.env = env
+
+    def get(self, user_key: str = DEFAULT_LOGIN_USER) -> Path:
+        path = login_state_path(user_key, self.env)
+        depends_on(LOGIN_STATE_DEPS)
+        if not is_login_state_valid(path):
+            print(f"🔐 {path}不存在或已过期，通过 {self.provider.name} 重新生成")
+            self.provider.mint(user_key, self.env, path)
+        return path
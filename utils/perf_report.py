@@ -0,0 +1,173 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from utils.session_stats import format_bytes
+
+"""suite 级性能报告：最慢用例、最慢页面动作、重跑损失时间、产物字节数，每次 session 追加到历史文件
+    回归门禁（--perf-gate）：p50 / p95 用例耗时、总 wall time 相对基线超过阈值时 session 失败
+        只在用例集合（suite 指纹）与环境都和基线一致时比较；-k / --impact-base / --shard 等部分运行跳过门禁
+"""
+
+PERF_DIR = Path("perf")
+HISTORY_FILE = PERF_DIR / "history.jsonl"
+BASELINE_FILE = PERF_DIR / "baseline.json"
+ARTIFACT_DIRS = ("artifacts", "videos", "tracing", "allure-results", "timing")
+GATE_METRICS = ("p50", "p95", "wall_time")
+DEFAULT_GATE_THRESHOLDS = {"p50": 20, "p95": 25, "wall_time": 15}  # 允许的增幅（%）
+TOP_N = 10
+
+
+# ================== 采集 ==================
+def record_perf_attempt(config, record: dict):
+    """一次 attempt 的耗时记录；worker 进程同时写入 workeroutput，由主进程汇总"""
+    get_perf_records(config).append(record)
+    workeroutput = getattr(config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput.setdefault("perf_records", []).append(record)
+
+
+def collect_worker_perf(config, workeroutput: dict):
+    get_perf_records(config).extend(workeroutput.get("perf_records", []))
+
+
+def get_perf_records(config) -> list[dict]:
+    if not hasattr(config, "_perf_records"):
+        config._perf_records = []
+    return config._perf_records
+
+
+def action_totals(root) -> dict[str, float]:
+    """span 树里 page.* 动作按名称累计耗时（秒）"""
+    totals = {}
+    for span in root.iter_spans():
+        if span.name.startswith("page."):
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration
+    return totals
+
+
+def artifact_bytes(dirs=ARTIFACT_DIRS) -> dict[str, int]:
+    """各产物目录占用；artifact store 的硬链接只计一次（记在先出现的目录上）"""
+    sizes, seen = {}, set()
+    for name in dirs:
+        path = Path(name)
+        sizes[name] = 0
+        for f in path.rglob("*") if path.exists() else []:
+            if not f.is_file():
+                continue
+            stat = f.stat()
+            if (stat.st_dev, stat.st_ino) in seen:
+                continue
+            seen.add((stat.st_dev, stat.st_ino))
+            sizes[name] += stat.st_size
+    return sizes
+
+
+# ================== 汇总 ==================
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * pct / 100
+    low = int(index)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (index - low)
+
+
+def build_perf_report(records: list[dict], wall_time: float, rerun_delay: float = 0, env: str = "") -> dict:
+    by_test: dict[str, list[dict]] = {}
+    for record in sorted(records, key=lambda r: r["attempt"]):
+        by_test.setdefault(record["nodeid"], []).append(record)
+
+    # 用例耗时取最后一次 attempt，重跑的代价单独统计
+    final = {nodeid: attempts[-1] for nodeid, attempts in by_test.items()}
+    durations = [r["wall_time"] for r in final.values()]
+
+    retried = [r for attempts in by_test.values() for r in attempts[:-1]]
+    rerun_lost = sum(r["wall_time"] for r in retried) + rerun_delay * len(retried)
+
+    actions = {}
+    for record in records:
+        for name, seconds in record.get("actions", {}).items():
+            total, count = actions.get(name, (0.0, 0))
+            actions[name] = (total + seconds, count + 1)
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "env": env,
+        "tests": len(final),
+        "suite": suite_digest(final),
+        "attempts": len(records),
+        "wall_time": round(wall_time, 2),
+        "p50": round(percentile(durations, 50), 2),
+        "p95": round(percentile(durations, 95), 2),
+        "slowest_tests": [
+            {"nodeid": r["nodeid"], "wall_time": r["wall_time"], "attempts": len(by_test[r["nodeid"]]),
+             "status": r["status"]}
+            for r in sorted(final.values(), key=lambda r: r["wall_time"], reverse=True)[:TOP_N]],
+        "slowest_actions": [
+            {"name": name, "total": round(total, 2), "attempts": count}
+            for name, (total, count) in sorted(actions.items(), key=lambda kv: kv[1][0], reverse=True)[:TOP_N]],
+        "reruns": {"count": len(retried), "time_lost": round(rerun_lost, 2)},
+        "artifact_bytes": artifact_bytes(),
+    }
+
+
+def suite_digest(nodeids) -> str:
+    """本次运行的用例集合指纹：门禁只和同一组用例的基线比较"""
+    return hashlib.sha256("\n".join(sorted(nodeids)).encode("utf-8")).hexdigest()[:16]
+
+
+def append_history(report: dict, path: Path = HISTORY_FILE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(report, ensure_ascii=False) + "\n")
+
+
+# ================== 回归门禁 ==================
+def load_baseline(path: Path = BASELINE_FILE) -> dict | None:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+
+def save_baseline(report: dict, path: Path = BASELINE_FILE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {key: report[key] for key in ("timestamp", "env", "tests", "suite", *GATE_METRICS)}
+    path.write_text(json.dumps(baseline, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def gate_skip_reason(report: dict, baseline: dict) -> str | None:
+    """基线与本次运行的环境或用例集合不同时不可比，返回原因；旧基线没有 suite 时按用例数比较"""
+    if baseline.get("env") != report["env"]:
+        return f"环境不同（基线 {baseline.get('env')}，本次 {report['env']}）"
+    if "suite" in baseline:
+        if baseline["suite"] != report["suite"]:
+            return f"用例集合不同（基线 {baseline.get('tests')} 个，本次 {report['tests']} 个）"
+    elif baseline.get("tests") != report["tests"]:
+        return f"用例数不同（基线 {baseline.get('tests')} 个，本次 {report['tests']} 个）"
+    return None
+
+
+def check_regressions(report: dict, baseline: dict, thresholds: dict[str, float]) -> list[str]:
+    """返回超过阈值的指标说明，空列表表示通过"""
+    failures = []
+    for metric in GATE_METRICS:
+        base, current = baseline.get(metric), report[metric]
+        if not base:
+            continue
+        growth = (current - base) / base * 100
+        if growth > thresholds[metric]:
+            failures.append(f"{metric}: {base:.2f}s -> {current:.2f}s (+{growth:.0f}%，阈值 {thresholds[metric]:g}%)")
+    return failures
+
+
+def format_report(report: dict) -> list[str]:
+    lines = [f"tests={report['tests']}, attempts={report['attempts']}, wall_time={report['wall_time']}s, "
+             f"p50={report['p50']}s, p95={report['p95']}s",
+             f"reruns={report['reruns']['count']}, time_lost={report['reruns']['time_lost']}s",
+             "artifacts: " + ", ".join(f"{k}={format_bytes(v)}" for k, v in report["artifact_bytes"].items()),
+             "slowest tests:"]
+    lines += [f"  {t['wall_time']:>7.2f}s  x{t['attempts']}  {t['nodeid']}" for t in report["slowest_tests"]]
+    lines.append("slowest page actions:")
+    lines += [f"  {a['total']:>7.2f}s  {a['attempts']:>3} attempts  {a['name']}" for a in report["slowest_actions"]]
+    return lines
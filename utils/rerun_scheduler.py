@@ -0,0 +1,165 @@
+import json
+import re
+import time
+from pathlib import Path
+
+from utils.common_utils import atomic_write_text
+
+"""失败重跑调度：代替全局 --reruns 2 --reruns-delay 2
+    失败先分类：timeout / network / browser 属于环境抖动，直接安排重跑；assertion / error 通常是确定性失败，
+    只有历史上出现过"失败后重跑通过"（flake_rate 达到阈值）的用例才重跑；历史不足 BOOTSTRAP_RUNS 次的用例允许重跑一次，用来积累历史
+    expect() 超时抛出的是 AssertionError，按 call log 中的 "Expect ... with timeout" 归为 timeout
+    需要重跑的用例不立即重跑、不 sleep，主流程跑完后统一成批重跑
+    历史记录在 perf/flaky_history.json，由主进程在 session 结束时根据各 attempt 记录更新
+"""
+
+FLAKY_HISTORY_FILE = Path("perf") / "flaky_history.json"
+DEFAULT_MAX_RERUNS = 2
+DEFAULT_MIN_FLAKE_RATE = 0.05
+DEFAULT_BOOTSTRAP_RUNS = 3
+FLAKY_KINDS = ("timeout", "network", "browser")
+# playwright expect() 失败信息末尾的 call log："Call log:\n  - Expect "to_be_visible" with timeout 5000ms"
+EXPECT_TIMEOUT_RE = re.compile(r"Call log:\s*-\s*Expect \S+ with timeout \d+ms")
+NETWORK_MARKERS = ("net::ERR_", "ECONNRESET", "ECONNREFUSED", "Connection refused", "NS_ERROR_NET")
+BROWSER_MARKERS = ("Target page, context or browser has been closed", "Browser has been closed", "crashed")
+# 节省时间按旧策略估算：每个失败用例再跑 2 次、每次重跑前 sleep 2s
+LEGACY_RERUNS = 2
+LEGACY_DELAY = 2
+
+
+def classify_failure(excinfo) -> str:
+    if excinfo is None:
+        return "error"
+    name, message = excinfo.typename, str(excinfo.value)
+    if name == "TimeoutError":
+        return "timeout"
+    if any(marker in message for marker in NETWORK_MARKERS):
+        return "network"
+    if name == "TargetClosedError" or any(marker in message for marker in BROWSER_MARKERS):
+        return "browser"
+    if name == "AssertionError":
+        return "timeout" if EXPECT_TIMEOUT_RE.search(message) else "assertion"
+    return "error"
+
+
+class FlakeHistory:
+    """{nodeid: {"runs", "failures", "flaky", "kinds", "last_flaky"}}，一次 session 计一次 run"""
+
+    def __init__(self, path: Path = FLAKY_HISTORY_FILE):
+        self.path = path
+        self.tests = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+    def flake_rate(self, nodeid: str) -> float:
+        entry = self.tests.get(nodeid)
+        return entry["flaky"] / entry["runs"] if entry and entry["runs"] else 0.0
+
+    def runs(self, nodeid: str) -> int:
+        entry = self.tests.get(nodeid)
+        return entry["runs"] if entry else 0
+
+    def update(self, records: list[dict]):
+        """records：本次 session 的 perf 记录（每个 attempt 一条，含 status / failure_kind）"""
+        by_test: dict[str, list[dict]] = {}
+        for record in sorted(records, key=lambda r: r["attempt"]):
+            by_test.setdefault(record["nodeid"], []).append(record)
+        for nodeid, attempts in by_test.items():
+            entry = self.tests.setdefault(nodeid, {"runs": 0, "failures": 0, "flaky": 0, "kinds": {}})
+            entry["runs"] += 1
+            if attempts[0]["status"] == "PASSED":
+                continue
+            entry["failures"] += 1
+            kind = attempts[0].get("failure_kind") or "error"
+            entry["kinds"][kind] = entry["kinds"].get(kind, 0) + 1
+            if attempts[-1]["status"] == "PASSED":
+                entry["flaky"] += 1
+                entry["last_flaky"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    def save(self):
+        atomic_write_text(self.path, json.dumps(self.tests, ensure_ascii=False, indent=2))
+
+
+class RerunScheduler:
+    """每个进程一个：决定失败 attempt 是否重跑，并保存待重跑的用例"""
+
+    def __init__(self, history: FlakeHistory, max_reruns: int = DEFAULT_MAX_RERUNS,
+                 min_flake_rate: float = DEFAULT_MIN_FLAKE_RATE, bootstrap_runs: int = DEFAULT_BOOTSTRAP_RUNS):
+        self.history = history
+        self.max_reruns = max_reruns
+        self.min_flake_rate = min_flake_rate
+        self.bootstrap_runs = bootstrap_runs
+        self.queue = []
+
+    def decide(self, nodeid: str, kind: str, attempt: int) -> str | None:
+        """返回重跑原因，None 表示不重跑"""
+        if attempt > self.max_reruns:
+            return None
+        if kind in FLAKY_KINDS:
+            return kind
+        rate = self.history.flake_rate(nodeid)
+        if rate >= self.min_flake_rate and rate > 0:
+            return f"history {rate:.0%}"
+        # 没有足够历史时不重跑，flaky 永远记不下来：先重跑一次
+        if attempt == 1 and self.history.runs(nodeid) < self.bootstrap_runs:
+            return "bootstrap"
+        return None
+
+    def schedule(self, item):
+        self.queue.append(item)
+
+    def next_batch(self) -> list:
+        batch, self.queue = self.queue, []
+        return batch
+
+
+def reset_for_rerun(item):
+    """重跑前复位（与 pytest-rerunfailures 相同）：换新的测试类实例；清掉失败 fixture 的缓存结果与 finalizer，
+        否则 session / class 级 fixture 的 setup 异常会被直接复用，重跑必然失败；本用例从 SetupState 栈中移除
+    """
+    if getattr(item, "_instance", None) is not None:
+        del item._instance
+        item._obj = None
+    fixtureinfo = getattr(item, "_fixtureinfo", None)
+    for fixturedefs in getattr(fixtureinfo, "name2fixturedefs", {}).values():
+        for fixturedef in fixturedefs:
+            cached = getattr(fixturedef, "cached_result", None)
+            if cached is not None and cached[2] is not None:
+                fixturedef.cached_result = None
+                fixturedef._finalizers.clear()
+    item.session._setupstate.stack.pop(item, None)
+
+
+class PendingReruns:
+    """代替最后一个用例的 nextitem=None：teardown 时队列里还有待重跑用例，就只拆到 session 级，
+        browser、登录态 / 检查点等 session fixture 留给重跑批次；队列为空时与 None 相同，全部拆除
+        （SetupState.teardown_exact 只用到 nextitem.listchain()）
+    """
+
+    def __init__(self, scheduler: RerunScheduler, session):
+        self.scheduler = scheduler
+        self.session = session
+
+    def listchain(self) -> list:
+        return [self.session] if self.scheduler.queue else []
+
+
+def summarize_reruns(records: list[dict]) -> dict:
+    """与旧策略（每个失败 attempt 都重跑、重跑前 sleep）相比节省的时间（估算）
+        跳过的确定性失败：旧策略还会再跑 LEGACY_RERUNS 次（按本次 attempt 耗时估算）+ 每次的 sleep
+        实际重跑的 attempt：省掉 sleep
+    """
+    failed = [r for r in records if r["status"] != "PASSED"]
+    rerun = [r for r in failed if r.get("rerun")]
+    skipped = [r for r in failed if not r.get("rerun") and r["attempt"] == 1]
+    saved = (sum(LEGACY_RERUNS * (r["wall_time"] + LEGACY_DELAY) for r in skipped)
+             + LEGACY_DELAY * len(rerun))
+    kinds: dict[str, int] = {}
+    for record in failed:
+        kind = record.get("failure_kind") or "error"
+        kinds[kind] = kinds.get(kind, 0) + 1
+    return {"rerun": len(rerun), "skipped": len(skipped), "kinds": kinds, "saved": round(saved, 2)}
+
+
+def format_rerun_summary(summary: dict) -> str:
+    kinds = ", ".join(f"{kind}={count}" for kind, count in summary["kinds"].items())
+    return (f"smart reruns: rerun={summary['rerun']}, skipped={summary['skipped']} ({kinds}), "
+            f"saved≈{summary['saved']}s vs --reruns {LEGACY_RERUNS} --reruns-delay {LEGACY_DELAY}")
@@ -0,0 +1,158 @@
+import base64
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from utils.common_utils import atomic_write_text
+
+"""静态资源路由缓存：context.route 拦截 JS/CSS/字体/图片，命中直接 fulfill，HTML 与接口请求照常走服务器
+    memory —— session 内存 LRU（按字节数限额）
+    disk   —— 内存 LRU + 磁盘持久化，跨 session 复用
+    har    —— 启动时从 HAR 预热内存缓存，结束时把缓存写回 HAR（文件不存在时相当于录制）
+"""
+
+ROUTE_CACHE_MODES = ("off", "memory", "disk", "har")
+DEFAULT_ROUTE_CACHE_MODE = "memory"
+DEFAULT_ROUTE_CACHE_PATH = {"disk": ".route-cache", "har": ".route-cache/static_assets.har"}
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+STATIC_RESOURCE_TYPES = {"script", "stylesheet", "font", "image", "media"}
+# 响应体已被 route.fetch 解压，原样转发这两个头会让浏览器按压缩数据解析
+DROP_HEADERS = {"content-encoding", "content-length"}
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: dict
+    body: bytes
+
+
+@dataclass
+class RouteCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bytes_saved: int = 0
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "bytes_saved": self.bytes_saved}
+
+
+class RouteCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, disk_dir: Path | None = None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.size = 0
+        self.stats = RouteCacheStats()
+        if disk_dir:
+            disk_dir.mkdir(parents=True, exist_ok=True)
+
+    # ================== 接入 context ==================
+    def attach(self, context):
+        context.route("**/*", self.handle)
+
+    def handle(self, route, request):
+        if request.method != "GET" or request.resource_type not in STATIC_RESOURCE_TYPES:
+            return route.fallback()  # 交给后注册的路由或直接走网络
+
+        cached = self.get(request.url)
+        if cached:
+            self.stats.hits += 1
+            self.stats.bytes_saved += len(cached.body)
+            return route.fulfill(status=cached.status, headers=cached.headers, body=cached.body)
+
+        self.stats.misses += 1
+        response = route.fetch()
+        body = response.body()
+        if response.status == 200:
+            self.put(request.url, CachedResponse(response.status, strip_headers(response.headers), body))
+        route.fulfill(response=response, body=body)
+
+    # ================== LRU ==================
+    def get(self, url: str) -> CachedResponse | None:
+        cached = self.entries.get(url)
+        if cached:
+            self.entries.move_to_end(url)
+            return cached
+        cached = self._load_from_disk(url)
+        if cached:
+            self._remember(url, cached)
+        return cached
+
+    def put(self, url: str, cached: CachedResponse):
+        self._remember(url, cached)
+        self._save_to_disk(url, cached)
+
+    def _remember(self, url: str, cached: CachedResponse):
+        if len(cached.body) > self.max_bytes:
+            return
+        if url in self.entries:
+            self.size -= len(self.entries.pop(url).body)
+        self.entries[url] = cached
+        self.size += len(cached.body)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted.body)
+
+    # ================== 磁盘 ==================
+    def _disk_path(self, url: str) -> Path:
+        return self.disk_dir / hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _load_from_disk(self, url: str) -> CachedResponse | None:
+        if not self.disk_dir:
+            return None
+        meta_path = self._disk_path(url).with_suffix(".json")
+        if not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return CachedResponse(meta["status"], meta["headers"], self._disk_path(url).with_suffix(".body").read_bytes())
+
+    def _save_to_disk(self, url: str, cached: CachedResponse):
+        if not self.disk_dir:
+            return
+        base = self._disk_path(url)
+        base.with_suffix(".body").write_bytes(cached.body)
+        # meta 最后写：读取方以 .json 是否存在判断条目完整
+        atomic_write_text(base.with_suffix(".json"),
+                          json.dumps({"url": url, "status": cached.status, "headers": cached.headers}))
+
+    # ================== HAR ==================
+    def load_har(self, har_path: Path):
+        if not har_path.exists():
+            return
+        for entry in json.loads(har_path.read_text(encoding="utf-8"))["log"]["entries"]:
+            response, content = entry["response"], entry["response"].get("content", {})
+            if response["status"] != 200 or "text" not in content:
+                continue
+            text = content["text"]
+            body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+            headers = strip_headers({h["name"].lower(): h["value"] for h in response.get("headers", [])})
+            self._remember(entry["request"]["url"], CachedResponse(response["status"], headers, body))
+
+    def save_har(self, har_path: Path):
+        har_path.parent.mkdir(parents=True, exist_ok=True)
+        entries = [{
+            "request": {"method": "GET", "url": url, "headers": []},
+            "response": {"status": cached.status,
+                         "headers": [{"name": k, "value": v} for k, v in cached.headers.items()],
+                         "content": {"size": len(cached.body), "mimeType": cached.headers.get("content-type", ""),
+                                     "encoding": "base64", "text": base64.b64encode(cached.body).decode("ascii")}}
+        } for url, cached in self.entries.items()]
+        har = {"log": {"version": "1.2", "creator": {"name": "ui-test-playwright route cache"}, "entries": entries}}
+        har_path.write_text(json.dumps(har), encoding="utf-8")
+
+
+def strip_headers(headers: dict) -> dict:
+    return {k: v for k, v in headers.items() if k.lower() not in DROP_HEADERS}
+
+
+def build_route_cache(mode: str, path: str | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> RouteCache | None:
+    if mode == "off":
+        return None
+    path = Path(path or DEFAULT_ROUTE_CACHE_PATH.get(mode, ""))
+    cache = RouteCache(max_bytes, disk_dir=path if mode == "disk" else None)
+    if mode == "har":
+        cache.load_har(path)
+    return cache
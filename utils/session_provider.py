@@ -0,0 +1,121 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from urllib.parse import urlparse
+
+from config.pages import URLS
+from data.login_data import (COOKIE_VERIFY_TTL, LOGIN_USERS, SAVE_LOGIN_STATE_PATH, SESSION_COOKIE_NAME,
+                             SESSION_COOKIE_TTL)
+from utils.common_utils import atomic_write_text
+from utils.login_state import generate_login_state, login_via_ui, write_login_state
+
+"""session provider：决定 need_login 用例的登录态如何生成
+    ui     —— 通过 LoginPage 走一遍 UI 登录
+    cookie —— 直接构造 saucedemo 登录后写入的 cookie，不打开登录页；
+              与 UI 登录得到的登录态对比一次（cookie 与 localStorage），结果记到 storage/cookie_verified_{env}.json，
+              COOKIE_VERIFY_TTL 内的后续 session 直接沿用；不一致时回退到 ui。对比时 UI 登录的登录态直接保存，不浪费
+"""
+
+
+class SessionProvider(ABC):
+    name = "base"
+
+    def __init__(self, browser):
+        self.browser = browser
+
+    @abstractmethod
+    def mint(self, user_key: str, env: str, path: Path) -> Path:
+        """生成 user_key 在 env 下的登录态并写入 path"""
+
+
+class UISessionProvider(SessionProvider):
+    name = "ui"
+
+    def mint(self, user_key: str, env: str, path: Path, state: dict | None = None) -> Path:
+        return generate_login_state(self.browser, user_key, env, path, state)
+
+
+class CookieSessionProvider(SessionProvider):
+    name = "cookie"
+
+    def __init__(self, browser):
+        super().__init__(browser)
+        self.fallback = UISessionProvider(browser)
+        self.verified: bool | None = None  # None：还没有有效的对比结果
+
+    def mint(self, user_key: str, env: str, path: Path) -> Path:
+        if self.verified is None:
+            self.verified = load_verification(env)
+        # 登录失败类用户（带 error_msg）不能伪造登录态，交给 UI 登录
+        if self.verified is False or "error_msg" in LOGIN_USERS[user_key]:
+            return self.fallback.mint(user_key, env, path)
+
+        if self.verified is None:
+            ui_state = login_via_ui(self.browser, user_key, env)
+            self.verified = same_session(build_cookie_state(user_key, env), ui_state, env)
+            save_verification(env, self.verified)
+            if not self.verified:
+                print(f"⚠️ cookie 注入的登录态与 UI 登录不一致，{COOKIE_VERIFY_TTL}s 内回退到 UI 登录")
+            # 刚才的 UI 登录结果直接可用，不再登录第二次
+            return self.fallback.mint(user_key, env, path, ui_state)
+        write_login_state(path, build_cookie_state(user_key, env))
+        return path
+
+
+SESSION_PROVIDERS = {provider.name: provider for provider in (UISessionProvider, CookieSessionProvider)}
+
+
+def build_session_provider(name: str, browser) -> SessionProvider:
+    return SESSION_PROVIDERS[name](browser)
+
+
+def verification_path(env: str) -> Path:
+    return Path(SAVE_LOGIN_STATE_PATH) / f"cookie_verified_{env}.json"
+
+
+def load_verification(env: str, max_age: int = COOKIE_VERIFY_TTL) -> bool | None:
+    """-> 未过期的对比结果；没有记录或已过期返回 None"""
+    try:
+        record = json.loads(verification_path(env).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if time.time() - record.get("checked", 0) >= max_age:
+        return None
+    return record.get("verified")
+
+
+def save_verification(env: str, verified: bool):
+    atomic_write_text(verification_path(env), json.dumps({"verified": verified, "checked": time.time()}))
+
+
+def build_cookie_state(user_key: str, env: str) -> dict:
+    """与 saucedemo 登录成功后 context.storage_state() 结构一致的登录态"""
+    return {
+        "cookies": [{
+            "name": SESSION_COOKIE_NAME,
+            "value": LOGIN_USERS[user_key]["username"],
+            "domain": urlparse(URLS[env]["login"]).hostname,
+            "path": "/",
+            "expires": int(time.time()) + SESSION_COOKIE_TTL,
+            "httpOnly": False,
+            "secure": False,
+            "sameSite": "Lax"}],
+        "origins": []
+    }
+
+
+def session_signature(state: dict, host: str) -> set[tuple]:
+    """登录态中属于应用自身 host 的部分：cookie 的 name / value / path 与 localStorage；忽略过期时间与第三方域名"""
+    cookies = {("cookie", c["name"], c["value"], c.get("path", "/"))
+               for c in state.get("cookies", []) if c["domain"].lstrip(".") == host}
+    storage = {("localStorage", item["name"], item["value"])
+               for o in state.get("origins", []) if urlparse(o["origin"]).hostname == host
+               for item in o.get("localStorage", [])}
+    return cookies | storage
+
+
+def same_session(minted: dict, ui_state: dict, env: str) -> bool:
+    """构造的登录态必须与 UI 登录得到的一致：UI 登录多写了 cookie / localStorage 说明构造方式已过时"""
+    host = urlparse(URLS[env]["login"]).hostname
+    return session_signature(minted, host) == session_signature(ui_state, host)
@@ -0,0 +1,37 @@
+"""session 级统计汇总：各功能把计数器写到 config 上，xdist worker 通过 workeroutput 汇总到主进程，结束时统一打印"""
+
+
+def merge_stats(target: dict, stats: dict):
+    for key, value in stats.items():
+        target[key] = target.get(key, 0) + value
+
+
+def record_session_stats(config, name: str, stats: dict):
+    """累加一组计数器；worker 进程同时写入 workeroutput，由主进程 pytest_testnodedown 汇总"""
+    merge_stats(get_session_stats(config).setdefault(name, {}), stats)
+    workeroutput = getattr(config, "workeroutput", None)
+    if workeroutput is not None:
+        merge_stats(workeroutput.setdefault("session_stats", {}).setdefault(name, {}), stats)
+
+
+def collect_worker_stats(config, workeroutput: dict):
+    for name, stats in workeroutput.get("session_stats", {}).items():
+        merge_stats(get_session_stats(config).setdefault(name, {}), stats)
+
+
+def get_session_stats(config) -> dict:
+    if not hasattr(config, "_session_stats"):
+        config._session_stats = {}
+    return config._session_stats
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def format_stats(stats: dict) -> str:
+    return ", ".join(f"{key}={format_bytes(value) if 'bytes' in key else value}" for key, value in stats.items())
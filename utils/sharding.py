@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+
+from utils.common_utils import atomic_write_text
+from utils.perf_report import percentile
+
+"""按历史耗时把用例分成 K 份，分到多台机器执行：pytest --shard 2/4
+    耗时来自 perf/durations.json（每次 session 结束按各 attempt wall time 之和做指数平滑更新），没有记录的用例按中位数估算
+    共享昂贵前置条件的用例作为一组分到同一个 shard：@pytest.mark.shard_group("name") 显式指定，
+        need_login 用例默认按测试类分组（同一个 worker 上复用登录态、商品目录缓存、热 context）
+    每组按耗时从长到短分配给当前负载最小的 shard（LPT），shard 内同样按组耗时从长到短执行
+    各机器必须使用同一份 durations.json 与相同的 collection，才能得到一致的划分
+"""
+
+DURATIONS_FILE = Path("perf") / "durations.json"
+DEFAULT_DURATION = 10.0  # 没有任何历史记录时每个用例的估算耗时（秒）
+EWMA_ALPHA = 0.5
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """'2/4' -> (2, 4)，shard 编号从 1 开始"""
+    try:
+        index, total = (int(v) for v in value.split("/"))
+    except ValueError:
+        raise ValueError(f"--shard 格式应为 K/N，如 2/4：{value}")
+    if not 1 <= index <= total:
+        raise ValueError(f"--shard {value}：K 必须在 1..N 之间")
+    return index, total
+
+
+def shard_label(shard: tuple[int, int]) -> str:
+    return f"shard-{shard[0]}"
+
+
+# ================== 历史耗时 ==================
+def load_durations(path: Path = DURATIONS_FILE) -> dict[str, float]:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def update_durations(records: list[dict], path: Path = DURATIONS_FILE, save: bool = True) -> dict[str, float]:
+    """records：本次 session 的 perf 记录；同一用例多次 attempt 的耗时相加（重跑也是这个 shard 的成本）
+        分片执行时 save=False：各 shard 用同一份文件划分，新耗时由 scripts/merge_shards.py 合并后写回
+    """
+    totals: dict[str, float] = {}
+    for record in records:
+        totals[record["nodeid"]] = totals.get(record["nodeid"], 0.0) + record["wall_time"]
+    durations = load_durations(path)
+    for nodeid, seconds in totals.items():
+        old = durations.get(nodeid)
+        durations[nodeid] = round(seconds if old is None else old + EWMA_ALPHA * (seconds - old), 3)
+    if save:
+        save_durations(durations, path)
+    return durations
+
+
+def save_durations(durations: dict[str, float], path: Path = DURATIONS_FILE):
+    atomic_write_text(path, json.dumps(dict(sorted(durations.items())), ensure_ascii=False, indent=1))
+
+
+# ================== 分组与分配 ==================
+def group_key(item) -> str:
+    marker = item.get_closest_marker("shard_group")
+    if marker:
+        return f"group:{marker.args[0]}"
+    if item.cls is not None and item.get_closest_marker("need_login"):
+        return item.nodeid.split("::")[0] + "::" + item.cls.__name__
+    return item.nodeid
+
+
+def plan_shards(groups: dict[str, list[str]], durations: dict[str, float],
+                total: int) -> tuple[list[list[str]], list[float], dict[str, float]]:
+    """-> (每个 shard 的组 key 列表（按耗时从长到短）, 每个 shard 的预计耗时, 每组预计耗时)"""
+    known = [durations[nodeid] for nodeids in groups.values() for nodeid in nodeids if nodeid in durations]
+    fallback = percentile(known, 50) if known else DEFAULT_DURATION
+    cost = {key: sum(durations.get(nodeid, fallback) for nodeid in nodeids) for key, nodeids in groups.items()}
+    shards, loads = [[] for _ in range(total)], [0.0] * total
+    for key in sorted(groups, key=lambda k: (-cost[k], k)):  # key 参与排序：各机器结果一致
+        target = min(range(total), key=lambda i: (loads[i], i))
+        shards[target].append(key)
+        loads[target] += cost[key]
+    return shards, loads, cost
+
+
+def shard_items(items: list, shard: tuple[int, int], durations: dict[str, float]) -> tuple[list, list, list[float]]:
+    """-> (本 shard 的用例（按组耗时排序，组内保持原顺序）, 其余用例, 各 shard 预计耗时)"""
+    groups: dict[str, list] = {}
+    for item in items:
+        groups.setdefault(group_key(item), []).append(item)
+    plan, loads, _ = plan_shards({key: [item.nodeid for item in group] for key, group in groups.items()},
+                                 durations, shard[1])
+    selected = [item for key in plan[shard[0] - 1] for item in groups[key]]
+    keep = {id(item) for item in selected}
+    return selected, [item for item in items if id(item) not in keep], loads
@@ -0,0 +1,100 @@
+import json
+import time
+from pathlib import Path
+
+from config.locators import INVENTORY_LOCATORS
+from data.login_data import SAVE_LOGIN_STATE_PATH
+from pages.base_page import Field
+from pages.inventory_page import InventoryPage, PRODUCT_ROW, ProductInfo
+from utils.checkpoints import fingerprint
+from utils.common_utils import atomic_write_text, parse_money
+from utils.impact import depends_on
+
+"""场景状态捷径：checkout 用例不再经 inventory 逐个点击加购，直接把购物车写进应用的 localStorage
+    @pytest.mark.setup_mode("seeded") —— conftest 给 page 挂 CartSeeder，CheckOutPage.prepare 直接打开 step 页
+    @pytest.mark.setup_mode("checkpoint") —— UI 前缀每个 session 只跑一次，之后从检查点恢复（见 utils/checkpoints.py）
+    @pytest.mark.setup_mode("ui")     —— 原有 UI 加购流程（pytest.ini 的 setup_mode 为全局默认）
+    商品目录（id、名称、价格、描述）首次使用时从 inventory 页抓取一次，缓存到 storage/catalog_{key}_{指纹}.json，
+        指纹覆盖 inventory page 代码、INVENTORY_LOCATORS 与 CATALOG_ROW；超过 CATALOG_MAX_AGE 重新抓取
+"""
+
+SETUP_MODES = ("ui", "seeded", "checkpoint")
+DEFAULT_SETUP_MODE = "ui"
+CART_STORAGE_KEY = "cart-contents"  # saucedemo 与本地 storefront 的购物车：商品 id 数组
+CATALOG_MAX_AGE = 24 * 3600  # 秒：目录（价格、描述）可能随站点更新，缓存最多保留一天
+
+# 每个新文档都会执行 init script：sessionStorage 标记保证只在第一次写入，之后由应用自己维护购物车
+SEED_STORAGE_JS = """
+([origin, key, value]) => {
+    if (location.origin !== origin || sessionStorage.getItem("__state_seeded__")) return;
+    localStorage.setItem(key, value);
+    sessionStorage.setItem("__state_seeded__", "1");
+}
+"""
+
+# 价格保留原文本写入 JSON，读取时再解析成 Decimal；商品 id 取自标题链接 id（item_4_title_link）
+CATALOG_ROW = {**PRODUCT_ROW,
+               "product_price": Field(INVENTORY_LOCATORS["item_product_price"]),
+               "product_id": Field(INVENTORY_LOCATORS["item_product_link"], "id",
+                                   parser=lambda link_id: int(link_id.split("_")[1]))}
+
+
+def catalog_path(key: str) -> Path:
+    return Path(SAVE_LOGIN_STATE_PATH) / f"catalog_{key}.json"
+
+
+def catalog_fingerprint() -> str:
+    """抓取目录依赖的 page 代码与定位；Field 的 parser 按名字计入"""
+    row = {key: [f.selector, f.attr, getattr(f.parser, "__qualname__", None)] for key, f in CATALOG_ROW.items()}
+    return fingerprint((InventoryPage, INVENTORY_LOCATORS, row))[:12]
+
+
+class CatalogCache:
+    """商品目录缓存：顺序即 inventory 默认排序，与 UI 加购选中的前 N 个商品一致"""
+
+    def __init__(self, key: str, inventory_url: str, max_age: int = CATALOG_MAX_AGE):
+        self.path = catalog_path(f"{key}_{catalog_fingerprint()}")
+        self.inventory_url = inventory_url
+        self.max_age = max_age
+        self.products: list[dict] | None = None
+
+    def is_fresh(self) -> bool:
+        return self.path.exists() and time.time() - self.path.stat().st_mtime < self.max_age
+
+    def get(self, context) -> list[dict]:
+        depends_on((InventoryPage, INVENTORY_LOCATORS))  # 与 catalog_fingerprint 相同的依赖，缓存命中时也记到用例
+        if self.products is None:
+            if not self.is_fresh():
+                self.harvest(context)
+            rows = json.loads(self.path.read_text(encoding="utf-8"))
+            self.products = [{**row, "product_price": parse_money(row["product_price"])} for row in rows]
+        return self.products
+
+    def harvest(self, context):
+        """用已登录的 context 打开一次 inventory 抓取整个目录"""
+        page = context.new_page()
+        try:
+            inventory_page = InventoryPage(page)
+            inventory_page.open_inventory(self.inventory_url)
+            rows = inventory_page.get_rows(inventory_page.item_product, CATALOG_ROW)
+        finally:
+            page.close()
+        atomic_write_text(self.path, json.dumps(rows, ensure_ascii=False))
+        print(f"🗂️ 商品目录已缓存 -> {self.path}（{len(rows)} 个商品）")
+
+
+class CartSeeder:
+    """挂在 page._cart_seeder 上；seed 必须在打开目标页之前调用"""
+
+    def __init__(self, page, catalog: list[dict], origin: str):
+        self.page = page
+        self.catalog = catalog
+        self.origin = origin
+
+    def seed(self, count: int) -> list[ProductInfo]:
+        assert len(self.catalog) >= count, f"可加购商品不足：目录 {len(self.catalog)} 个，需要 {count} 个"
+        products = self.catalog[:count]
+        ids = json.dumps([p["product_id"] for p in products])
+        self.page.add_init_script(script=f"({SEED_STORAGE_JS})({json.dumps([self.origin, CART_STORAGE_KEY, ids])})")
+        return [ProductInfo(product_name=p["product_name"], product_price=p["product_price"],
+                            product_desc=p["product_desc"]) for p in products]
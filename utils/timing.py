@@ -0,0 +1,126 @@
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+"""分阶段耗时：每个 attempt 一棵 span 树（setup → call → teardown），session 级 span（browser 启动）单独一棵
+    没有进行中的用例时（例如 asyncio 引擎的线程）span 不记录，避免并发协程把树搅乱
+"""
+
+TIMING_DIR = Path("timing")
+
+
+class Span:
+    __slots__ = ("name", "start", "end", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.end = None
+        self.children: list[Span] = []
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def to_dict(self, origin: float | None = None) -> dict:
+        origin = self.start if origin is None else origin
+        return {"name": self.name,
+                "offset_ms": round((self.start - origin) * 1000, 1),
+                "duration_ms": round(self.duration * 1000, 1),
+                "children": [child.to_dict(origin) for child in self.children]}
+
+    def iter_spans(self):
+        yield self
+        for child in self.children:
+            yield from child.iter_spans()
+
+
+class SpanRecorder:
+    def __init__(self):
+        self._local = threading.local()
+        self.session_root = Span("session")
+
+    @property
+    def _stack(self) -> list[Span]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def start_test(self, name: str) -> Span:
+        root = Span(name)
+        self._local.stack = [root]
+        return root
+
+    def finish_test(self) -> Span | None:
+        stack = self._stack
+        if not stack:
+            return None
+        root = stack[0]
+        root.end = time.perf_counter()
+        self._local.stack = []
+        return root
+
+    @property
+    def active(self) -> bool:
+        return bool(self._stack)
+
+    @contextmanager
+    def span(self, name: str):
+        stack = self._stack
+        if not stack:
+            yield None
+            return
+        span = Span(name)
+        stack[-1].children.append(span)
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            stack.pop()
+
+    @contextmanager
+    def session_span(self, name: str):
+        """用例之外的 session 级阶段（browser 启动等）"""
+        span = Span(name)
+        self.session_root.children.append(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+
+
+TIMING = SpanRecorder()
+
+
+def timed(name: str | None = None):
+    """方法级 span：@timed() 默认取函数名"""
+
+    def decorator(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with TIMING.span(span_name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def timed_asserts(cls):
+    """断言类装饰器：每个 staticmethod 记录为 "<类名>.<方法名>" span"""
+    for attr, value in list(vars(cls).items()):
+        if isinstance(value, staticmethod):
+            setattr(cls, attr, staticmethod(timed(f"{cls.__name__}.{attr}")(value.__func__)))
+    return cls
+
+
+def write_span_report(path: Path, tests: dict[str, list[dict]]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {"session": TIMING.session_root.to_dict(), "tests": tests}
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
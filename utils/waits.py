@@ -0,0 +1,36 @@
+import re
+from functools import lru_cache
+
+"""等待引擎的底层实现：BasePage 的 wait_* 方法基于这里的事件驱动等待，不使用固定 sleep
+    DOM 静默          —— 浏览器端 MutationObserver，容器 quiet_ms 内无变更即返回（一次往返）
+"""
+
+SLOW_WAIT_SECONDS = 2.0  # 超过该耗时的等待记入用例记录的 slow_waits
+
+DOM_QUIET_JS = """
+(el, [quietMs, timeoutMs]) => new Promise(resolve => {
+    const start = performance.now();
+    let mutations = 0, quietTimer;
+    const done = quiet => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(limitTimer);
+        resolve({quiet, mutations, waited: performance.now() - start});
+    };
+    const observer = new MutationObserver(records => {
+        mutations += records.length;
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => done(true), quietMs);
+    });
+    observer.observe(el, {childList: true, subtree: true, attributes: true, characterData: true});
+    quietTimer = setTimeout(() => done(true), quietMs);
+    const limitTimer = setTimeout(() => done(false), timeoutMs);
+})
+"""
+
+
+@lru_cache(maxsize=256)
+def url_pattern(pattern: str) -> re.Pattern:
+    """wait_url 的正则缓存：同一 pattern 只编译一次"""
+    return re.compile(pattern)
+
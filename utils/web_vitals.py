@@ -0,0 +1,76 @@
+"""前端性能采集：BasePage.open / wait_url 之后读取 Navigation Timing、paint、LCP / CLS 与传输字节
+    开启：pytest --web-vitals，或单个用例 @pytest.mark.web_vitals
+    LCP / CLS 只能由 PerformanceObserver 观察，init script 在页面脚本之前注册观察器
+"""
+
+WEB_VITALS_INIT_JS = """
+(() => {
+    const vitals = window.__webVitals = {lcp: null, cls: 0};
+    try {
+        new PerformanceObserver(list => {
+            for (const e of list.getEntries()) vitals.lcp = e.renderTime || e.loadTime || e.startTime;
+        }).observe({type: "largest-contentful-paint", buffered: true});
+        new PerformanceObserver(list => {
+            for (const e of list.getEntries()) if (!e.hadRecentInput) vitals.cls += e.value;
+        }).observe({type: "layout-shift", buffered: true});
+    } catch (e) {}
+})();
+"""
+
+# 同一文档（timeOrigin 不变）只统计上次采集之后加载的资源，同文档内跳转不重复计算
+COLLECT_JS = """
+([origin, since]) => {
+    const sameDocument = performance.timeOrigin === origin;
+    const nav = performance.getEntriesByType("navigation")[0];
+    const paint = Object.fromEntries(performance.getEntriesByType("paint").map(p => [p.name, p.startTime]));
+    const resources = performance.getEntriesByType("resource").filter(r => !sameDocument || r.startTime >= since);
+    const vitals = window.__webVitals || {};
+    return {
+        url: location.href,
+        same_document: sameDocument,
+        time_origin: performance.timeOrigin,
+        now: performance.now(),
+        ttfb: nav ? nav.responseStart - nav.requestStart : null,
+        dom_content_loaded: nav ? nav.domContentLoadedEventEnd : null,
+        load: nav ? nav.loadEventEnd : null,
+        document_bytes: nav ? nav.transferSize : null,
+        fcp: paint["first-contentful-paint"] ?? null,
+        lcp: vitals.lcp ?? null,
+        cls: vitals.cls ?? null,
+        resource_count: resources.length,
+        resource_bytes: resources.reduce((sum, r) => sum + (r.transferSize || 0), 0),
+    };
+}
+"""
+
+METRIC_DIGITS = {"ttfb": 1, "dom_content_loaded": 1, "load": 1, "fcp": 1, "lcp": 1, "cls": 4}
+
+
+class WebVitalsRecorder:
+    """挂在 page._web_vitals 上，按步骤记录；同一文档内的后续步骤标记 soft_navigation"""
+
+    def __init__(self):
+        self.steps: list[dict] = []
+        self._time_origin = None
+        self._since = 0
+
+    def collect(self, page, label: str) -> dict:
+        raw = page.evaluate(COLLECT_JS, [self._time_origin, self._since])
+        self._time_origin = raw.pop("time_origin")
+        same_document = raw.pop("same_document")
+        step = {"step": label, "soft_navigation": same_document}
+        for key, value in raw.items():
+            step[key] = round(value, METRIC_DIGITS[key]) if key in METRIC_DIGITS and value is not None else value
+        if same_document:
+            # 文档级指标属于上一次真实导航，重复记录会被误读为本步骤的耗时
+            for key in ("ttfb", "dom_content_loaded", "load", "document_bytes", "fcp", "lcp"):
+                step[key] = None
+        self._since = step.pop("now")
+        self.steps.append(step)
+        return step
+
+    def last(self, label: str | None = None) -> dict | None:
+        for step in reversed(self.steps):
+            if label is None or step["step"] == label:
+                return step
+        return None